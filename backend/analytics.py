@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from sqlalchemy import Date, case, cast, delete, func, insert, literal, literal_column, select, text
+from models import db, Order, SpendRollup, Supplier, money_sum, upsert
+from money import to_major
+from cache import cache
+
+ROLLUP_PERIODS = ('week', 'month')
+
+def bucket_start(moment, period):
+    """Monday of the week, or first day of the month, containing moment"""
+    day = moment.date() if isinstance(moment, datetime) else moment
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+def bucket_expression(column, period):
+    """SQL equivalent of bucket_start() for the session's dialect"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return cast(func.date_trunc(literal_column(f"'{period}'"), column), Date)
+    if period == 'week':
+        # Forward to the week's Sunday (or stay on it), then back to its Monday
+        return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    return func.date(column, literal_column("'start of month'"))
+
+def record_approved_spend(approvals, approved_at):
+    """Add approved orders to their week and month rollups in the caller's transaction.
+    
+    approvals is an iterable of (supplier_id, amount). Amounts are summed per
+    rollup row first and written with one upsert, in key order so concurrent
+    approvals lock shared rows in the same order.
+    """
+    totals = {}
+    for supplier_id, amount in approvals:
+        for period in ROLLUP_PERIODS:
+            key = (period, supplier_id, bucket_start(approved_at, period))
+            spent, count = totals.get(key, (0, 0))
+            totals[key] = (spent + amount, count + 1)
+    if not totals:
+        return
+    
+    statement = upsert(SpendRollup).values([
+        {'period': period, 'supplier_id': supplier_id, 'bucket_start': start,
+         'approved_amount': spent, 'order_count': count}
+        for (period, supplier_id, start), (spent, count) in sorted(totals.items())
+    ])
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[SpendRollup.period, SpendRollup.supplier_id, SpendRollup.bucket_start],
+        set_={
+            'approved_amount': SpendRollup.approved_amount + statement.excluded.approved_amount,
+            'order_count': SpendRollup.order_count + statement.excluded.order_count
+        }
+    ))
+
+def rebuild_spend_rollups():
+    """Recompute every rollup from the approved orders, bucketed by approval time.
+    
+    Used to backfill the rollups and to repair them; approvals made while it
+    runs wait for it and are added on top. Returns the number of rollup rows.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(text('LOCK TABLE spend_rollups IN EXCLUSIVE MODE'))
+    db.session.execute(delete(SpendRollup))
+    
+    # An approved order's updated_at is the time it was approved
+    pre_season = case((Order.updated_at < Supplier.season_started_at, Order.order_amount), else_=0)
+    written = 0
+    for period in ROLLUP_PERIODS:
+        bucket = bucket_expression(Order.updated_at, period)
+        written += db.session.execute(insert(SpendRollup).from_select(
+            ['period', 'supplier_id', 'bucket_start', 'approved_amount', 'order_count', 'pre_season_amount'],
+            select(literal(period), Order.supplier_id, bucket, money_sum(Order.order_amount),
+                   func.count(), money_sum(pre_season))
+            .join(Supplier, Order.supplier_id == Supplier.id)
+            .where(Order.order_status == 'Approved')
+            .group_by(Order.supplier_id, bucket)
+        )).rowcount
+    
+    db.session.commit()
+    cache.invalidate('suppliers')
+    return written
+
+def spend_series(period, supplier_id=None, date_from=None, date_to=None):
+    """Approved spend per supplier, one entry per bucket with approvals, oldest first.
+    
+    date_from and date_to select the buckets that overlap [date_from, date_to).
+    """
+    query = db.session.query(
+        SpendRollup.supplier_id,
+        Supplier.name,
+        SpendRollup.bucket_start,
+        SpendRollup.approved_amount,
+        SpendRollup.order_count
+    ).join(Supplier, SpendRollup.supplier_id == Supplier.id).filter(
+        SpendRollup.period == period,
+        Supplier.deletion_requested_at.is_(None)
+    )
+    if supplier_id is not None:
+        query = query.filter(SpendRollup.supplier_id == supplier_id)
+    if date_from is not None:
+        query = query.filter(SpendRollup.bucket_start >= bucket_start(date_from, period))
+    if date_to is not None:
+        query = query.filter(SpendRollup.bucket_start < date_to)
+    
+    series = {}
+    for row in query.order_by(Supplier.name, SpendRollup.bucket_start).all():
+        entry = series.setdefault(row.supplier_id, {
+            'supplier_id': row.supplier_id,
+            'supplier_name': row.name,
+            'buckets': []
+        })
+        entry['buckets'].append({
+            'start': row.bucket_start.isoformat(),
+            'approved_amount': to_major(row.approved_amount),
+            'order_count': row.order_count
+        })
+    return list(series.values())
+
+def burndown_series(period, supplier_id=None):
+    """initial_amount left after each bucket of the current season, per supplier.
+    
+    Only spend approved since the season started counts, so a bucket the
+    season opened in leaves out the approvals made before the rollover.
+    """
+    suppliers = db.session.query(
+        Supplier.id,
+        Supplier.name,
+        Supplier.initial_amount,
+        Supplier.current_amount,
+        Supplier.season_started_at
+    ).filter(Supplier.deletion_requested_at.is_(None))
+    buckets = db.session.query(
+        SpendRollup.supplier_id,
+        SpendRollup.bucket_start,
+        (SpendRollup.approved_amount - SpendRollup.pre_season_amount).label('spent')
+    ).join(Supplier, SpendRollup.supplier_id == Supplier.id).filter(
+        SpendRollup.period == period,
+        SpendRollup.bucket_start >= bucket_expression(Supplier.season_started_at, period),
+        Supplier.deletion_requested_at.is_(None)
+    )
+    if supplier_id is not None:
+        suppliers = suppliers.filter(Supplier.id == supplier_id)
+        buckets = buckets.filter(SpendRollup.supplier_id == supplier_id)
+    
+    series = {}
+    remaining = {}
+    for row in suppliers.order_by(Supplier.name).all():
+        series[row.id] = {
+            'supplier_id': row.id,
+            'supplier_name': row.name,
+            'initial_amount': to_major(row.initial_amount),
+            'current_amount': to_major(row.current_amount),
+            'season_started_at': row.season_started_at.isoformat(),
+            'buckets': []
+        }
+        remaining[row.id] = row.initial_amount
+    
+    for row in buckets.order_by(SpendRollup.supplier_id, SpendRollup.bucket_start).all():
+        if row.supplier_id not in series:
+            continue
+        remaining[row.supplier_id] -= row.spent
+        series[row.supplier_id]['buckets'].append({
+            'start': row.bucket_start.isoformat(),
+            'approved_amount': to_major(row.spent),
+            'remaining': to_major(remaining[row.supplier_id])
+        })
+    return list(series.values())
@@ -1,35 +1,65 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Blueprint, current_app, jsonify, request, make_response, Response, stream_with_context
 from flask_cors import CORS
 import os
+import base64
+from datetime import datetime
 from dotenv import load_dotenv
-from models import db, Supplier, Order, Transaction
+from sqlalchemy import tuple_, update, insert, delete, select, func, case
+from sqlalchemy.orm import joinedload
+from models import db, Supplier, Order, Transaction, Job, upsert, major_units, money_sum
+from money import to_minor, to_major, format_major
+from validators import ValidationError, validate_new_supplier, validate_new_order, validate_initialization
+from importer import IMPORTERS, IMPORT_FORMATS, DEFAULT_CHUNK_SIZE, open_text_stream
+from ledger import ledger_balance, reconcile, initialize_suppliers
+from deletion import SYNC_DELETE_MAX_ROWS, remaining_rows
+from jobs import JOB_STATUSES, enqueue, job_handler
+from analytics import ROLLUP_PERIODS, record_approved_spend, spend_series, burndown_series
+from search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_terms, order_matches, supplier_matches
+from exporter import EXPORT_FORMATS, EXPORT_MIMETYPES, EXPORT_CHUNK_ROWS, EXPORT_WRITERS
+from changefeed import read_changes, DEFAULT_FEED_LIMIT, MAX_FEED_LIMIT
+from cache import cache, CacheEntry, make_etag
+from events import events
+from profiling import profiler
+from replica import replicas, read_primary, READ_PRIMARY_FOR_HEADER
+from idempotency import idempotent, remember_response, conflict_response
+from serialization import FastJSONProvider, STREAM_CHUNK_ROWS, rows_to_dicts, stream_json_array
 from config import config
 
 load_dotenv()
 
+api = Blueprint('api', __name__)
+
 def create_app(config_name=None):
     """Application factory pattern"""
     app = Flask(__name__)
     
-    # Use production configuration (PostgreSQL only)
+    # Use production configuration unless FLASK_CONFIG says otherwise
     if config_name is None:
-        config_name = 'production'
+        config_name = os.getenv('FLASK_CONFIG', 'production')
     
     app.config.from_object(config[config_name])
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
     db.init_app(app)
-    CORS(app)
+    cache.init_app(app)
+    events.init_app(app)
+    profiler.init_app(app)
+    replicas.init_app(app)
+    CORS(app, expose_headers=['X-Next-Cursor', 'X-Next-Offset', 'ETag', READ_PRIMARY_FOR_HEADER])
+    
+    # Schema changes are applied at deploy time by create_tables.py (Alembic),
+    # so starting a worker does no DDL. Throwaway test databases have no deploy
+    # step and are built straight from the models instead.
+    if app.config.get('CREATE_SCHEMA_ON_STARTUP'):
+        with app.app_context():
+            db.create_all()
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    app.register_blueprint(api)
     
     return app
 
-app = create_app()
-
-@app.route('/')
+@api.route('/')
 def home():
     return jsonify({
         "message": "Barter Management System API",
@@ -42,12 +72,65 @@ def home():
         }
     })
 
-@app.route('/api/suppliers', methods=['GET', 'POST'])
+# Response headers that are part of a cached list response
+CACHED_HEADERS = ('X-Next-Cursor', 'X-Next-Offset')
+
+def cached_json_response(namespace, build):
+    """Serve a GET list response through the response cache.
+    
+    The cache key is the request path and query string, resolved before the
+    database is read. Responses carry a strong ETag, and a matching
+    If-None-Match gets 304 with no body.
+    """
+    key = cache.key(namespace, request.full_path) if cache.enabled else None
+    # A client reading its own writes skips entries that may have been built
+    # from a lagging replica, and refreshes the entry for everyone else
+    entry = cache.get(key) if key and not replicas.reads_own_writes() else None
+    
+    if entry is None:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+        body = response.get_data()
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        entry = CacheEntry(body, make_etag(body), headers)
+        if key:
+            cache.set(key, entry)
+    
+    if request.if_none_match.contains(entry.etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(entry.body, mimetype='application/json')
+        response.headers.update(entry.headers)
+    
+    response.set_etag(entry.etag)
+    # Let browsers keep the body but revalidate with If-None-Match every time
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# Columns of a supplier list row; keys and values match Supplier.to_dict()
+SUPPLIER_LIST_COLUMNS = (
+    Supplier.id.label('id'),
+    Supplier.name.label('name'),
+    major_units(Supplier.initial_amount).label('initial_amount'),
+    major_units(Supplier.current_amount).label('current_amount'),
+    Supplier.supplier_financial_id.label('supplier_financial_id'),
+    Supplier.created_at.label('created_at'),
+    Supplier.updated_at.label('updated_at')
+)
+
+def suppliers_response():
+    rows = (db.session.query(*SUPPLIER_LIST_COLUMNS)
+            .filter(Supplier.deletion_requested_at.is_(None))
+            .order_by(Supplier.name).all())
+    return jsonify(rows_to_dicts(rows))
+
+@api.route('/api/suppliers', methods=['GET', 'POST'])
+@idempotent
 def suppliers():
     if request.method == 'GET':
         try:
-            suppliers_list = Supplier.query.order_by(Supplier.name).all()
-            return jsonify([supplier.to_dict() for supplier in suppliers_list])
+            return cached_json_response('suppliers', suppliers_response)
         except Exception as e:
             return jsonify({"error": f"Failed to fetch suppliers: {str(e)}"}), 500
     
@@ -55,63 +138,53 @@ def suppliers():
         try:
             data = request.get_json()
             
-            # Validate required fields
-            required_fields = ['name', 'initialAmount']
-            for field in required_fields:
-                if not data.get(field):
-                    return jsonify({"message": f"Missing required field: {field}"}), 400
+            # Validate required fields and values
+            fields = validate_new_supplier(data)
             
-            name = data['name'].strip()
-            initial_amount = float(data['initialAmount'])
-            current_amount = float(data.get('currentAmount', initial_amount))
-            supplier_financial_id = data.get('supplierFinancialId')
-            
-            # Validate values
-            if initial_amount < 0 or current_amount < 0:
-                return jsonify({"message": "Amounts must be non-negative"}), 400
-                
-            if len(name) < 1:
-                return jsonify({"message": "Supplier name cannot be empty"}), 400
-            
-            # Check if supplier name already exists
-            existing_supplier = Supplier.query.filter_by(name=name).first()
-            if existing_supplier:
-                return jsonify({"message": "Supplier name already exists"}), 400
-            
-            # Create new supplier
-            supplier = Supplier(
-                name=name,
-                initial_amount=initial_amount,
-                current_amount=current_amount,
-                supplier_financial_id=supplier_financial_id
-            )
-            
-            db.session.add(supplier)
-            db.session.flush()  # Get the ID
-            
-            # Create initial transaction
-            transaction = Transaction(
-                supplier_id=supplier.id,
-                transaction_type='initial',
-                amount=initial_amount,
-                description='Initial supplier setup'
-            )
+            # The unique name index rejects duplicates, including concurrent ones,
+            # within the INSERT itself
+            supplier = db.session.scalars(
+                upsert(Supplier).values(**fields)
+                .on_conflict_do_nothing(index_elements=[Supplier.name])
+                .returning(Supplier)
+            ).first()
+            if supplier is None:
+                return conflict_response((jsonify({"message": "Supplier name already exists"}), 400))
             
-            db.session.add(transaction)
-            db.session.commit()
+            # Initial transaction, plus a partly used opening balance so the ledger matches current_amount
+            ledger_rows = [{
+                'supplier_id': supplier.id,
+                'transaction_type': 'initial',
+                'amount': fields['initial_amount'],
+                'description': 'Initial supplier setup'
+            }]
+            if fields['current_amount'] != fields['initial_amount']:
+                ledger_rows.append({
+                    'supplier_id': supplier.id,
+                    'transaction_type': 'update',
+                    'amount': fields['current_amount'],
+                    'description': f"Opening balance set to {format_major(fields['current_amount'])}"
+                })
+            db.session.execute(insert(Transaction), ledger_rows)
             
-            return jsonify({
+            payload = {
                 "message": "Supplier added successfully",
                 "supplier": supplier.to_dict()
-            }), 201
+            }
+            if not remember_response(payload, 201):
+                return conflict_response((jsonify({"message": "Supplier name already exists"}), 400))
+            db.session.commit()
+            cache.invalidate('suppliers')
+            
+            return jsonify(payload), 201
                 
-        except ValueError:
-            return jsonify({"message": "Invalid number format for amounts"}), 400
+        except ValidationError as e:
+            return jsonify({"message": str(e)}), 400
         except Exception as e:
             db.session.rollback()
             return jsonify({"message": f"Server error: {str(e)}"}), 500
 
-@app.route('/api/suppliers/<int:supplier_id>', methods=['PUT', 'DELETE'])
+@api.route('/api/suppliers/<int:supplier_id>', methods=['PUT', 'DELETE'])
 def supplier_operations(supplier_id):
     if request.method == 'PUT':
         try:
@@ -125,8 +198,8 @@ def supplier_operations(supplier_id):
                     return jsonify({"message": f"Missing required field: {field}"}), 400
             
             name = data['name'].strip()
-            initial_amount = float(data['initialAmount'])
-            current_amount = float(data['currentAmount'])
+            initial_amount = to_minor(data['initialAmount'])
+            current_amount = to_minor(data['currentAmount'])
             supplier_financial_id = data.get('supplierFinancialId')
             
             # Validate values
@@ -155,11 +228,12 @@ def supplier_operations(supplier_id):
                 supplier_id=supplier_id,
                 transaction_type='update',
                 amount=current_amount,
-                description=f'Supplier updated - Current amount set to {current_amount}'
+                description=f'Supplier updated - Current amount set to {format_major(current_amount)}'
             )
             
             db.session.add(transaction)
             db.session.commit()
+            cache.invalidate('suppliers', 'orders')
             
             return jsonify({
                 "message": "Supplier updated successfully",
@@ -174,25 +248,305 @@ def supplier_operations(supplier_id):
     
     elif request.method == 'DELETE':
         try:
-            supplier = Supplier.query.get_or_404(supplier_id)
+            supplier = db.session.get(Supplier, supplier_id)
+            if supplier is None:
+                return jsonify({"message": "Supplier not found"}), 404
             supplier_name = supplier.name
+            remaining = remaining_rows(supplier_id)
+            
+            # A short history goes in one statement; ON DELETE CASCADE removes the dependent rows
+            if supplier.deletion_requested_at is None and sum(remaining.values()) <= SYNC_DELETE_MAX_ROWS:
+                db.session.execute(delete(Supplier).where(Supplier.id == supplier_id))
+                db.session.commit()
+                cache.invalidate('suppliers', 'orders')
+                
+                return jsonify({"message": f'Supplier "{supplier_name}" and all history deleted successfully'}), 200
             
-            # Delete supplier (cascade will handle transactions and orders)
-            db.session.delete(supplier)
+            # A long one is hidden now and purged in chunks by a background job
+            if supplier.deletion_requested_at is None:
+                supplier.deletion_requested_at = datetime.utcnow()
+            job = enqueue('purge_supplier', {'supplier_id': supplier_id}, dedupe_key=f'purge_supplier:{supplier_id}')
             db.session.commit()
+            cache.invalidate('suppliers', 'orders')
             
-            return jsonify({"message": f'Supplier "{supplier_name}" and all history deleted successfully'}), 200
+            status_url = f'/api/suppliers/{supplier_id}/deletion'
+            response = jsonify({
+                "message": f'Supplier "{supplier_name}" is being deleted; its history is removed in the background',
+                "status_url": status_url,
+                "job_id": job.id,
+                "remaining": remaining
+            })
+            response.headers['Location'] = status_url
+            return response, 202
                 
         except Exception as e:
             db.session.rollback()
             return jsonify({"message": f"Server error: {str(e)}"}), 500
 
-@app.route('/api/orders', methods=['GET', 'POST'])
+@api.route('/api/suppliers/<int:supplier_id>/deletion', methods=['GET'])
+def supplier_deletion_status(supplier_id):
+    """Progress of a background supplier deletion; a supplier that no longer exists is reported as deleted"""
+    try:
+        supplier = db.session.get(Supplier, supplier_id)
+        if supplier is None:
+            return jsonify({"status": "deleted"}), 200
+        if supplier.deletion_requested_at is None:
+            return jsonify({"message": "Supplier is not being deleted"}), 404
+        
+        return jsonify({
+            "status": "deleting",
+            "requested_at": supplier.deletion_requested_at,
+            "remaining": remaining_rows(supplier_id)
+        }), 200
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch deletion status: {str(e)}"}), 500
+
+def initialization_message(report):
+    message = f"{report['suppliers']} supplier(s) initialized; {report['transactions_compacted']} transactions compacted"
+    if report['transactions_archived']:
+        message += f", {report['transactions_archived']} archived"
+    return message
+
+@api.route('/api/suppliers/<int:supplier_id>/initialize', methods=['POST'])
+def initialize_supplier(supplier_id):
+    try:
+        if db.session.get(Supplier, supplier_id) is None:
+            return jsonify({"message": "Supplier not found"}), 404
+        fields = validate_initialization(request.get_json())
+        
+        report = initialize_suppliers([supplier_id], **fields)
+        db.session.commit()
+        cache.invalidate('suppliers')
+        
+        return jsonify({
+            "message": initialization_message(report),
+            "supplier": db.session.get(Supplier, supplier_id).to_dict(),
+            **report
+        }), 200
+    
+    except ValidationError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+@api.route('/api/suppliers/initialize', methods=['POST'])
+def initialize_supplier_batch():
+    """Season rollover for a list of suppliers, or every supplier with "all": true"""
+    try:
+        data = request.get_json()
+        fields = validate_initialization(data, require_initial_amount=False)
+        
+        if data.get('all') is True:
+            supplier_ids = None
+        else:
+            supplier_ids = data.get('supplierIds')
+            if not isinstance(supplier_ids, list) or not supplier_ids:
+                return jsonify({"message": "Provide supplierIds or \"all\": true"}), 400
+            if not all(isinstance(supplier_id, int) for supplier_id in supplier_ids):
+                return jsonify({"message": "supplierIds must be integers"}), 400
+            supplier_ids = sorted(set(supplier_ids))
+            found = db.session.query(func.count(Supplier.id)).filter(Supplier.id.in_(supplier_ids)).scalar()
+            if found != len(supplier_ids):
+                return jsonify({"message": "One or more suppliers not found"}), 404
+        
+        report = initialize_suppliers(supplier_ids, **fields)
+        db.session.commit()
+        cache.invalidate('suppliers')
+        
+        return jsonify({"message": initialization_message(report), **report}), 200
+    
+    except ValidationError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+ORDER_STATUSES = ('Pending', 'Approved', 'Rejected')
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(created_at, order_id):
+    """Encode the (created_at, order_id) keyset position as an opaque token"""
+    raw = f"{created_at.isoformat()}|{order_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """Decode a token produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, order_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), order_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def parse_date_param(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date for {name}, expected ISO format")
+
+def supplier_id_param():
+    supplier_id = request.args.get('supplier_id')
+    if not supplier_id:
+        return None
+    try:
+        return int(supplier_id)
+    except ValueError:
+        raise ValueError("Invalid supplier_id")
+
+# Columns of an order list row; keys and values match Order.to_dict()
+ORDER_LIST_COLUMNS = (
+    Order.order_id.label('order_id'),
+    Order.supplier_id.label('supplier_id'),
+    Supplier.name.label('supplier_name'),
+    Order.order_title.label('title'),
+    major_units(Order.order_amount).label('amount'),
+    Order.order_date.label('order_date'),
+    Order.ordered_by.label('ordered_by'),
+    Order.notes.label('notes'),
+    Order.order_status.label('status'),
+    Order.handler.label('handler'),
+    Order.created_at.label('created_at'),
+    Order.updated_at.label('updated_at')
+)
+
+def filtered_orders_query():
+    """Build the order listing query from supplier_id, status and date range arguments"""
+    # Select plain column tuples, with the supplier name from the same join, which also
+    # drops the orders of suppliers being deleted
+    query = db.session.query(*ORDER_LIST_COLUMNS).join(Supplier, Order.supplier_id == Supplier.id).filter(
+        Supplier.deletion_requested_at.is_(None)
+    )
+    
+    supplier_id = supplier_id_param()
+    if supplier_id is not None:
+        query = query.filter(Order.supplier_id == supplier_id)
+    
+    status = request.args.get('status')
+    if status:
+        if status not in ORDER_STATUSES:
+            raise ValueError(f"Invalid status, expected one of {', '.join(ORDER_STATUSES)}")
+        query = query.filter(Order.order_status == status)
+    
+    # Date range applies to created_at so it can use the keyset indexes
+    date_from = parse_date_param('date_from')
+    if date_from:
+        query = query.filter(Order.created_at >= date_from)
+    date_to = parse_date_param('date_to')
+    if date_to:
+        query = query.filter(Order.created_at < date_to)
+    
+    return query
+
+def after_cursor(query):
+    """Restrict the query to orders after the cursor argument, if there is one"""
+    cursor = request.args.get('cursor')
+    if cursor:
+        created_at, order_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Order.created_at, Order.order_id) < tuple_(created_at, order_id))
+    return query
+
+def paginate_orders(query):
+    """Apply keyset pagination on (created_at, order_id), newest first.
+    
+    Returns the page of orders and the cursor for the next page (or None).
+    """
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("Invalid limit")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    # Fetch one extra row to know whether another page exists
+    page = after_cursor(query).order_by(Order.created_at.desc(), Order.order_id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].order_id)
+    
+    return page, next_cursor
+
+def orders_response():
+    orders_list, next_cursor = paginate_orders(filtered_orders_query())
+    response = jsonify(rows_to_dicts(orders_list))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+def stream_orders_response():
+    """Every matching order as one JSON array, streamed as it is read"""
+    query = after_cursor(filtered_orders_query()).order_by(Order.created_at.desc(), Order.order_id.desc()).yield_per(STREAM_CHUNK_ROWS)
+    return Response(stream_with_context(stream_json_array(query)), mimetype='application/json')
+
+def search_page(query, rank, *tiebreakers):
+    """Best-ranked page of a search query from q, limit and offset arguments.
+    
+    Sets X-Next-Offset when another page exists.
+    """
+    try:
+        limit = max(1, min(int(request.args.get('limit', DEFAULT_SEARCH_LIMIT)), MAX_SEARCH_LIMIT))
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        raise ValueError("Invalid limit or offset")
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(rank.desc(), *tiebreakers).offset(offset).limit(limit + 1).all()
+    response = jsonify(rows_to_dicts(rows[:limit]))
+    if len(rows) > limit:
+        response.headers['X-Next-Offset'] = str(offset + limit)
+    return response
+
+def search_query_param():
+    query = request.args.get('q', '')
+    if not search_terms(query):
+        raise ValueError("Search query q must contain at least one word")
+    return query
+
+def order_search_response():
+    matches = order_matches(search_query_param())
+    query = filtered_orders_query().join(matches, matches.c.order_id == Order.order_id)
+    return search_page(query, matches.c.rank, Order.created_at.desc(), Order.order_id.desc())
+
+def supplier_search_response():
+    matches = supplier_matches(search_query_param())
+    query = (db.session.query(*SUPPLIER_LIST_COLUMNS)
+             .join(matches, matches.c.supplier_id == Supplier.id)
+             .filter(Supplier.deletion_requested_at.is_(None)))
+    return search_page(query, matches.c.rank, Supplier.name)
+
+@api.route('/api/search/orders', methods=['GET'])
+def search_orders():
+    """Ranked orders matching q in their title, ordered_by, notes or supplier name"""
+    try:
+        return cached_json_response('orders', order_search_response)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Failed to search orders: {str(e)}"}), 500
+
+@api.route('/api/search/suppliers', methods=['GET'])
+def search_suppliers():
+    try:
+        return cached_json_response('suppliers', supplier_search_response)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Failed to search suppliers: {str(e)}"}), 500
+
+@api.route('/api/orders', methods=['GET', 'POST'])
+@idempotent
 def orders():
     if request.method == 'GET':
         try:
-            orders_list = Order.query.order_by(Order.created_at.desc()).all()
-            return jsonify([order.to_dict() for order in orders_list])
+            if request.args.get('limit') == 'all':
+                return stream_orders_response()
+            return cached_json_response('orders', orders_response)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": f"Failed to fetch orders: {str(e)}"}), 500
     
@@ -200,66 +554,68 @@ def orders():
         try:
             data = request.get_json()
             
-            # Validate required fields
-            required_fields = ['orderId', 'supplierId', 'orderTitle', 'orderAmount', 'orderDate', 'orderedBy']
-            for field in required_fields:
-                if not data.get(field):
-                    return jsonify({"message": f"Missing required field: {field}"}), 400
-            
-            order_id = data['orderId']
-            supplier_id = int(data['supplierId'])
-            order_title = (data['orderTitle'] or '').strip()
-            order_amount = float(data['orderAmount'])
-            order_date = data['orderDate']
-            ordered_by = (data['orderedBy'] or '').strip()
-            notes = (data.get('notes') or '').strip() or None
-            
-            # Validate values
-            if order_amount <= 0:
-                return jsonify({"message": "Order amount must be greater than 0"}), 400
-                
-            if len(order_title) < 1:
-                return jsonify({"message": "Order title cannot be empty"}), 400
-                
-            if len(ordered_by) < 1:
-                return jsonify({"message": "Ordered by cannot be empty"}), 400
-            
-            # Check if order ID already exists
-            existing_order = Order.query.filter_by(order_id=order_id).first()
-            if existing_order:
-                return jsonify({"message": "Order ID already exists"}), 400
+            # Validate required fields and values
+            fields = validate_new_order(data)
             
-            # Verify supplier exists
-            supplier = Supplier.query.get(supplier_id)
-            if not supplier:
+            # Verify supplier exists (and keep it in the session for to_dict())
+            supplier = db.session.get(Supplier, fields['supplier_id'])
+            if not supplier or supplier.deletion_requested_at is not None:
                 return jsonify({"message": "Supplier not found"}), 400
             
-            # Create new order
-            order = Order(
-                order_id=order_id,
-                supplier_id=supplier_id,
-                order_title=order_title,
-                order_amount=order_amount,
-                order_date=order_date,
-                ordered_by=ordered_by,
-                notes=notes
-            )
-            
-            db.session.add(order)
-            db.session.commit()
+            # A duplicate order ID, such as a concurrent retry, inserts nothing instead of raising
+            order = db.session.scalars(
+                upsert(Order).values(**fields)
+                .on_conflict_do_nothing(index_elements=[Order.order_id])
+                .returning(Order)
+            ).first()
+            if order is None:
+                return conflict_response((jsonify({"message": "Order ID already exists"}), 400))
             
-            return jsonify({
+            payload = {
                 "message": "Order created successfully",
                 "order": order.to_dict()
-            }), 201
+            }
+            if not remember_response(payload, 201):
+                return conflict_response((jsonify({"message": "Order ID already exists"}), 400))
+            events.publish('order_created', order_id=order.order_id, supplier_id=order.supplier_id, status='Pending')
+            db.session.commit()
+            cache.invalidate('orders')
+            
+            return jsonify(payload), 201
                 
-        except ValueError:
-            return jsonify({"message": "Invalid number format for supplier ID or amount"}), 400
+        except ValidationError as e:
+            return jsonify({"message": str(e)}), 400
         except Exception as e:
             db.session.rollback()
             return jsonify({"message": f"Server error: {str(e)}"}), 500
 
-@app.route('/api/orders/<order_id>/approve', methods=['PUT'])
+def active_supplier_ids():
+    """Ids of suppliers not being purged; their orders are hidden and cannot change status"""
+    return select(Supplier.id).where(Supplier.deletion_requested_at.is_(None))
+
+def unclaimed_message(order_status, deletion_requested_at):
+    """Why a status change skipped an order, given its current status and supplier"""
+    if order_status == 'Pending' and deletion_requested_at is not None:
+        return "Supplier is being deleted"
+    return f"Order is already {order_status.lower()}"
+
+def claim_pending_order(order_id, new_status, handler_name, now=None):
+    """Atomically move a Pending order to new_status.
+    
+    Runs UPDATE ... WHERE order_status = 'Pending', so the row lock taken by the
+    UPDATE serializes concurrent requests and only the first one matches.
+    Orders of suppliers being deleted are not matched. Returns True if this
+    call performed the transition.
+    """
+    updated = Order.query.filter_by(order_id=order_id, order_status='Pending').filter(
+        Order.supplier_id.in_(active_supplier_ids())
+    ).update(
+        {Order.order_status: new_status, Order.handler: handler_name, Order.updated_at: now or datetime.utcnow()},
+        synchronize_session=False
+    )
+    return updated == 1
+
+@api.route('/api/orders/<order_id>/approve', methods=['PUT'])
 def approve_order(order_id):
     try:
         data = request.get_json()
@@ -268,31 +624,38 @@ def approve_order(order_id):
         if not handler_name:
             return jsonify({"message": "Handler name is required"}), 400
         
-        order = Order.query.filter_by(order_id=order_id).first()
+        order = Order.query.options(joinedload(Order.supplier)).filter_by(order_id=order_id).first()
         if not order:
             return jsonify({"message": "Order not found"}), 404
         
-        if order.order_status != 'Pending':
-            return jsonify({"message": f"Order is already {order.order_status.lower()}"}), 400
-        
-        # Update order status
-        order.order_status = 'Approved'
-        order.handler = handler_name
+        # Conditional UPDATE: only one concurrent request can move the order out of Pending
+        approved_at = datetime.utcnow()
+        if not claim_pending_order(order_id, 'Approved', handler_name, approved_at):
+            db.session.rollback()
+            db.session.refresh(order)
+            return jsonify({"message": unclaimed_message(order.order_status, order.supplier.deletion_requested_at)}), 400
         
-        # Update supplier balance
-        supplier = order.supplier
-        supplier.current_amount -= order.order_amount
+        # Update supplier balance in the database rather than read-modify-write in Python
+        Supplier.query.filter_by(id=order.supplier_id).update(
+            {Supplier.current_amount: Supplier.current_amount - order.order_amount},
+            synchronize_session=False
+        )
         
         # Create transaction record
         transaction = Transaction(
             supplier_id=order.supplier_id,
             transaction_type='order_approved',
             amount=-order.order_amount,
-            description=f'Order {order_id} approved by {handler_name}'
+            description=f'Order {order_id} approved by {handler_name}',
+            created_at=approved_at
         )
         
         db.session.add(transaction)
+        record_approved_spend([(order.supplier_id, order.order_amount)], approved_at)
+        events.publish('order_approved', order_id=order_id, supplier_id=order.supplier_id,
+                       status='Approved', handler=handler_name)
         db.session.commit()
+        cache.invalidate('orders', 'suppliers')
         
         return jsonify({
             "message": f"Order {order_id} approved successfully by {handler_name}",
@@ -303,7 +666,7 @@ def approve_order(order_id):
         db.session.rollback()
         return jsonify({"message": f"Server error: {str(e)}"}), 500
 
-@app.route('/api/orders/<order_id>/reject', methods=['PUT'])
+@api.route('/api/orders/<order_id>/reject', methods=['PUT'])
 def reject_order(order_id):
     try:
         data = request.get_json()
@@ -312,18 +675,19 @@ def reject_order(order_id):
         if not handler_name:
             return jsonify({"message": "Handler name is required"}), 400
         
-        order = Order.query.filter_by(order_id=order_id).first()
+        order = Order.query.options(joinedload(Order.supplier)).filter_by(order_id=order_id).first()
         if not order:
             return jsonify({"message": "Order not found"}), 404
         
-        if order.order_status != 'Pending':
-            return jsonify({"message": f"Order is already {order.order_status.lower()}"}), 400
-        
-        # Update order status
-        order.order_status = 'Rejected'
-        order.handler = handler_name
+        if not claim_pending_order(order_id, 'Rejected', handler_name):
+            db.session.rollback()
+            db.session.refresh(order)
+            return jsonify({"message": unclaimed_message(order.order_status, order.supplier.deletion_requested_at)}), 400
         
+        events.publish('order_rejected', order_id=order_id, supplier_id=order.supplier_id,
+                       status='Rejected', handler=handler_name)
         db.session.commit()
+        cache.invalidate('orders')
         
         return jsonify({
             "message": f"Order {order_id} rejected successfully by {handler_name}",
@@ -334,11 +698,490 @@ def reject_order(order_id):
         db.session.rollback()
         return jsonify({"message": f"Server error: {str(e)}"}), 500
 
-@app.route('/api/admin/login', methods=['POST'])
+MAX_BULK_ORDERS = 1000
+# Ids listed in a bulk status event
+MAX_EVENT_IDS = 100
+
+def apply_bulk_status(order_ids, new_status, handler_name):
+    """Move the still-Pending orders among order_ids to new_status, without committing.
+    
+    Returns (number of orders changed, per-order results in order_ids order).
+    """
+    # One conditional UPDATE claims every order that is still Pending
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(Order)
+        .where(Order.order_id.in_(order_ids), Order.order_status == 'Pending',
+               Order.supplier_id.in_(active_supplier_ids()))
+        .values(order_status=new_status, handler=handler_name, updated_at=now)
+        .returning(Order.order_id, Order.supplier_id, Order.order_amount)
+        .execution_options(synchronize_session=False)
+    ).all()
+    claimed_ids = {row.order_id for row in claimed}
+    
+    if new_status == 'Approved' and claimed:
+        # Aggregate debits so each supplier balance is updated once
+        debits = {}
+        for row in claimed:
+            debits[row.supplier_id] = debits.get(row.supplier_id, 0) + row.order_amount
+        
+        # In supplier_id order, so concurrent bulk approvals lock shared suppliers in the same order
+        for supplier_id, total in sorted(debits.items()):
+            db.session.execute(
+                update(Supplier)
+                .where(Supplier.id == supplier_id)
+                .values(current_amount=Supplier.current_amount - total)
+                .execution_options(synchronize_session=False)
+            )
+        
+        db.session.execute(insert(Transaction), [
+            {
+                'supplier_id': row.supplier_id,
+                'transaction_type': 'order_approved',
+                'amount': -row.order_amount,
+                'description': f'Order {row.order_id} approved by {handler_name}',
+                'created_at': now
+            }
+            for row in claimed
+        ])
+        record_approved_spend(((row.supplier_id, row.order_amount) for row in claimed), now)
+    
+    # Explain why the remaining orders were skipped
+    unclaimed_ids = [order_id for order_id in order_ids if order_id not in claimed_ids]
+    current_states = {}
+    if unclaimed_ids:
+        current_states = {
+            row.order_id: row
+            for row in db.session.query(Order.order_id, Order.order_status, Supplier.deletion_requested_at)
+            .join(Supplier, Order.supplier_id == Supplier.id)
+            .filter(Order.order_id.in_(unclaimed_ids))
+        }
+    
+    if claimed:
+        # One summary event per batch; clients refetch the affected suppliers' orders.
+        # Both id lists are capped to keep it within the NOTIFY payload limit, and a
+        # truncated event reaches every subscriber whatever their supplier filter.
+        supplier_ids = sorted({row.supplier_id for row in claimed})
+        events.publish(f'orders_{new_status.lower()}', order_ids=sorted(claimed_ids)[:MAX_EVENT_IDS],
+                       count=len(claimed_ids), supplier_ids=supplier_ids[:MAX_EVENT_IDS],
+                       truncated=len(supplier_ids) > MAX_EVENT_IDS,
+                       status=new_status, handler=handler_name)
+    
+    results = []
+    for order_id in order_ids:
+        if order_id in claimed_ids:
+            results.append({"order_id": order_id, "success": True, "status": new_status})
+        elif order_id in current_states:
+            state = current_states[order_id]
+            results.append({
+                "order_id": order_id,
+                "success": False,
+                "message": unclaimed_message(state.order_status, state.deletion_requested_at)
+            })
+        else:
+            results.append({"order_id": order_id, "success": False, "message": "Order not found"})
+    return len(claimed_ids), results
+
+def invalidate_after_status_change(new_status):
+    cache.invalidate('orders')
+    if new_status == 'Approved':
+        cache.invalidate('suppliers')
+
+@job_handler('bulk_order_status')
+def bulk_order_status_job(payload, progress):
+    """Bulk approval or rejection too large for one request, committed MAX_BULK_ORDERS orders at a time"""
+    order_ids, new_status, handler_name = payload['order_ids'], payload['new_status'], payload['handler_name']
+    changed = 0
+    skipped = []
+    for start in range(0, len(order_ids), MAX_BULK_ORDERS):
+        count, results = apply_bulk_status(order_ids[start:start + MAX_BULK_ORDERS], new_status, handler_name)
+        db.session.commit()
+        invalidate_after_status_change(new_status)
+        changed += count
+        skipped += [result for result in results if not result['success']]
+        progress(min(start + MAX_BULK_ORDERS, len(order_ids)), len(order_ids))
+    # A retry after a partial run reports the orders it already changed as skipped
+    return {"changed": changed, "skipped": len(skipped), "skipped_orders": skipped[:MAX_BULK_ORDERS]}
+
+@api.route('/api/orders/bulk', methods=['PUT'])
+def bulk_order_status():
+    """Approve or reject many pending orders in a single database transaction.
+    
+    Larger batches than MAX_BULK_ORDERS are queued as a background job instead.
+    """
+    try:
+        data = request.get_json()
+        handler_name = (data.get('handler_name') or '').strip()
+        action = data.get('action')
+        order_ids = data.get('order_ids')
+        
+        if not handler_name:
+            return jsonify({"message": "Handler name is required"}), 400
+        
+        if action not in ('approve', 'reject'):
+            return jsonify({"message": "Action must be 'approve' or 'reject'"}), 400
+        
+        if not isinstance(order_ids, list) or not order_ids:
+            return jsonify({"message": "order_ids must be a non-empty list"}), 400
+        
+        # Preserve request order while dropping duplicates
+        order_ids = list(dict.fromkeys(str(order_id) for order_id in order_ids))
+        new_status = 'Approved' if action == 'approve' else 'Rejected'
+        
+        if len(order_ids) > MAX_BULK_ORDERS:
+            job = enqueue('bulk_order_status', {
+                'order_ids': order_ids,
+                'new_status': new_status,
+                'handler_name': handler_name
+            })
+            db.session.commit()
+            return job_accepted(job, f"{len(order_ids)} orders queued to be {new_status.lower()} by {handler_name}")
+        
+        changed, results = apply_bulk_status(order_ids, new_status, handler_name)
+        db.session.commit()
+        invalidate_after_status_change(new_status)
+        
+        return jsonify({
+            "message": f"{changed} of {len(order_ids)} orders {new_status.lower()} by {handler_name}",
+            "results": results
+        }), 200
+            
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+IMPORT_MIMETYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson'
+}
+
+@api.route('/api/import/<kind>', methods=['POST'])
+def import_data(kind):
+    """Bulk import suppliers or orders from a CSV or NDJSON upload"""
+    try:
+        if kind not in IMPORTERS:
+            return jsonify({"message": f"Unknown import type: {kind}"}), 404
+        
+        # Accept either a multipart file upload or the raw request body
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        mimetype = upload.mimetype if upload else request.mimetype
+        
+        fmt = request.args.get('format') or IMPORT_MIMETYPES.get(mimetype)
+        if fmt not in IMPORT_FORMATS:
+            return jsonify({"message": f"Format must be one of: {', '.join(IMPORT_FORMATS)}"}), 400
+        
+        try:
+            chunk_size = int(request.args.get('chunk_size', DEFAULT_CHUNK_SIZE))
+        except ValueError:
+            return jsonify({"message": "Invalid chunk_size"}), 400
+        if chunk_size < 1:
+            return jsonify({"message": "chunk_size must be positive"}), 400
+        
+        try:
+            report = IMPORTERS[kind](open_text_stream(stream), fmt, chunk_size)
+        finally:
+            # Earlier chunks may have been committed even if a later one failed
+            cache.invalidate(kind)
+        
+        return jsonify({
+            "message": f"Imported {report['imported']} {kind}, {report['failed']} rows failed",
+            **report
+        }), 200
+            
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+# Columns of a transaction export row
+TRANSACTION_EXPORT_COLUMNS = (
+    Transaction.id.label('id'),
+    Transaction.supplier_id.label('supplier_id'),
+    Supplier.name.label('supplier_name'),
+    Transaction.transaction_type.label('transaction_type'),
+    major_units(Transaction.amount).label('amount'),
+    Transaction.description.label('description'),
+    Transaction.created_at.label('created_at')
+)
+
+def export_query(kind):
+    """Orders or transactions matching the request filters, oldest first"""
+    if kind == 'orders':
+        return filtered_orders_query().order_by(Order.created_at, Order.order_id)
+    
+    query = db.session.query(*TRANSACTION_EXPORT_COLUMNS).join(Supplier, Transaction.supplier_id == Supplier.id)
+    supplier_id = supplier_id_param()
+    if supplier_id is not None:
+        query = query.filter(Transaction.supplier_id == supplier_id)
+    date_from = parse_date_param('date_from')
+    if date_from:
+        query = query.filter(Transaction.created_at >= date_from)
+    date_to = parse_date_param('date_to')
+    if date_to:
+        query = query.filter(Transaction.created_at < date_to)
+    return query.order_by(Transaction.id)
+
+@api.route('/api/export/<kind>', methods=['GET'])
+def export_data(kind):
+    """Stream orders or transactions as a CSV or XLSX download"""
+    try:
+        if kind not in ('orders', 'transactions'):
+            return jsonify({"message": f"Unknown export type: {kind}"}), 404
+        
+        fmt = request.args.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({"message": f"Format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        
+        # yield_per reads through a server-side cursor on PostgreSQL, so rows are
+        # fetched as they are written rather than loaded all at once
+        query = export_query(kind).yield_per(EXPORT_CHUNK_ROWS)
+        columns = [column['name'] for column in query.column_descriptions]
+        filename = f"{kind}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+        
+        return Response(
+            stream_with_context(EXPORT_WRITERS[fmt](query, columns)),
+            mimetype=EXPORT_MIMETYPES[fmt],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+def balances_query(supplier_id=None):
+    """Per-supplier balances with order totals by status, as one grouped query"""
+    def total_for(status):
+        return money_sum(case((Order.order_status == status, Order.order_amount), else_=0))
+    
+    order_totals = db.session.query(
+        Order.supplier_id.label('supplier_id'),
+        total_for('Approved').label('total_approved'),
+        total_for('Pending').label('total_pending'),
+        total_for('Rejected').label('total_rejected')
+    )
+    if supplier_id is not None:
+        # Filter inside the aggregate so only this supplier's orders are scanned
+        order_totals = order_totals.filter(Order.supplier_id == supplier_id)
+    order_totals = order_totals.group_by(Order.supplier_id).subquery()
+    
+    query = db.session.query(
+        Supplier.id,
+        Supplier.name,
+        Supplier.initial_amount,
+        Supplier.current_amount,
+        func.coalesce(order_totals.c.total_approved, 0).label('total_approved'),
+        func.coalesce(order_totals.c.total_pending, 0).label('total_pending'),
+        func.coalesce(order_totals.c.total_rejected, 0).label('total_rejected')
+    ).outerjoin(order_totals, order_totals.c.supplier_id == Supplier.id).filter(Supplier.deletion_requested_at.is_(None))
+    if supplier_id is not None:
+        query = query.filter(Supplier.id == supplier_id)
+    return query
+
+def balance_to_dict(row):
+    return {
+        'supplier_id': row.id,
+        'supplier_name': row.name,
+        'initial_amount': to_major(row.initial_amount),
+        'current_amount': to_major(row.current_amount),
+        'total_approved': to_major(row.total_approved),
+        'total_pending': to_major(row.total_pending),
+        'total_rejected': to_major(row.total_rejected)
+    }
+
+@api.route('/api/balances', methods=['GET'])
+def balances():
+    try:
+        rows = balances_query().order_by(Supplier.name).all()
+        return jsonify([balance_to_dict(row) for row in rows])
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch balances: {str(e)}"}), 500
+
+@api.route('/api/balances/<int:supplier_id>', methods=['GET'])
+def supplier_balance(supplier_id):
+    try:
+        row = balances_query(supplier_id).first()
+        if not row:
+            return jsonify({"message": "Supplier not found"}), 404
+        return jsonify(balance_to_dict(row))
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch balance: {str(e)}"}), 500
+
+@api.route('/api/balances/<int:supplier_id>/ledger', methods=['GET'])
+def supplier_ledger_balance(supplier_id):
+    """Balance derived from the transaction ledger, optionally as of a past date"""
+    try:
+        as_of = parse_date_param('as_of')
+        if not Supplier.query.get(supplier_id):
+            return jsonify({"message": "Supplier not found"}), 404
+        
+        balance = ledger_balance(supplier_id, as_of)
+        return jsonify({
+            'supplier_id': supplier_id,
+            'as_of': as_of.isoformat() if as_of else None,
+            'balance': to_major(balance) if balance is not None else None
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Failed to compute ledger balance: {str(e)}"}), 500
+
+@api.route('/api/ledger/snapshots', methods=['POST'])
+def ledger_snapshots():
+    try:
+        job = enqueue('ledger_snapshots', dedupe_key='ledger_snapshots')
+        db.session.commit()
+        return job_accepted(job, "Balance snapshots queued")
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+@api.route('/api/ledger/reconcile', methods=['GET'])
+def ledger_reconcile():
+    try:
+        return jsonify(reconcile())
+    except Exception as e:
+        return jsonify({"error": f"Failed to reconcile ledger: {str(e)}"}), 500
+
+def rollup_period_param():
+    period = request.args.get('period', 'month')
+    if period not in ROLLUP_PERIODS:
+        raise ValueError(f"Invalid period, expected one of {', '.join(ROLLUP_PERIODS)}")
+    return period
+
+def spend_response():
+    period = rollup_period_param()
+    return jsonify({
+        'period': period,
+        'suppliers': spend_series(period, supplier_id_param(), parse_date_param('date_from'), parse_date_param('date_to'))
+    })
+
+def burndown_response():
+    period = rollup_period_param()
+    return jsonify({'period': period, 'suppliers': burndown_series(period, supplier_id_param())})
+
+# Served from the spend rollups; every approval also invalidates the suppliers cache namespace
+@api.route('/api/analytics/spend', methods=['GET'])
+def spend_analytics():
+    """Approved spend per supplier per week or month"""
+    try:
+        return cached_json_response('suppliers', spend_response)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch spend: {str(e)}"}), 500
+
+@api.route('/api/analytics/burndown', methods=['GET'])
+def burndown_analytics():
+    """initial_amount remaining after each week or month of the current season"""
+    try:
+        return cached_json_response('suppliers', burndown_response)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch burn-down: {str(e)}"}), 500
+
+def job_accepted(job, message):
+    """202 response for queued work, pointing at the job's status"""
+    status_url = f'/api/jobs/{job.id}'
+    response = jsonify({"message": message, "job": job.to_dict(), "status_url": status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
+# Kinds clients may queue directly. Supplier purges and bulk status changes are
+# queued by DELETE /api/suppliers/<id> and PUT /api/orders/bulk, which check them first.
+API_JOB_KINDS = ('ledger_snapshots', 'ledger_reconcile', 'spend_rollups')
+
+def validate_job_payload(kind, payload):
+    """Payload to queue for kind; only ledger_snapshots takes an option, supplier_ids"""
+    if not isinstance(payload, dict):
+        raise ValueError("payload must be an object")
+    supplier_ids = payload.get('supplier_ids')
+    if kind != 'ledger_snapshots' or supplier_ids is None:
+        return {}
+    if not isinstance(supplier_ids, list) or not all(type(supplier_id) is int for supplier_id in supplier_ids):
+        raise ValueError("payload.supplier_ids must be a list of supplier IDs")
+    return {'supplier_ids': supplier_ids}
+
+@api.route('/api/jobs', methods=['GET', 'POST'])
+def jobs():
+    if request.method == 'GET':
+        try:
+            query = Job.query
+            status = request.args.get('status')
+            if status:
+                if status not in JOB_STATUSES:
+                    return jsonify({"error": f"Invalid status, expected one of {', '.join(JOB_STATUSES)}"}), 400
+                query = query.filter(Job.status == status)
+            kind = request.args.get('kind')
+            if kind:
+                query = query.filter(Job.kind == kind)
+            
+            limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+            return jsonify([job.to_dict() for job in query.order_by(Job.id.desc()).limit(limit)])
+        except Exception as e:
+            return jsonify({"error": f"Failed to fetch jobs: {str(e)}"}), 500
+    
+    try:
+        data = request.get_json()
+        kind = data.get('kind')
+        if kind not in API_JOB_KINDS:
+            return jsonify({"message": f"Unknown job kind, expected one of {', '.join(API_JOB_KINDS)}"}), 400
+        payload = validate_job_payload(kind, data.get('payload') or {})
+        
+        job = enqueue(kind, payload)
+        db.session.commit()
+        return job_accepted(job, f"{kind} job queued")
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+@api.route('/api/jobs/<int:job_id>', methods=['GET'])
+def job_status(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+# On a lagging replica, rows could appear after the client's cursor had passed them
+@api.route('/api/changes', methods=['GET'])
+@read_primary
+def changes():
+    """Incremental feed of suppliers, orders and transactions changed since a cursor"""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_FEED_LIMIT))
+        limit = max(1, min(limit, MAX_FEED_LIMIT))
+        since = parse_date_param('since')
+        return jsonify(read_changes(request.args.get('cursor'), since, limit))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch changes: {str(e)}"}), 500
+
+@api.route('/api/events', methods=['GET'])
+def event_stream():
+    """Server-Sent Events stream of order creation, approval and rejection"""
+    supplier_id = request.args.get('supplier_id', type=int)
+    
+    def matches(payload):
+        if supplier_id is None or payload.get('truncated'):
+            return True
+        return payload.get('supplier_id') == supplier_id or supplier_id in payload.get('supplier_ids', [])
+    
+    subscriber = events.subscribe()
+    return Response(
+        stream_with_context(events.stream(subscriber, matches)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api.route('/api/admin/login', methods=['POST'])
 def admin_login():
     data = request.get_json()
     password = data.get('password', '')
-    admin_password = app.config['ADMIN_PASSWORD']
+    admin_password = current_app.config['ADMIN_PASSWORD']
     
     if password == admin_password:
         return jsonify({
@@ -352,6 +1195,8 @@ def admin_login():
             "message": "Invalid password"
         }), 401
 
+app = create_app()
+
 if __name__ == '__main__':
     # Railway provides PORT environment variable, fallback to FLASK_PORT or 5000
     port = int(os.getenv('PORT', os.getenv('FLASK_PORT', 5000)))
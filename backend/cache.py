@@ -0,0 +1,135 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# A cached 200 response: raw JSON body, its strong ETag and extra headers to replay
+CacheEntry = namedtuple('CacheEntry', ['body', 'etag', 'headers'])
+
+def make_etag(body):
+    return hashlib.sha1(body).hexdigest()
+
+class LocalBackend:
+    """In-process TTL + LRU store.
+    
+    Each namespace has a generation number that is part of every key, so
+    invalidating a namespace is a counter bump; stale entries are never read
+    again and age out of the LRU. Callers resolve the key before reading the
+    database, so a response built from pre-invalidation data is stored under
+    the old generation.
+    """
+    
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.generations = {}
+        self.lock = threading.Lock()
+    
+    def key(self, namespace, key):
+        with self.lock:
+            return (namespace, self.generations.get(namespace, 0), key)
+    
+    def get(self, full_key):
+        with self.lock:
+            item = self.entries.get(full_key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self.entries[full_key]
+                return None
+            self.entries.move_to_end(full_key)
+            return entry
+    
+    def set(self, full_key, entry):
+        with self.lock:
+            self.entries[full_key] = (time.monotonic() + self.ttl, entry)
+            self.entries.move_to_end(full_key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def invalidate(self, namespace):
+        with self.lock:
+            self.generations[namespace] = self.generations.get(namespace, 0) + 1
+
+class RedisBackend:
+    """Redis-backed store, shared by every worker so invalidation is global"""
+    
+    def __init__(self, url, ttl, prefix='barter:cache'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+    
+    def key(self, namespace, key):
+        generation = int(self.client.get(f'{self.prefix}:gen:{namespace}') or 0)
+        return f'{self.prefix}:{namespace}:{generation}:{key}'
+    
+    def get(self, full_key):
+        item = self.client.hgetall(full_key)
+        if not item:
+            return None
+        meta = json.loads(item[b'meta'])
+        return CacheEntry(item[b'body'], meta['etag'], meta['headers'])
+    
+    def set(self, full_key, entry):
+        meta = json.dumps({'etag': entry.etag, 'headers': entry.headers})
+        pipeline = self.client.pipeline()
+        pipeline.hset(full_key, mapping={'body': entry.body, 'meta': meta})
+        pipeline.expire(full_key, self.ttl)
+        pipeline.execute()
+    
+    def invalidate(self, namespace):
+        self.client.incr(f'{self.prefix}:gen:{namespace}')
+
+class ResponseCache:
+    """Cache for serialized list responses, configured like a Flask extension.
+    
+    CACHE_BACKEND selects 'local' (per process, so single-worker only),
+    'redis' (shared, needs CACHE_REDIS_URL) or 'none'.
+    """
+    
+    def __init__(self):
+        self.backend = None
+    
+    def init_app(self, app):
+        backend = app.config.get('CACHE_BACKEND', 'local')
+        ttl = app.config.get('CACHE_TTL', 10)
+        if backend == 'local':
+            # Other workers would keep serving their copies after a write
+            if app.config.get('WEB_CONCURRENCY', 1) > 1:
+                raise ValueError("CACHE_BACKEND=local only works with one worker; "
+                                 "use redis or none when WEB_CONCURRENCY > 1")
+            self.backend = LocalBackend(ttl, app.config.get('CACHE_MAX_ENTRIES', 256))
+        elif backend == 'redis':
+            self.backend = RedisBackend(app.config['CACHE_REDIS_URL'], ttl)
+        elif backend == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+    
+    @property
+    def enabled(self):
+        return self.backend is not None
+    
+    def key(self, namespace, key):
+        """Resolve a key against the namespace's current generation"""
+        return self.backend.key(namespace, key)
+    
+    def get(self, full_key):
+        return self.backend.get(full_key)
+    
+    def set(self, full_key, entry):
+        self.backend.set(full_key, entry)
+    
+    def invalidate(self, *namespaces):
+        if self.backend is not None:
+            for namespace in namespaces:
+                self.backend.invalidate(namespace)
+
+cache = ResponseCache()
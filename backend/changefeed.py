@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
+from models import Supplier, Order, Transaction
+
+# Timestamps are taken before commit, so rows younger than this are held back
+# until any write that started earlier has had time to become visible
+SETTLE_WINDOW = timedelta(seconds=5)
+DEFAULT_FEED_LIMIT = 500
+MAX_FEED_LIMIT = 2000
+
+# Feed name -> (model, change timestamp column, primary key column)
+FEEDS = {
+    'suppliers': (Supplier, Supplier.updated_at, Supplier.id),
+    'orders': (Order, Order.updated_at, Order.order_id),
+    'transactions': (Transaction, Transaction.created_at, Transaction.id)
+}
+
+def encode_feed_cursor(positions):
+    raw = json.dumps({
+        name: [changed_at.isoformat(), key]
+        for name, (changed_at, key) in positions.items()
+    })
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_feed_cursor(cursor):
+    """Decode a token from encode_feed_cursor, raising ValueError if malformed"""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return {
+            name: (datetime.fromisoformat(changed_at), key)
+            for name, (changed_at, key) in raw.items()
+            if name in FEEDS
+        }
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def read_changes(cursor=None, since=None, limit=DEFAULT_FEED_LIMIT, now=None):
+    """Return suppliers, orders and transactions changed after the cursor.
+    
+    Each feed keeps its own (changed_at, primary key) position. A position
+    with no key means "everything after this timestamp", which is where a feed
+    is parked once it has caught up to the settle watermark. has_more is set
+    when any feed was cut off by the limit.
+    """
+    watermark = (now or datetime.utcnow()) - SETTLE_WINDOW
+    positions = decode_feed_cursor(cursor) if cursor else {}
+    
+    changes = {}
+    new_positions = {}
+    has_more = False
+    
+    for name, (model, changed_at, key) in FEEDS.items():
+        query = model.query.filter(changed_at <= watermark)
+        if model is Order:
+            query = query.options(joinedload(Order.supplier))
+        
+        position = positions.get(name) or ((since, None) if since else None)
+        if position and position[1] is None:
+            query = query.filter(changed_at > position[0])
+        elif position:
+            query = query.filter(tuple_(changed_at, key) > tuple_(*position))
+        
+        rows = query.order_by(changed_at, key).limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+            last = rows[-1]
+            new_positions[name] = (getattr(last, changed_at.key), getattr(last, key.key))
+        else:
+            new_positions[name] = (watermark, None)
+        
+        changes[name] = [row.to_dict() for row in rows]
+    
+    changes['cursor'] = encode_feed_cursor(new_positions)
+    changes['has_more'] = has_more
+    return changes
@@ -3,30 +3,115 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def engine_options(database_uri):
+    """SQLAlchemy engine/pool settings, sized per gunicorn worker process.
+    
+    DB_POOL_SIZE defaults to an even share of DB_MAX_CONNECTIONS across
+    WEB_CONCURRENCY workers (gunicorn.conf.py exports the worker count), less
+    the connection each worker's event listener holds, with no overflow, so
+    scaling out workers never exceeds the PostgreSQL connection budget.
+    """
+    options = {
+        # Detect connections dropped by the server or a proxy while idle
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true',
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800))
+    }
+    
+    # SQLite uses single-connection pools that take no sizing options
+    if not database_uri or database_uri.startswith('sqlite'):
+        return options
+    
+    workers = int(os.getenv('WEB_CONCURRENCY', 1))
+    # A fifth of PostgreSQL's default max_connections (100), leaving room for the
+    # job worker, migrations and other clients
+    max_connections = int(os.getenv('DB_MAX_CONNECTIONS', 20))
+    default_pool_size = max_connections // workers - 1
+    if default_pool_size < 1 and 'DB_POOL_SIZE' not in os.environ:
+        raise ValueError(f"DB_MAX_CONNECTIONS={max_connections} cannot give {workers} workers a pool and "
+                         f"an event listener connection each; raise it or lower WEB_CONCURRENCY")
+    
+    options.update({
+        'pool_size': int(os.getenv('DB_POOL_SIZE', default_pool_size)),
+        # Overflow connections would break the per-worker budget
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 0)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'connect_args': {
+            'options': f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))}"
+        }
+    })
+    return options
+
+def database_url(variable='DATABASE_URL'):
+    url = os.getenv(variable)
+    
+    # Ensure PostgreSQL URL format
+    if url and url.startswith('postgres://'):
+        url = url.replace('postgres://', 'postgresql://', 1)
+    return url
+
+def replica_binds(replica_uri):
+    """SQLALCHEMY_BINDS with the optional read replica, which GET requests read from"""
+    if not replica_uri:
+        return {}
+    return {'replica': {'url': replica_uri, **engine_options(replica_uri)}}
+
 class Config:
     """Base configuration class"""
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'Hapoel2025')
+    
+    # Response cache for the supplier, order and search lists: 'redis', 'local' or 'none'.
+    # A write only invalidates the local cache of its own process, so 'local' is
+    # refused when WEB_CONCURRENCY (gunicorn workers) is above 1.
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'redis' if CACHE_REDIS_URL else 'none')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', 10))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 256))
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+    
+    # Seconds a client reads from the primary, past the response cache, after its own write
+    REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', 5))
+    
+    # Server-Timing headers and GET /metrics, plus cProfile dumps of the slowest sampled requests
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 10))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
+    # The development server is a single process
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'local')
+    SQLALCHEMY_DATABASE_URI = database_url()
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = replica_binds(database_url('REPLICA_DATABASE_URL'))
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     # Railway automatically provides DATABASE_URL for PostgreSQL
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
-    
-    # Ensure PostgreSQL URL format
-    if SQLALCHEMY_DATABASE_URI and SQLALCHEMY_DATABASE_URI.startswith('postgres://'):
-        SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace('postgres://', 'postgresql://', 1)
+    SQLALCHEMY_DATABASE_URI = database_url()
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Optional streaming replica (e.g. a PostgreSQL hot standby) of DATABASE_URL
+    SQLALCHEMY_BINDS = replica_binds(database_url('REPLICA_DATABASE_URL'))
+
+class TestingConfig(Config):
+    """Testing/benchmark configuration: SQLite, in memory unless TEST_DATABASE_URL is set"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite://')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # A second database, such as a copy of the SQLite file, can stand in for the replica
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('TEST_REPLICA_DATABASE_URL'))
+    # No deploy step runs the migrations against a throwaway database
+    CREATE_SCHEMA_ON_STARTUP = True
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'none')
 
 # Configuration dictionary
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
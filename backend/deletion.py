@@ -0,0 +1,66 @@
+from sqlalchemy import delete, func, select
+from models import db, Supplier, Order, Transaction, TransactionArchive, BalanceSnapshot
+from cache import cache
+
+# Suppliers with at most this many dependent rows are deleted inside the request
+SYNC_DELETE_MAX_ROWS = 5000
+# Rows removed per statement, each in its own short transaction, by a purge job
+DELETE_CHUNK_ROWS = 2000
+
+# Tables referencing suppliers (all ON DELETE CASCADE), with the key chunks are picked by
+DEPENDENT_TABLES = (
+    (BalanceSnapshot, BalanceSnapshot.id),
+    (TransactionArchive, TransactionArchive.id),
+    (Transaction, Transaction.id),
+    (Order, Order.order_id)
+)
+
+def remaining_rows(supplier_id):
+    """Rows per dependent table still referencing the supplier, counted in one query"""
+    counts = db.session.execute(select(*(
+        select(func.count()).select_from(model).where(model.supplier_id == supplier_id)
+        .scalar_subquery().label(model.__tablename__)
+        for model, _ in DEPENDENT_TABLES
+    ))).one()
+    return counts._asdict()
+
+def delete_chunk(model, key, supplier_id, chunk_size):
+    chunk = select(key).where(model.supplier_id == supplier_id).limit(chunk_size).scalar_subquery()
+    return db.session.execute(
+        delete(model).where(key.in_(chunk)).execution_options(synchronize_session=False)
+    ).rowcount
+
+def purge_supplier(supplier_id, chunk_size=DELETE_CHUNK_ROWS, progress=None):
+    """Delete a supplier's dependent rows chunk by chunk, then the supplier.
+    
+    Each chunk commits on its own, so no transaction holds row locks for
+    long and an interrupted purge can simply be run again. Rows written
+    after their table was emptied are removed by ON DELETE CASCADE with the
+    supplier. progress(done, total) is called after every chunk. Returns the
+    number of rows deleted.
+    """
+    total = sum(remaining_rows(supplier_id).values())
+    deleted = 0
+    for model, key in DEPENDENT_TABLES:
+        while True:
+            removed = delete_chunk(model, key, supplier_id, chunk_size)
+            db.session.commit()
+            deleted += removed
+            if progress is not None:
+                progress(deleted, total)
+            if removed < chunk_size:
+                break
+    
+    deleted += db.session.execute(delete(Supplier).where(Supplier.id == supplier_id)).rowcount
+    db.session.commit()
+    cache.invalidate('suppliers', 'orders')
+    return deleted
+
+def purge_requested_deletions(chunk_size=DELETE_CHUNK_ROWS):
+    """Finish every supplier deletion that was requested but not completed"""
+    supplier_ids = db.session.scalars(
+        select(Supplier.id).where(Supplier.deletion_requested_at.is_not(None))
+    ).all()
+    for supplier_id in supplier_ids:
+        purge_supplier(supplier_id, chunk_size)
+    return len(supplier_ids)
@@ -0,0 +1,181 @@
+import json
+import queue
+import select
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from models import db
+
+CHANNEL = 'barter_events'
+SUBSCRIBER_QUEUE_SIZE = 100
+KEEPALIVE_SECONDS = 15
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7999
+
+class Broker:
+    """Fans events out to the SSE subscribers connected to this process.
+    
+    A subscriber whose queue is full is dropped rather than letting one slow
+    client hold events back for everyone; its stream ends and the browser's
+    EventSource reconnects.
+    """
+    
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+    
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+    
+    def publish(self, payload):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(payload)
+            except queue.Full:
+                # Replace the backlog with the end-of-stream marker
+                self.unsubscribe(subscriber)
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(None)
+
+class PostgresListener:
+    """Background thread that LISTENs on the events channel and feeds the broker.
+    
+    Every worker process runs one, so a NOTIFY sent by whichever worker handled
+    the write reaches the subscribers connected to all of them.
+    """
+    
+    def __init__(self, broker):
+        self.broker = broker
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    def ensure_started(self, app):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, args=(app,), daemon=True)
+                self.thread.start()
+    
+    def run(self, app):
+        import psycopg2
+        import psycopg2.extensions
+        
+        with app.app_context():
+            dsn = db.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+        
+        while True:
+            try:
+                connection = psycopg2.connect(dsn)
+                connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                connection.cursor().execute(f'LISTEN {CHANNEL}')
+                while True:
+                    if select.select([connection], [], [], KEEPALIVE_SECONDS) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notification = connection.notifies.pop(0)
+                        self.broker.publish(json.loads(notification.payload))
+            except Exception as e:
+                app.logger.warning(f"Event listener disconnected, retrying: {e}")
+                time.sleep(1)
+
+class EventBus:
+    """Order events for Server-Sent Events, configured like a Flask extension.
+    
+    Handlers call publish() inside their database transaction. On PostgreSQL the
+    events are sent with pg_notify just before commit, so they are delivered only
+    if the transaction commits and reach every worker. Other databases deliver
+    them to this process after commit.
+    """
+    
+    def __init__(self):
+        self.broker = Broker()
+        self.listener = PostgresListener(self.broker)
+        self.app = None
+    
+    def init_app(self, app):
+        self.app = app
+    
+    @property
+    def uses_postgres(self):
+        return db.engine.dialect.name == 'postgresql'
+    
+    def publish(self, event_type, **payload):
+        db.session.info.setdefault('pending_events', []).append({'type': event_type, **payload})
+    
+    def subscribe(self):
+        if self.uses_postgres:
+            self.listener.ensure_started(self.app)
+        return self.broker.subscribe()
+    
+    def unsubscribe(self, subscriber):
+        self.broker.unsubscribe(subscriber)
+    
+    def stream(self, subscriber, matches=None):
+        """Yield SSE frames for a subscriber, with comment keepalives while idle"""
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    payload = subscriber.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                if payload is None:
+                    return
+                if matches is None or matches(payload):
+                    yield f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+events = EventBus()
+
+def notify_payload(payload):
+    """JSON for pg_notify; one over MAX_NOTIFY_BYTES is cut to its type and sent as truncated"""
+    encoded = json.dumps(payload)
+    if len(encoded.encode()) > MAX_NOTIFY_BYTES:
+        encoded = json.dumps({'type': payload['type'], 'truncated': True})
+    return encoded
+
+@event.listens_for(Session, 'before_commit')
+def send_pending_events(session):
+    """NOTIFY the pending events; an event that cannot be sent never aborts the commit"""
+    # Savepoint commits fire this too, including the ones below; only the real commit sends
+    if session.in_nested_transaction() or session.get_bind().dialect.name != 'postgresql':
+        return
+    # Held off the session while sending, as the savepoints also fire the after_commit
+    # and after_rollback listeners, which would deliver or discard them early
+    pending = session.info.pop('pending_events', [])
+    unsent = []
+    for payload in pending:
+        try:
+            # A failed statement would abort the whole transaction, so roll back to a savepoint
+            with session.begin_nested():
+                session.execute(text('SELECT pg_notify(:channel, :payload)'),
+                                {'channel': CHANNEL, 'payload': notify_payload(payload)})
+        except Exception as e:
+            current_app.logger.warning(f"Event {payload['type']} not sent to other workers: {e}")
+            unsent.append(payload)
+    if unsent:
+        # after_commit delivers these to this worker's subscribers instead
+        session.info['pending_events'] = unsent
+
+@event.listens_for(Session, 'after_commit')
+def deliver_pending_events(session):
+    for payload in session.info.pop('pending_events', []):
+        events.broker.publish(payload)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_pending_events(session):
+    session.info.pop('pending_events', None)
@@ -0,0 +1,94 @@
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+# Rows fetched per round trip from the server-side cursor and written per CSV chunk
+EXPORT_CHUNK_ROWS = 2000
+XLSX_MAX_ROWS = 1048576
+FILE_CHUNK_BYTES = 64 * 1024
+
+# Spreadsheets run text cells starting with these as formulas (tab and CR too, per OWASP)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # A leading quote makes the cell plain text
+        return f"'{value}"
+    return value
+
+def stream_csv(rows, columns):
+    """Yield CSV text a chunk of rows at a time, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Byte order mark so Excel opens UTF-8 (e.g. Hebrew names) correctly
+    buffer.write('\ufeff')
+    writer.writerow(columns)
+    
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([csv_value(value) for value in row])
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def stream_xlsx(rows, columns):
+    """Write an XLSX workbook to a temporary file and yield its bytes.
+    
+    XlsxWriter's constant_memory mode flushes each row to disk as it is
+    written, so memory stays flat; the file can only be sent once the
+    workbook is closed. Rows past Excel's sheet limit continue on a new sheet.
+    """
+    import xlsxwriter
+    
+    handle, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(handle)
+    try:
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        worksheet = None
+        row_number = XLSX_MAX_ROWS
+        
+        for row in rows:
+            if row_number == XLSX_MAX_ROWS:
+                worksheet = workbook.add_worksheet()
+                worksheet.write_row(0, 0, columns)
+                row_number = 1
+            for column, value in enumerate(row):
+                if value is None:
+                    continue
+                if isinstance(value, datetime):
+                    worksheet.write_datetime(row_number, column, value, date_format)
+                elif isinstance(value, str):
+                    # write() would turn text starting with '=' into a formula
+                    worksheet.write_string(row_number, column, value)
+                else:
+                    worksheet.write(row_number, column, value)
+            row_number += 1
+        
+        if worksheet is None:
+            workbook.add_worksheet().write_row(0, 0, columns)
+        workbook.close()
+        
+        with open(path, 'rb') as workbook_file:
+            while True:
+                chunk = workbook_file.read(FILE_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(path)
+
+EXPORT_WRITERS = {
+    'csv': stream_csv,
+    'xlsx': stream_xlsx
+}
@@ -0,0 +1,28 @@
+"""
+Gunicorn settings, passed with --config by the Procfile.
+
+gunicorn only finds ./gunicorn.conf.py in the directory it starts in, not the
+--chdir target, so the path must be given explicitly from the repository root.
+"""
+import os
+
+# 'gevent' (default) holds idle Server-Sent Events connections and slow
+# database waits as cheap greenlets; 'gthread' runs a fixed thread pool per worker
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+# A container reports the host's cores, so scale out explicitly rather than by cpu_count()
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# config.py splits DB_MAX_CONNECTIONS across this many worker pools
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+# Drop keep-alive sockets before a typical proxy's idle timeout does
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        # Make psycopg2 yield to other greenlets while waiting on PostgreSQL
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
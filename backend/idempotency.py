@@ -0,0 +1,99 @@
+import hashlib
+import random
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, g, jsonify, request
+from sqlalchemy import delete
+from models import db, IdempotencyKey, upsert
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+# Retries are replayed for this long; afterwards the key may be reused
+KEY_TTL = timedelta(hours=24)
+# Share of stored responses that also delete expired keys
+PURGE_PROBABILITY = 0.01
+
+def request_fingerprint():
+    digest = hashlib.sha256(f'{request.method} {request.path}\n'.encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+def replayed_response(key):
+    """The stored response for a key, or None if the key is unused or expired.
+    
+    A key that was used for a different request gets 422 instead.
+    """
+    record = db.session.get(IdempotencyKey, key)
+    if record is None or record.created_at < datetime.utcnow() - KEY_TTL:
+        return None
+    if record.fingerprint != request_fingerprint():
+        return jsonify({"message": f"{IDEMPOTENCY_HEADER} was already used for a different request"}), 422
+    
+    response = current_app.response_class(record.response_body, status=record.status_code,
+                                          mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def idempotent(view):
+    """Replay the stored response when a POST repeats an Idempotency-Key.
+    
+    The view stores its response with remember_response() in the same
+    transaction as its write, so a key is only ever recorded with a write
+    that committed.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None or request.method != 'POST':
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({"message": f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters"}), 400
+        
+        replay = replayed_response(key)
+        if replay is not None:
+            return replay
+        g.idempotency_key = key
+        return view(*args, **kwargs)
+    return wrapper
+
+def remember_response(payload, status):
+    """Store the response for the request's Idempotency-Key, if it has one.
+    
+    Returns False when another request claimed the key first; the caller
+    should answer with conflict_response().
+    """
+    key = g.get('idempotency_key')
+    if key is None:
+        return True
+    
+    now = datetime.utcnow()
+    values = {
+        'key': key,
+        'fingerprint': request_fingerprint(),
+        'status_code': status,
+        'response_body': current_app.json.dumps(payload),
+        'created_at': now
+    }
+    # An expired record is overwritten; a live one leaves the insert with no row
+    statement = upsert(IdempotencyKey).values(**values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key],
+        set_={name: value for name, value in values.items() if name != 'key'},
+        where=IdempotencyKey.created_at < now - KEY_TTL
+    ).returning(IdempotencyKey.key)
+    stored = db.session.execute(statement).first() is not None
+    
+    if stored and random.random() < PURGE_PROBABILITY:
+        db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < now - KEY_TTL))
+    return stored
+
+def conflict_response(fallback):
+    """Answer for a request whose write conflicted with one that committed first.
+    
+    Rolls back, then replays the other request's response if it used the
+    same Idempotency-Key; otherwise returns the fallback response.
+    """
+    db.session.rollback()
+    key = g.get('idempotency_key')
+    replay = replayed_response(key) if key else None
+    return replay if replay is not None else fallback
@@ -0,0 +1,207 @@
+import csv
+import io
+import json
+from itertools import islice
+from sqlalchemy import insert, select
+from models import db, Supplier, Order, Transaction
+from money import format_major
+from validators import ValidationError, validate_new_supplier, validate_new_order
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+# Stands in for the rest of an upload that is not UTF-8
+UNDECODABLE = object()
+
+def open_text_stream(binary_stream):
+    """Wrap a binary upload stream for line-by-line decoding (tolerates a UTF-8 BOM)"""
+    return io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+
+def iter_records(text_stream, fmt):
+    """Yield (line_number, record) pairs from a CSV or NDJSON text stream.
+    
+    Records that cannot be parsed are yielded as None so they can be reported per row.
+    Reading stops at text that is not UTF-8 (such as a Windows-1255 Excel export),
+    which is yielded once as UNDECODABLE.
+    """
+    line_number = 0
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(text_stream)
+            for record in reader:
+                line_number = reader.line_num
+                yield line_number, record
+        elif fmt == 'ndjson':
+            for line_number, line in enumerate(text_stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                yield line_number, record if isinstance(record, dict) else None
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+    except UnicodeDecodeError:
+        # Text is decoded a block at a time, so the bad bytes are at or after the next line
+        yield line_number + 1, UNDECODABLE
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def new_report():
+    return {'imported': 0, 'failed': 0, 'errors': []}
+
+def add_error(report, line_number, message):
+    report['failed'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({'line': line_number, 'message': message})
+
+def validate_chunk(chunk, validate, report):
+    """Run the shared validator over a chunk, returning (line_number, fields) for valid rows"""
+    rows = []
+    for line_number, record in chunk:
+        if record is None:
+            add_error(report, line_number, "Malformed record")
+            continue
+        if record is UNDECODABLE:
+            add_error(report, line_number, "File is not UTF-8 encoded from about this line, so the rest was not "
+                                           "imported; save it as CSV UTF-8 and import the remaining rows")
+            continue
+        try:
+            rows.append((line_number, validate(record)))
+        except ValidationError as e:
+            add_error(report, line_number, str(e))
+    return rows
+
+def import_suppliers(text_stream, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream suppliers into the database in chunked bulk inserts.
+    
+    Each chunk is validated, checked for duplicate names with one set-based
+    SELECT, inserted with executemany together with its initial transactions,
+    and committed. Invalid rows are skipped and reported.
+    """
+    report = new_report()
+    seen_names = set()
+    
+    for chunk in chunked(iter_records(text_stream, fmt), chunk_size):
+        rows = []
+        for line_number, fields in validate_chunk(chunk, validate_new_supplier, report):
+            if fields['name'] in seen_names:
+                add_error(report, line_number, "Duplicate supplier name in import")
+                continue
+            seen_names.add(fields['name'])
+            rows.append((line_number, fields))
+        
+        if not rows:
+            continue
+        
+        existing_names = set(db.session.scalars(
+            select(Supplier.name).where(Supplier.name.in_([fields['name'] for _, fields in rows]))
+        ))
+        new_rows = []
+        for line_number, fields in rows:
+            if fields['name'] in existing_names:
+                add_error(report, line_number, "Supplier name already exists")
+            else:
+                new_rows.append(fields)
+        
+        if not new_rows:
+            continue
+        
+        try:
+            created = db.session.execute(
+                insert(Supplier).returning(Supplier.id, Supplier.initial_amount, Supplier.current_amount),
+                new_rows
+            ).all()
+            transactions = []
+            for supplier_id, initial_amount, current_amount in created:
+                transactions.append({
+                    'supplier_id': supplier_id,
+                    'transaction_type': 'initial',
+                    'amount': initial_amount,
+                    'description': 'Initial supplier setup'
+                })
+                # Same opening-balance entry as POST /api/suppliers
+                if current_amount != initial_amount:
+                    transactions.append({
+                        'supplier_id': supplier_id,
+                        'transaction_type': 'update',
+                        'amount': current_amount,
+                        'description': f'Opening balance set to {format_major(current_amount)}'
+                    })
+            db.session.execute(insert(Transaction), transactions)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        report['imported'] += len(new_rows)
+    
+    report['errors'].sort(key=lambda error: error['line'])
+    return report
+
+def import_orders(text_stream, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream orders into the database in chunked bulk inserts.
+    
+    Duplicate order IDs and unknown suppliers are detected with one set-based
+    SELECT each per chunk. Invalid rows are skipped and reported.
+    """
+    report = new_report()
+    seen_order_ids = set()
+    known_supplier_ids = set()
+    
+    for chunk in chunked(iter_records(text_stream, fmt), chunk_size):
+        rows = []
+        for line_number, fields in validate_chunk(chunk, validate_new_order, report):
+            if fields['order_id'] in seen_order_ids:
+                add_error(report, line_number, "Duplicate order ID in import")
+                continue
+            seen_order_ids.add(fields['order_id'])
+            rows.append((line_number, fields))
+        
+        if not rows:
+            continue
+        
+        existing_order_ids = set(db.session.scalars(
+            select(Order.order_id).where(Order.order_id.in_([fields['order_id'] for _, fields in rows]))
+        ))
+        unknown_supplier_ids = {fields['supplier_id'] for _, fields in rows} - known_supplier_ids
+        if unknown_supplier_ids:
+            known_supplier_ids.update(db.session.scalars(
+                select(Supplier.id).where(Supplier.id.in_(unknown_supplier_ids))
+            ))
+        
+        new_rows = []
+        for line_number, fields in rows:
+            if fields['order_id'] in existing_order_ids:
+                add_error(report, line_number, "Order ID already exists")
+            elif fields['supplier_id'] not in known_supplier_ids:
+                add_error(report, line_number, "Supplier not found")
+            else:
+                new_rows.append(fields)
+        
+        if not new_rows:
+            continue
+        
+        try:
+            db.session.execute(insert(Order), new_rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        report['imported'] += len(new_rows)
+    
+    report['errors'].sort(key=lambda error: error['line'])
+    return report
+
+IMPORTERS = {
+    'suppliers': import_suppliers,
+    'orders': import_orders
+}
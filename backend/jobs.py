@@ -0,0 +1,161 @@
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, select, update
+from models import db, Job
+from ledger import take_snapshots, reconcile
+from deletion import purge_supplier
+from analytics import rebuild_spend_rollups
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+MAX_ATTEMPTS = 3
+# Delay before the first retry, doubled for each attempt after it
+RETRY_BACKOFF = timedelta(seconds=30)
+# A running job without a heartbeat for this long belongs to a dead worker and is claimed again
+STALE_AFTER = timedelta(minutes=10)
+POLL_SECONDS = 1.0
+
+# Job kind -> function(payload, progress) returning a JSON-ready result
+JOB_HANDLERS = {}
+
+def job_handler(kind):
+    def register(function):
+        JOB_HANDLERS[kind] = function
+        return function
+    return register
+
+def enqueue(kind, payload=None, dedupe_key=None, max_attempts=MAX_ATTEMPTS):
+    """Add a job to the queue in the caller's transaction and return it.
+    
+    With a dedupe_key, an existing queued or running job with the same key
+    is returned instead of adding another.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    
+    if dedupe_key is not None:
+        existing = db.session.scalars(
+            select(Job).where(Job.dedupe_key == dedupe_key, Job.status.in_(('queued', 'running')))
+            .order_by(Job.id.desc()).limit(1)
+        ).first()
+        if existing is not None:
+            return existing
+    
+    job = Job(kind=kind, payload=payload or {}, dedupe_key=dedupe_key, max_attempts=max_attempts)
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+def claim_job(now=None):
+    """Mark the oldest runnable job as running and return it, or None.
+    
+    FOR UPDATE SKIP LOCKED lets any number of workers claim concurrently
+    without waiting on each other or taking the same job. (SQLite has no
+    row locks and runs one writer at a time, so the clause is omitted there.)
+    """
+    now = now or datetime.utcnow()
+    runnable = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == 'queued', Job.run_after <= now),
+            and_(Job.status == 'running', Job.heartbeat_at < now - STALE_AFTER)
+        ))
+        .order_by(Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    job = db.session.scalars(
+        update(Job).where(Job.id == runnable)
+        .values(status='running', attempts=Job.attempts + 1, started_at=now, heartbeat_at=now)
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.session.commit()
+    return job
+
+class JobProgress:
+    """Callable handed to job handlers to report progress and keep the job's heartbeat fresh.
+    
+    Each call commits, so call it between the handler's own transactions.
+    """
+    
+    def __init__(self, job_id):
+        self.job_id = job_id
+    
+    def __call__(self, done, total=None):
+        values = {'progress_done': done, 'heartbeat_at': datetime.utcnow()}
+        if total is not None:
+            values['progress_total'] = total
+        db.session.execute(update(Job).where(Job.id == self.job_id).values(**values))
+        db.session.commit()
+
+def finish_job(job_id, **values):
+    db.session.execute(update(Job).where(Job.id == job_id).values(finished_at=datetime.utcnow(), **values))
+    db.session.commit()
+
+def run_job(job):
+    """Run a claimed job, then record its result or schedule a retry with backoff"""
+    job_id, kind, payload, attempts, max_attempts = job.id, job.kind, job.payload, job.attempts, job.max_attempts
+    handler = JOB_HANDLERS.get(kind)
+    if handler is None:
+        finish_job(job_id, status='failed', error=f"Unknown job kind: {kind}")
+        return False
+    if attempts > max_attempts:
+        # Claimed again after its worker died on the last attempt
+        finish_job(job_id, status='failed', error="Worker stopped during the last attempt")
+        return False
+    
+    try:
+        result = handler(payload, JobProgress(job_id))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        error = f"{type(e).__name__}: {e}"
+        if attempts < max_attempts:
+            db.session.execute(
+                update(Job).where(Job.id == job_id)
+                .values(status='queued', error=error,
+                        run_after=datetime.utcnow() + RETRY_BACKOFF * 2 ** (attempts - 1))
+            )
+            db.session.commit()
+        else:
+            finish_job(job_id, status='failed', error=error)
+        return False
+    
+    finish_job(job_id, status='succeeded', result=result, error=None)
+    return True
+
+def work(should_stop=lambda: False, poll_seconds=POLL_SECONDS, exit_when_idle=False):
+    """Claim and run jobs until should_stop() is true (or the queue is empty, with exit_when_idle).
+    
+    Returns the number of jobs run.
+    """
+    count = 0
+    while not should_stop():
+        job = claim_job()
+        if job is None:
+            if exit_when_idle:
+                break
+            time.sleep(poll_seconds)
+            continue
+        run_job(job)
+        count += 1
+        # Release the finished job and anything the handler loaded
+        db.session.remove()
+    return count
+
+@job_handler('ledger_snapshots')
+def snapshots_job(payload, progress):
+    return {'written': take_snapshots(payload.get('supplier_ids'))}
+
+@job_handler('ledger_reconcile')
+def reconcile_job(payload, progress):
+    return reconcile()
+
+@job_handler('purge_supplier')
+def purge_supplier_job(payload, progress):
+    return {'deleted': purge_supplier(payload['supplier_id'], progress=progress)}
+
+@job_handler('spend_rollups')
+def spend_rollups_job(payload, progress):
+    return {'written': rebuild_spend_rollups()}
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, literal, select, true, update
+from models import db, Money, Supplier, Transaction, TransactionArchive, BalanceSnapshot, SpendRollup
+from money import to_major
+
+# Transaction types whose amount sets the balance outright; every other type is a delta.
+# 'season_closed' is the summary a rollover leaves in place of the compacted history.
+BALANCE_SET_TYPES = ('initial', 'update', 'season_closed')
+
+# Transactions younger than this are left out of new snapshots, so a row that
+# commits after a higher transaction ID cannot be skipped by a snapshot
+SNAPSHOT_LAG = timedelta(minutes=5)
+
+def fold(balance, transactions):
+    """Apply ledger rows (ordered by ID) to a starting balance, in integer minor units"""
+    for transaction in transactions:
+        if transaction.transaction_type in BALANCE_SET_TYPES:
+            balance = transaction.amount
+        else:
+            balance = (balance or 0) + transaction.amount
+    return balance
+
+def latest_snapshot(supplier_id, as_of=None):
+    query = BalanceSnapshot.query.filter_by(supplier_id=supplier_id)
+    if as_of is not None:
+        query = query.filter(BalanceSnapshot.as_of <= as_of)
+    return query.order_by(BalanceSnapshot.last_transaction_id.desc()).first()
+
+def ledger_tail(supplier_id, after_transaction_id=None, as_of=None):
+    query = db.session.query(
+        Transaction.id,
+        Transaction.transaction_type,
+        Transaction.amount,
+        Transaction.created_at
+    ).filter(Transaction.supplier_id == supplier_id)
+    if after_transaction_id is not None:
+        query = query.filter(Transaction.id > after_transaction_id)
+    if as_of is not None:
+        query = query.filter(Transaction.created_at <= as_of)
+    return query.order_by(Transaction.id).all()
+
+def ledger_balance(supplier_id, as_of=None):
+    """Balance derived from the ledger: nearest snapshot plus the transactions after it.
+    
+    Returns None if the supplier has no ledger history before as_of.
+    """
+    snapshot = latest_snapshot(supplier_id, as_of)
+    tail = ledger_tail(supplier_id, snapshot.last_transaction_id if snapshot else None, as_of)
+    balance = snapshot.balance if snapshot else None
+    return fold(balance, tail)
+
+def take_snapshots(supplier_ids=None, now=None):
+    """Write a snapshot for every supplier with settled transactions since its last one.
+    
+    Returns the number of snapshots written.
+    """
+    cutoff = (now or datetime.utcnow()) - SNAPSHOT_LAG
+    if supplier_ids is None:
+        supplier_ids = [supplier_id for (supplier_id,) in db.session.query(Supplier.id).all()]
+    
+    written = 0
+    for supplier_id in supplier_ids:
+        snapshot = latest_snapshot(supplier_id)
+        tail = ledger_tail(supplier_id, snapshot.last_transaction_id if snapshot else None)
+        
+        # Only the settled prefix (in ID order) is covered by the snapshot
+        settled = 0
+        while settled < len(tail) and tail[settled].created_at <= cutoff:
+            settled += 1
+        tail = tail[:settled]
+        if not tail:
+            continue
+        
+        db.session.add(BalanceSnapshot(
+            supplier_id=supplier_id,
+            balance=fold(snapshot.balance if snapshot else None, tail),
+            last_transaction_id=tail[-1].id,
+            as_of=tail[-1].created_at
+        ))
+        written += 1
+    
+    db.session.commit()
+    return written
+
+def reconcile(supplier_ids=None):
+    """Compare each supplier's current_amount with its ledger-derived balance.
+    
+    Each check reads one snapshot and the short tail after it, so the cost is
+    bounded by the snapshot interval rather than the size of the ledger.
+    """
+    query = db.session.query(Supplier.id, Supplier.name, Supplier.current_amount)
+    if supplier_ids is not None:
+        query = query.filter(Supplier.id.in_(supplier_ids))
+    
+    checked = 0
+    mismatches = []
+    for supplier_id, name, current_amount in query.order_by(Supplier.id).all():
+        checked += 1
+        balance = ledger_balance(supplier_id)
+        if balance is None or balance != current_amount:
+            mismatches.append({
+                'supplier_id': supplier_id,
+                'supplier_name': name,
+                'current_amount': to_major(current_amount),
+                'ledger_balance': to_major(balance) if balance is not None else None
+            })
+    
+    return {'checked': checked, 'mismatches': mismatches}
+
+def initialize_suppliers(supplier_ids=None, initial_amount=None, current_amount=None,
+                         archive_history=False, now=None):
+    """Start a new season for the given suppliers (all of them if None).
+    
+    Each supplier's transactions (optionally copied to transaction_archive
+    first) and snapshots are replaced by a 'season_closed' row carrying the
+    closing balance, followed by the new 'initial' row (and an 'update' row if
+    the opening balance differs), and its amounts and season_started_at are reset. Without
+    initial_amount every supplier keeps its own; current_amount defaults to the
+    new initial amount.
+    
+    Runs a fixed set of set-based statements however many suppliers are
+    selected. The caller commits. Returns counts for the response.
+    """
+    now = now or datetime.utcnow()
+    if supplier_ids is None:
+        selected = true()
+        selected_ledger = true()
+    else:
+        selected = Supplier.id.in_(supplier_ids)
+        selected_ledger = Transaction.supplier_id.in_(supplier_ids)
+    
+    new_initial = literal(initial_amount, Money) if initial_amount is not None else Supplier.initial_amount
+    new_current = literal(current_amount, Money) if current_amount is not None else new_initial
+    
+    def ledger_rows(transaction_type, amount, description, *conditions):
+        return insert(Transaction).from_select(
+            ['supplier_id', 'transaction_type', 'amount', 'description', 'created_at'],
+            select(Supplier.id, literal(transaction_type), amount, literal(description), literal(now))
+            .where(selected, *conditions)
+        )
+    
+    archived = 0
+    if archive_history:
+        archived = db.session.execute(insert(TransactionArchive).from_select(
+            ['transaction_id', 'supplier_id', 'transaction_type', 'amount', 'description', 'created_at', 'archived_at'],
+            select(Transaction.id, Transaction.supplier_id, Transaction.transaction_type, Transaction.amount,
+                   Transaction.description, Transaction.created_at, literal(now))
+            .where(selected_ledger)
+        )).rowcount
+    
+    db.session.execute(delete(BalanceSnapshot).where(
+        selected if supplier_ids is None else BalanceSnapshot.supplier_id.in_(supplier_ids)
+    ))
+    compacted = db.session.execute(delete(Transaction).where(selected_ledger)).rowcount
+    
+    # The closing balance is read before the UPDATE below resets it
+    db.session.execute(ledger_rows(
+        'season_closed', Supplier.current_amount,
+        'Season closed; earlier transactions ' + ('archived' if archive_history else 'compacted')
+    ))
+    db.session.execute(ledger_rows('initial', new_initial, 'Season opened'))
+    db.session.execute(ledger_rows(
+        'update', new_current, 'Opening balance differs from initial amount', new_current != new_initial
+    ))
+    
+    # Spend so far belongs to the closed season, which burn-down leaves out
+    db.session.execute(
+        update(SpendRollup)
+        .where(selected if supplier_ids is None else SpendRollup.supplier_id.in_(supplier_ids))
+        .values(pre_season_amount=SpendRollup.approved_amount)
+        .execution_options(synchronize_session=False)
+    )
+    
+    reset = db.session.execute(
+        update(Supplier).where(selected)
+        .values(initial_amount=new_initial, current_amount=new_current, season_started_at=now, updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    
+    return {'suppliers': reset, 'transactions_compacted': compacted, 'transactions_archived': archived}
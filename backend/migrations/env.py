@@ -0,0 +1,65 @@
+"""
+Alembic environment: runs migrations against DATABASE_URL using the models' metadata
+"""
+import os
+import sys
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import Numeric, create_engine, pool, text
+
+# Make the backend modules importable when alembic runs from another directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import database_url
+from models import db, Money
+from search import is_search_object
+
+if context.config.config_file_name is not None:
+    fileConfig(context.config.config_file_name)
+
+target_metadata = db.metadata
+
+def include_name(name, type_, parent_names):
+    """Leave the search indexes and FTS tables, which have no models, out of autogenerate"""
+    return not is_search_object(name, type_)
+
+def compare_type(context, inspected_column, metadata_column, inspected_type, metadata_type):
+    """Accept SQLite's NUMERIC money columns, which 0009 converted in place to minor units"""
+    if context.dialect.name == 'sqlite' and isinstance(metadata_type, Money) and isinstance(inspected_type, Numeric):
+        return False
+    return None
+
+# Arbitrary key so concurrent deploys queue up instead of racing on DDL
+MIGRATION_LOCK_ID = 724061
+
+def run_migrations_offline():
+    context.configure(url=database_url(), target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    url = database_url()
+    if not url:
+        raise RuntimeError("DATABASE_URL is not set")
+    
+    engine = create_engine(url, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        is_postgres = connection.dialect.name == 'postgresql'
+        if is_postgres:
+            connection.execute(text('SELECT pg_advisory_lock(:id)'), {'id': MIGRATION_LOCK_ID})
+            connection.commit()
+        try:
+            context.configure(connection=connection, target_metadata=target_metadata,
+                              render_as_batch=connection.dialect.name == 'sqlite',
+                              include_name=include_name, compare_type=compare_type)
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if is_postgres:
+                connection.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': MIGRATION_LOCK_ID})
+                connection.commit()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
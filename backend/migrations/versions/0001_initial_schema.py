@@ -0,0 +1,67 @@
+"""Initial schema: suppliers, transactions and orders
+
+Databases created earlier by db.create_all() already have these tables, so
+each one is only created if it is missing; upgrading such a database simply
+adopts it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+def upgrade():
+    tables = existing_tables()
+    
+    if 'suppliers' not in tables:
+        op.create_table(
+            'suppliers',
+            sa.Column('supplier_id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('supplier_name', sa.String(255), nullable=False, unique=True),
+            sa.Column('initial_amount', sa.Numeric(10, 2), nullable=False),
+            sa.Column('current_amount', sa.Numeric(10, 2), nullable=False),
+            sa.Column('supplier_financial_id', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime())
+        )
+    
+    if 'transactions' not in tables:
+        op.create_table(
+            'transactions',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('supplier_id', sa.Integer(), sa.ForeignKey('suppliers.supplier_id'), nullable=False),
+            sa.Column('transaction_type', sa.String(50), nullable=False),
+            sa.Column('amount', sa.Numeric(10, 2), nullable=False),
+            sa.Column('description', sa.Text()),
+            sa.Column('created_at', sa.DateTime())
+        )
+    
+    if 'orders' not in tables:
+        op.create_table(
+            'orders',
+            sa.Column('order_id', sa.String(50), primary_key=True),
+            sa.Column('supplier_id', sa.Integer(), sa.ForeignKey('suppliers.supplier_id'), nullable=False),
+            sa.Column('order_title', sa.String(255), nullable=False),
+            sa.Column('order_amount', sa.Numeric(10, 2), nullable=False),
+            sa.Column('order_date', sa.DateTime()),
+            sa.Column('ordered_by', sa.String(100), nullable=False),
+            sa.Column('notes', sa.Text()),
+            sa.Column('order_status', sa.String(20)),
+            sa.Column('handler', sa.String(100)),
+            sa.Column('created_at', sa.DateTime()),
+            sa.CheckConstraint("order_status IN ('Pending', 'Approved', 'Rejected')", name='order_status_check')
+        )
+
+def downgrade():
+    op.drop_table('orders')
+    op.drop_table('transactions')
+    op.drop_table('suppliers')
@@ -0,0 +1,58 @@
+"""Query indexes, orders.updated_at and balance_snapshots
+
+Adds the indexes behind keyset pagination, balance aggregates, ledger tails
+and the change feed, the orders.updated_at column used by the change feed,
+and the balance_snapshots table. Objects that already exist (for example in
+a database built by a newer db.create_all()) are skipped.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-02 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_orders_created_at_order_id', 'orders', ['created_at', 'order_id']),
+    ('ix_orders_supplier_created_at', 'orders', ['supplier_id', 'created_at', 'order_id']),
+    ('ix_orders_status_created_at', 'orders', ['order_status', 'created_at', 'order_id']),
+    ('ix_orders_supplier_status_amount', 'orders', ['supplier_id', 'order_status', 'order_amount']),
+    ('ix_orders_updated_at_order_id', 'orders', ['updated_at', 'order_id']),
+    ('ix_suppliers_updated_at_supplier_id', 'suppliers', ['updated_at', 'supplier_id']),
+    ('ix_transactions_supplier_id_id', 'transactions', ['supplier_id', 'id']),
+    ('ix_transactions_created_at_id', 'transactions', ['created_at', 'id']),
+    ('ix_balance_snapshots_supplier_last_tx', 'balance_snapshots', ['supplier_id', 'last_transaction_id'])
+]
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    
+    order_columns = {column['name'] for column in inspector.get_columns('orders')}
+    if 'updated_at' not in order_columns:
+        op.add_column('orders', sa.Column('updated_at', sa.DateTime()))
+        op.execute('UPDATE orders SET updated_at = created_at')
+    
+    if 'balance_snapshots' not in inspector.get_table_names():
+        op.create_table(
+            'balance_snapshots',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('supplier_id', sa.Integer(), sa.ForeignKey('suppliers.supplier_id'), nullable=False),
+            sa.Column('balance', sa.Numeric(10, 2), nullable=False),
+            sa.Column('last_transaction_id', sa.Integer(), nullable=False),
+            sa.Column('as_of', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime())
+        )
+    
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+def downgrade():
+    for name, table, columns in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_table('balance_snapshots')
+    op.drop_column('orders', 'updated_at')
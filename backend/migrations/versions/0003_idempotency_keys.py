@@ -0,0 +1,33 @@
+"""idempotency_keys
+
+Stores the response of each POST made with an Idempotency-Key header so
+retries are answered with the original result.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-03 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'idempotency_keys' not in inspector.get_table_names():
+        op.create_table(
+            'idempotency_keys',
+            sa.Column('key', sa.String(255), primary_key=True),
+            sa.Column('fingerprint', sa.String(64), nullable=False),
+            sa.Column('status_code', sa.Integer(), nullable=False),
+            sa.Column('response_body', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False)
+        )
+    op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'], if_not_exists=True)
+
+def downgrade():
+    op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys', if_exists=True)
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,37 @@
+"""transaction_archive
+
+Holds the transactions a season rollover (POST /api/suppliers/initialize)
+removes from the live ledger when history is kept.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-01-04 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'transaction_archive' not in inspector.get_table_names():
+        op.create_table(
+            'transaction_archive',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('transaction_id', sa.Integer(), nullable=False),
+            sa.Column('supplier_id', sa.Integer(), sa.ForeignKey('suppliers.supplier_id'), nullable=False),
+            sa.Column('transaction_type', sa.String(50), nullable=False),
+            sa.Column('amount', sa.Numeric(10, 2), nullable=False),
+            sa.Column('description', sa.Text()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('archived_at', sa.DateTime(), nullable=False)
+        )
+    op.create_index('ix_transaction_archive_supplier_id_transaction_id', 'transaction_archive',
+                    ['supplier_id', 'transaction_id'], if_not_exists=True)
+
+def downgrade():
+    op.drop_index('ix_transaction_archive_supplier_id_transaction_id', table_name='transaction_archive', if_exists=True)
+    op.drop_table('transaction_archive')
@@ -0,0 +1,45 @@
+"""ON DELETE CASCADE supplier foreign keys and suppliers.deletion_requested_at
+
+Lets a supplier be deleted with one DELETE statement (or purged in chunks
+in the background) instead of the ORM loading and deleting every dependent
+row. Foreign keys that already cascade are left alone.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-05 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+DEPENDENT_TABLES = ('transactions', 'orders', 'balance_snapshots', 'transaction_archive')
+# Names the unnamed foreign keys SQLite reflects, so batch mode can drop them
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+def replace_supplier_foreign_keys(ondelete):
+    inspector = sa.inspect(op.get_bind())
+    for table in DEPENDENT_TABLES:
+        foreign_key = next(fk for fk in inspector.get_foreign_keys(table) if fk['referred_table'] == 'suppliers')
+        if (foreign_key['options'].get('ondelete') or '').upper() == (ondelete or ''):
+            continue
+        
+        name = f'fk_{table}_supplier_id_suppliers'
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(foreign_key['name'] or name, type_='foreignkey')
+            batch_op.create_foreign_key(name, 'suppliers', ['supplier_id'], ['supplier_id'], ondelete=ondelete)
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    supplier_columns = {column['name'] for column in inspector.get_columns('suppliers')}
+    if 'deletion_requested_at' not in supplier_columns:
+        op.add_column('suppliers', sa.Column('deletion_requested_at', sa.DateTime(), nullable=True))
+    
+    replace_supplier_foreign_keys('CASCADE')
+
+def downgrade():
+    replace_supplier_foreign_keys(None)
+    op.drop_column('suppliers', 'deletion_requested_at')
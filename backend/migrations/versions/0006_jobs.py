@@ -0,0 +1,46 @@
+"""jobs
+
+Queue table for background work run by worker.py.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-06 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'jobs' not in inspector.get_table_names():
+        op.create_table(
+            'jobs',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('kind', sa.String(50), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('max_attempts', sa.Integer(), nullable=False),
+            sa.Column('progress_done', sa.Integer(), nullable=False),
+            sa.Column('progress_total', sa.Integer()),
+            sa.Column('result', sa.JSON()),
+            sa.Column('error', sa.Text()),
+            sa.Column('dedupe_key', sa.String(255)),
+            sa.Column('run_after', sa.DateTime(), nullable=False),
+            sa.Column('heartbeat_at', sa.DateTime()),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('started_at', sa.DateTime()),
+            sa.Column('finished_at', sa.DateTime()),
+            sa.CheckConstraint("status IN ('queued', 'running', 'succeeded', 'failed')", name='job_status_check')
+        )
+    op.create_index('ix_jobs_status_run_after_id', 'jobs', ['status', 'run_after', 'id'], if_not_exists=True)
+    op.create_index('ix_jobs_dedupe_key', 'jobs', ['dedupe_key'], if_not_exists=True)
+
+def downgrade():
+    op.drop_index('ix_jobs_dedupe_key', table_name='jobs', if_exists=True)
+    op.drop_index('ix_jobs_status_run_after_id', table_name='jobs', if_exists=True)
+    op.drop_table('jobs')
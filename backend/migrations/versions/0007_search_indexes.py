@@ -0,0 +1,81 @@
+"""Search indexes over orders and suppliers
+
+PostgreSQL: pg_trgm, a GIN tsvector index over order title, ordered_by and
+notes, and trigram indexes for substring matches on that text and on
+supplier names. SQLite: FTS5 tables kept in step with orders and suppliers
+by triggers, filled from the existing rows.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-07 00:00:00
+"""
+from alembic import op
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+ORDER_DOCUMENT = "(coalesce(order_title, '') || ' ' || coalesce(ordered_by, '') || ' ' || coalesce(notes, ''))"
+
+POSTGRES_UPGRADE = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_orders_search_vector ON orders USING gin (to_tsvector('simple', {ORDER_DOCUMENT}))",
+    f"CREATE INDEX IF NOT EXISTS ix_orders_search_trgm ON orders USING gin ({ORDER_DOCUMENT} gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_suppliers_name_trgm ON suppliers USING gin (supplier_name gin_trgm_ops)"
+)
+POSTGRES_DOWNGRADE = (
+    "DROP INDEX IF EXISTS ix_suppliers_name_trgm",
+    "DROP INDEX IF EXISTS ix_orders_search_trgm",
+    "DROP INDEX IF EXISTS ix_orders_search_vector"
+)
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5("
+    "order_title, ordered_by, notes, content='orders', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_insert AFTER INSERT ON orders BEGIN "
+    "INSERT INTO orders_fts(rowid, order_title, ordered_by, notes) "
+    "VALUES (new.rowid, new.order_title, new.ordered_by, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_delete AFTER DELETE ON orders BEGIN "
+    "INSERT INTO orders_fts(orders_fts, rowid, order_title, ordered_by, notes) "
+    "VALUES ('delete', old.rowid, old.order_title, old.ordered_by, old.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_update AFTER UPDATE OF order_title, ordered_by, notes ON orders BEGIN "
+    "INSERT INTO orders_fts(orders_fts, rowid, order_title, ordered_by, notes) "
+    "VALUES ('delete', old.rowid, old.order_title, old.ordered_by, old.notes); "
+    "INSERT INTO orders_fts(rowid, order_title, ordered_by, notes) "
+    "VALUES (new.rowid, new.order_title, new.ordered_by, new.notes); END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS suppliers_fts USING fts5("
+    "supplier_name, content='suppliers', content_rowid='supplier_id')",
+    "CREATE TRIGGER IF NOT EXISTS suppliers_fts_insert AFTER INSERT ON suppliers BEGIN "
+    "INSERT INTO suppliers_fts(rowid, supplier_name) VALUES (new.supplier_id, new.supplier_name); END",
+    "CREATE TRIGGER IF NOT EXISTS suppliers_fts_delete AFTER DELETE ON suppliers BEGIN "
+    "INSERT INTO suppliers_fts(suppliers_fts, rowid, supplier_name) "
+    "VALUES ('delete', old.supplier_id, old.supplier_name); END",
+    "CREATE TRIGGER IF NOT EXISTS suppliers_fts_update AFTER UPDATE OF supplier_name ON suppliers BEGIN "
+    "INSERT INTO suppliers_fts(suppliers_fts, rowid, supplier_name) "
+    "VALUES ('delete', old.supplier_id, old.supplier_name); "
+    "INSERT INTO suppliers_fts(rowid, supplier_name) VALUES (new.supplier_id, new.supplier_name); END",
+    # Index the rows that existed before the triggers
+    "INSERT INTO orders_fts(orders_fts) VALUES ('rebuild')",
+    "INSERT INTO suppliers_fts(suppliers_fts) VALUES ('rebuild')"
+)
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS suppliers_fts_update",
+    "DROP TRIGGER IF EXISTS suppliers_fts_delete",
+    "DROP TRIGGER IF EXISTS suppliers_fts_insert",
+    "DROP TABLE IF EXISTS suppliers_fts",
+    "DROP TRIGGER IF EXISTS orders_fts_update",
+    "DROP TRIGGER IF EXISTS orders_fts_delete",
+    "DROP TRIGGER IF EXISTS orders_fts_insert",
+    "DROP TABLE IF EXISTS orders_fts"
+)
+
+def run(statements):
+    for statement in statements:
+        op.execute(statement)
+
+def upgrade():
+    run(POSTGRES_UPGRADE if op.get_bind().dialect.name == 'postgresql' else SQLITE_UPGRADE)
+
+def downgrade():
+    run(POSTGRES_DOWNGRADE if op.get_bind().dialect.name == 'postgresql' else SQLITE_DOWNGRADE)
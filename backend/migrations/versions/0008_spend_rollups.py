@@ -0,0 +1,51 @@
+"""spend_rollups and suppliers.season_started_at
+
+Weekly and monthly approved spend per supplier, maintained by each approval
+so the analytics endpoints never aggregate the order history. Existing
+approvals are loaded with `python ledger_jobs.py rollups`.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-01-08 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'spend_rollups' not in inspector.get_table_names():
+        op.create_table(
+            'spend_rollups',
+            sa.Column('period', sa.String(10), primary_key=True),
+            sa.Column('supplier_id', sa.Integer(), sa.ForeignKey('suppliers.supplier_id', ondelete='CASCADE'),
+                      primary_key=True),
+            sa.Column('bucket_start', sa.Date(), primary_key=True),
+            sa.Column('approved_amount', sa.Numeric(10, 2), nullable=False),
+            sa.Column('order_count', sa.Integer(), nullable=False),
+            sa.Column('pre_season_amount', sa.Numeric(10, 2), nullable=False),
+            sa.CheckConstraint("period IN ('week', 'month')", name='spend_rollup_period_check')
+        )
+    
+    supplier_columns = {column['name'] for column in inspector.get_columns('suppliers')}
+    if 'season_started_at' not in supplier_columns:
+        # Added NOT NULL with a placeholder, not through batch mode: rebuilding
+        # suppliers on SQLite would drop its search triggers
+        op.add_column('suppliers', sa.Column('season_started_at', sa.DateTime(), nullable=False,
+                                             server_default=sa.text("'1970-01-01 00:00:00'")))
+        # The current season began with the supplier's latest 'initial' transaction
+        op.execute(
+            "UPDATE suppliers SET season_started_at = coalesce("
+            "(SELECT max(created_at) FROM transactions WHERE transactions.supplier_id = suppliers.supplier_id "
+            "AND transactions.transaction_type = 'initial'), created_at, CURRENT_TIMESTAMP)"
+        )
+        if op.get_bind().dialect.name == 'postgresql':
+            op.alter_column('suppliers', 'season_started_at', server_default=None)
+
+def downgrade():
+    op.drop_column('suppliers', 'season_started_at')
+    op.drop_table('spend_rollups')
@@ -0,0 +1,62 @@
+"""Money columns as BIGINT minor units
+
+Every NUMERIC(10, 2) amount becomes a BIGINT count of agorot (amount * 100),
+so balance arithmetic and aggregates are exact integer operations. On
+PostgreSQL each table is rewritten once under an exclusive lock. SQLite
+cannot change a column's type without rebuilding the table, and dropping
+suppliers there would cascade to every dependent row, so only the values
+are converted: its NUMERIC columns store whole numbers as integers.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-01-09 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+MONEY_COLUMNS = {
+    'suppliers': ('initial_amount', 'current_amount'),
+    'orders': ('order_amount',),
+    'transactions': ('amount',),
+    'transaction_archive': ('amount',),
+    'balance_snapshots': ('balance',),
+    'spend_rollups': ('approved_amount', 'pre_season_amount')
+}
+
+def decimal_columns(table):
+    """Money columns of table still holding NUMERIC amounts"""
+    inspector = sa.inspect(op.get_bind())
+    types = {column['name']: column['type'] for column in inspector.get_columns(table)}
+    return [name for name in MONEY_COLUMNS[table] if isinstance(types[name], sa.Numeric)]
+
+def upgrade():
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    for table in MONEY_COLUMNS:
+        columns = decimal_columns(table)
+        if not columns:
+            continue
+        if is_postgres:
+            op.execute(f"ALTER TABLE {table} " + ", ".join(
+                f"ALTER COLUMN {column} TYPE BIGINT USING round({column} * 100)::bigint" for column in columns
+            ))
+        else:
+            op.execute(f"UPDATE {table} SET " + ", ".join(
+                f"{column} = CAST(round({column} * 100) AS INTEGER)" for column in columns
+            ))
+
+def downgrade():
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    for table, columns in MONEY_COLUMNS.items():
+        if is_postgres:
+            op.execute(f"ALTER TABLE {table} " + ", ".join(
+                f"ALTER COLUMN {column} TYPE NUMERIC(10, 2) USING {column} / 100.0" for column in columns
+            ))
+        else:
+            op.execute(f"UPDATE {table} SET " + ", ".join(
+                f"{column} = round({column} / 100.0, 2)" for column in columns
+            ))
@@ -1,30 +1,118 @@
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from datetime import datetime
-from decimal import Decimal
+from sqlite3 import Connection as SQLiteConnection
+from sqlalchemy import cast, event, func, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from money import MAX_MINOR, to_major
 
-db = SQLAlchemy()
+# Bind key of the optional read replica in SQLALCHEMY_BINDS (see config.py)
+REPLICA_BIND = 'replica'
+
+class RoutingSession(Session):
+    """Session that runs plain SELECTs on the read replica while g.read_replica is set.
+    
+    Writes, SELECT ... FOR UPDATE, flushes and calls without a statement
+    (such as get_bind() to look up the dialect) use the primary.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and clause is not None and not self._flushing
+                and has_app_context() and g.get('read_replica')
+                and getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+@event.listens_for(Engine, 'connect')
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignores foreign keys unless asked, unlike PostgreSQL"""
+    if isinstance(dbapi_connection, SQLiteConnection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+def upsert(model):
+    """INSERT for the session's dialect, which supports ON CONFLICT clauses"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+class Money(db.TypeDecorator):
+    """BIGINT count of minor units (agorot), so money is a plain int in Python.
+    
+    Drivers return BIGINT as int, so reads need no conversion. Binding takes
+    ints only: a float or Decimal here is an amount in major units that
+    skipped money.to_minor().
+    """
+    impl = db.BigInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, int):
+            raise TypeError(f"Money values are int minor units, got {type(value).__name__} {value!r}")
+        if abs(value) >= MAX_MINOR:
+            raise ValueError(f"Amount {value} is out of range")
+        return value
+
+class MajorUnits(db.TypeDecorator):
+    """Reads a Money expression in major units, for rows passed straight to JSON"""
+    impl = db.BigInteger
+    cache_ok = True
+    
+    def process_result_value(self, value, dialect):
+        return to_major(value) if value is not None else None
+
+def major_units(expression):
+    return type_coerce(expression, MajorUnits)
+
+def money_sum(expression):
+    """SUM of a Money expression as BIGINT; PostgreSQL would return NUMERIC, read as Decimal"""
+    return cast(func.sum(expression), Money)
 
 class Supplier(db.Model):
     __tablename__ = 'suppliers'
+    __table_args__ = (
+        # Backs the change feed's (updated_at, supplier_id) keyset scan
+        db.Index('ix_suppliers_updated_at_supplier_id', 'updated_at', 'supplier_id'),
+    )
     
     id = db.Column('supplier_id', db.Integer, primary_key=True, autoincrement=True)
     name = db.Column('supplier_name', db.String(255), nullable=False, unique=True)
-    initial_amount = db.Column('initial_amount', db.Numeric(10, 2), nullable=False)
-    current_amount = db.Column('current_amount', db.Numeric(10, 2), nullable=False)
+    initial_amount = db.Column('initial_amount', Money, nullable=False)
+    current_amount = db.Column('current_amount', Money, nullable=False)
     supplier_financial_id = db.Column('supplier_financial_id', db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set while a large supplier is purged in the background; it is hidden from then on
+    deletion_requested_at = db.Column(db.DateTime, nullable=True)
+    # Start of the current season (creation or the last rollover), where initial_amount burn-down begins
+    season_started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
-    # Relationships
-    orders = db.relationship('Order', backref='supplier', lazy=True, cascade='all, delete-orphan')
-    transactions = db.relationship('Transaction', backref='supplier', lazy=True, cascade='all, delete-orphan')
+    # Relationships. The foreign keys are ON DELETE CASCADE, so deleting a
+    # supplier never loads its history into the session.
+    orders = db.relationship('Order', backref='supplier', lazy=True, cascade='all, delete-orphan',
+                             passive_deletes=True)
+    transactions = db.relationship('Transaction', backref='supplier', lazy=True, cascade='all, delete-orphan',
+                                   passive_deletes=True)
+    snapshots = db.relationship('BalanceSnapshot', backref='supplier', lazy=True, cascade='all, delete-orphan',
+                                passive_deletes=True)
+    archived_transactions = db.relationship('TransactionArchive', backref='supplier', lazy=True,
+                                            cascade='all, delete-orphan', passive_deletes=True)
+    spend_rollups = db.relationship('SpendRollup', backref='supplier', lazy=True, cascade='all, delete-orphan',
+                                    passive_deletes=True)
     
     def to_dict(self):
         return {
             'id': self.id,
             'name': self.name,
-            'initial_amount': float(self.initial_amount),
-            'current_amount': float(self.current_amount),
+            'initial_amount': to_major(self.initial_amount),
+            'current_amount': to_major(self.current_amount),
             'supplier_financial_id': self.supplier_financial_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
@@ -32,11 +120,17 @@ class Supplier(db.Model):
 
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Backs ledger tail scans after a snapshot and as-of-date lookups
+        db.Index('ix_transactions_supplier_id_id', 'supplier_id', 'id'),
+        # Backs the change feed's (created_at, id) keyset scan
+        db.Index('ix_transactions_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    supplier_id = db.Column(db.Integer, db.ForeignKey('suppliers.supplier_id'), nullable=False)
+    supplier_id = db.Column(db.Integer, db.ForeignKey('suppliers.supplier_id', ondelete='CASCADE'), nullable=False)
     transaction_type = db.Column(db.String(50), nullable=False)
-    amount = db.Column(db.Numeric(10, 2), nullable=False)
+    amount = db.Column(Money, nullable=False)
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -45,27 +139,92 @@ class Transaction(db.Model):
             'id': self.id,
             'supplier_id': self.supplier_id,
             'transaction_type': self.transaction_type,
-            'amount': float(self.amount),
+            'amount': to_major(self.amount),
             'description': self.description,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class TransactionArchive(db.Model):
+    """Transactions moved out of the live ledger by a season rollover"""
+    __tablename__ = 'transaction_archive'
+    __table_args__ = (
+        db.Index('ix_transaction_archive_supplier_id_transaction_id', 'supplier_id', 'transaction_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    transaction_id = db.Column(db.Integer, nullable=False)
+    supplier_id = db.Column(db.Integer, db.ForeignKey('suppliers.supplier_id', ondelete='CASCADE'), nullable=False)
+    transaction_type = db.Column(db.String(50), nullable=False)
+    amount = db.Column(Money, nullable=False)
+    description = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class BalanceSnapshot(db.Model):
+    """Supplier balance folded over the ledger up to and including last_transaction_id"""
+    __tablename__ = 'balance_snapshots'
+    __table_args__ = (
+        db.Index('ix_balance_snapshots_supplier_last_tx', 'supplier_id', 'last_transaction_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    supplier_id = db.Column(db.Integer, db.ForeignKey('suppliers.supplier_id', ondelete='CASCADE'), nullable=False)
+    balance = db.Column(Money, nullable=False)
+    last_transaction_id = db.Column(db.Integer, nullable=False)
+    as_of = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'supplier_id': self.supplier_id,
+            'balance': to_major(self.balance),
+            'last_transaction_id': self.last_transaction_id,
+            'as_of': self.as_of.isoformat() if self.as_of else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class SpendRollup(db.Model):
+    """Approved order spend per supplier and week or month, added to by every approval"""
+    __tablename__ = 'spend_rollups'
+    __table_args__ = (
+        db.CheckConstraint("period IN ('week', 'month')", name='spend_rollup_period_check'),
+    )
+    
+    period = db.Column(db.String(10), primary_key=True)
+    supplier_id = db.Column(db.Integer, db.ForeignKey('suppliers.supplier_id', ondelete='CASCADE'), primary_key=True)
+    # Monday of the week or first day of the month the approvals fall in
+    bucket_start = db.Column(db.Date, primary_key=True)
+    approved_amount = db.Column(Money, nullable=False, default=0)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    # Part of approved_amount approved before the supplier's current season started
+    pre_season_amount = db.Column(Money, nullable=False, default=0)
+
 class Order(db.Model):
     __tablename__ = 'orders'
     __table_args__ = (
         db.CheckConstraint("order_status IN ('Pending', 'Approved', 'Rejected')", name='order_status_check'),
+        # Composite indexes backing keyset pagination on (created_at, order_id)
+        db.Index('ix_orders_created_at_order_id', 'created_at', 'order_id'),
+        db.Index('ix_orders_supplier_created_at', 'supplier_id', 'created_at', 'order_id'),
+        db.Index('ix_orders_status_created_at', 'order_status', 'created_at', 'order_id'),
+        # Covering index for the per-supplier balance aggregate
+        db.Index('ix_orders_supplier_status_amount', 'supplier_id', 'order_status', 'order_amount'),
+        # Backs the change feed's (updated_at, order_id) keyset scan
+        db.Index('ix_orders_updated_at_order_id', 'updated_at', 'order_id'),
     )
     
     order_id = db.Column('order_id', db.String(50), primary_key=True)
-    supplier_id = db.Column('supplier_id', db.Integer, db.ForeignKey('suppliers.supplier_id'), nullable=False)
+    supplier_id = db.Column('supplier_id', db.Integer, db.ForeignKey('suppliers.supplier_id', ondelete='CASCADE'), nullable=False)
     order_title = db.Column('order_title', db.String(255), nullable=False)
-    order_amount = db.Column('order_amount', db.Numeric(10, 2), nullable=False)
+    order_amount = db.Column('order_amount', Money, nullable=False)
     order_date = db.Column('order_date', db.DateTime, default=datetime.utcnow)
     ordered_by = db.Column('ordered_by', db.String(100), nullable=False)
     notes = db.Column('notes', db.Text)
     order_status = db.Column('order_status', db.String(20), default='Pending')
     handler = db.Column('handler', db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         return {
@@ -73,11 +232,70 @@ class Order(db.Model):
             'supplier_id': self.supplier_id,
             'supplier_name': self.supplier.name if self.supplier else f'Unknown Supplier (ID: {self.supplier_id})',
             'title': self.order_title,
-            'amount': float(self.order_amount),
+            'amount': to_major(self.order_amount),
             'order_date': self.order_date.isoformat() if self.order_date else None,
             'ordered_by': self.ordered_by,
             'notes': self.notes,
             'status': self.order_status,
             'handler': self.handler,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class IdempotencyKey(db.Model):
+    """Response of a write made with an Idempotency-Key header, replayed to retries"""
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        db.Index('ix_idempotency_keys_created_at', 'created_at'),
+    )
+    
+    key = db.Column(db.String(255), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    response_body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class Job(db.Model):
+    """Background work, claimed by worker.py with SELECT ... FOR UPDATE SKIP LOCKED"""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.CheckConstraint("status IN ('queued', 'running', 'succeeded', 'failed')", name='job_status_check'),
+        # Backs the claim query's scan for the oldest runnable job
+        db.Index('ix_jobs_status_run_after_id', 'status', 'run_after', 'id'),
+        db.Index('ix_jobs_dedupe_key', 'dedupe_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    progress_done = db.Column(db.Integer, nullable=False, default=0)
+    progress_total = db.Column(db.Integer)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    # Queued or running jobs with the same key are not enqueued twice
+    dedupe_key = db.Column(db.String(255))
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    heartbeat_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'payload': self.payload,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'progress': {'done': self.progress_done, 'total': self.progress_total},
+            'result': self.result,
+            'error': self.error,
+            'run_after': self.run_after.isoformat() if self.run_after else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
         }
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Money as integer minor units (agorot): exact, cheap arithmetic in Python and SQL
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Minor units per major unit (agorot per shekel)
+MINOR_UNITS = 100
+# Below 2**52 minor units, the double nearest to an amount in major units
+# is within half a minor unit of it, so it prints as that exact amount
+MAX_MINOR = 2 ** 52
+
+def to_minor(value):
+    """Parse an amount in major units, a number or numeric string, into minor units.
+    
+    Rounds half up to the nearest minor unit, as NUMERIC(10, 2) columns did.
+    Raises ValueError for anything else, including NaN, infinities and amounts
+    of MAX_MINOR minor units or more, which the Money column would refuse.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid amount: {value!r}")
+    if isinstance(value, int):
+        return in_range(value * MINOR_UNITS, value)
+    if isinstance(value, float):
+        # The shortest repr is the number the client wrote, e.g. 0.29 rather than 0.28999...
+        value = repr(value)
+    try:
+        amount = Decimal(value.strip() if isinstance(value, str) else value)
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Invalid amount: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return in_range(int(amount.scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP)), value)
+
+def in_range(minor, value):
+    if abs(minor) >= MAX_MINOR:
+        raise ValueError(f"Amount out of range: {value!r}")
+    return minor
+
+def to_major(minor):
+    """Minor units as a JSON-ready number of major units, e.g. 1250 -> 12.5.
+    
+    Below MAX_MINOR the nearest double prints as the exact amount.
+    """
+    return minor / MINOR_UNITS
+
+def format_major(minor):
+    """Minor units as major-unit text with both decimals, e.g. 1250 -> '12.50'"""
+    whole, fraction = divmod(abs(minor), MINOR_UNITS)
+    return f"{'-' if minor < 0 else ''}{whole}.{fraction:02d}"
@@ -0,0 +1,221 @@
+import cProfile
+import heapq
+import os
+import random
+import threading
+import time
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from models import db
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def current_timing():
+    return g.get('timing') if has_app_context() else None
+
+class RouteMetrics:
+    """Per-process request totals in Prometheus text format.
+    
+    Routes are labelled by their URL rule (e.g. /api/orders/<order_id>/approve)
+    so the number of series stays bounded.
+    """
+    
+    def __init__(self):
+        self.requests = {}
+        self.routes = {}
+        self.lock = threading.Lock()
+    
+    def record(self, method, route, status, timing):
+        with self.lock:
+            key = (method, route, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            
+            totals = self.routes.get((method, route))
+            if totals is None:
+                totals = self.routes[(method, route)] = {
+                    'buckets': [0] * len(DURATION_BUCKETS),
+                    'count': 0,
+                    'duration': 0.0,
+                    'sql_statements': 0,
+                    'sql_seconds': 0.0,
+                    'serialize_seconds': 0.0,
+                    'response_bytes': 0
+                }
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if timing['duration'] <= bound:
+                    totals['buckets'][index] += 1
+            totals['count'] += 1
+            totals['duration'] += timing['duration']
+            totals['sql_statements'] += timing['sql_statements']
+            totals['sql_seconds'] += timing['sql_seconds']
+            totals['serialize_seconds'] += timing['serialize_seconds']
+            totals['response_bytes'] += timing['response_bytes'] or 0
+    
+    def render(self):
+        with self.lock:
+            requests = dict(self.requests)
+            routes = {key: dict(totals, buckets=list(totals['buckets'])) for key, totals in self.routes.items()}
+        
+        lines = [
+            '# HELP barter_http_requests_total Requests handled, by route and status',
+            '# TYPE barter_http_requests_total counter'
+        ]
+        for (method, route, status), count in sorted(requests.items()):
+            lines.append(f'barter_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+        
+        lines += [
+            '# HELP barter_http_request_duration_seconds Time to produce the response',
+            '# TYPE barter_http_request_duration_seconds histogram'
+        ]
+        for (method, route), totals in sorted(routes.items()):
+            labels = f'method="{method}",route="{route}"'
+            for bound, count in zip(DURATION_BUCKETS, totals['buckets']):
+                lines.append(f'barter_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'barter_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {totals["count"]}')
+            lines.append(f'barter_http_request_duration_seconds_sum{{{labels}}} {totals["duration"]:.6f}')
+            lines.append(f'barter_http_request_duration_seconds_count{{{labels}}} {totals["count"]}')
+        
+        for name, field, description in (
+            ('barter_db_statements_total', 'sql_statements', 'SQL statements executed'),
+            ('barter_db_seconds_total', 'sql_seconds', 'Time spent executing SQL'),
+            ('barter_serialize_seconds_total', 'serialize_seconds', 'Time spent encoding JSON'),
+            ('barter_response_bytes_total', 'response_bytes', 'Response body bytes, excluding streams')
+        ):
+            lines += [f'# HELP {name} {description}', f'# TYPE {name} counter']
+            for (method, route), totals in sorted(routes.items()):
+                lines.append(f'{name}{{method="{method}",route="{route}"}} {totals[field]}')
+        
+        return '\n'.join(lines) + '\n'
+
+class SlowestProfiles:
+    """Keeps cProfile dumps of the slowest sampled requests, deleting the rest"""
+    
+    def __init__(self, directory, keep):
+        self.directory = directory
+        self.keep = keep
+        self.heap = []
+        self.lock = threading.Lock()
+    
+    def offer(self, profiler, duration, method, route):
+        with self.lock:
+            if len(self.heap) >= self.keep and duration <= self.heap[0][0]:
+                return
+            name = route.strip('/').replace('/', '_').replace('<', '').replace('>', '') or 'root'
+            path = os.path.join(self.directory, f'{duration * 1000:09.1f}ms-{method}-{name}-{os.getpid()}-{time.time_ns()}.prof')
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(path)
+            heapq.heappush(self.heap, (duration, path))
+            if len(self.heap) > self.keep:
+                _, evicted = heapq.heappop(self.heap)
+                try:
+                    os.remove(evicted)
+                except OSError:
+                    pass
+
+class RequestProfiler:
+    """Opt-in request instrumentation, configured like a Flask extension.
+    
+    With PROFILING_ENABLED, every request gets a Server-Timing header (total,
+    SQL and JSON encoding time) and is counted in GET /metrics. A
+    PROFILE_SAMPLE_RATE fraction of requests also runs under cProfile, and the
+    PROFILE_KEEP slowest of those are dumped to PROFILE_DIR.
+    """
+    
+    def __init__(self):
+        self.metrics = RouteMetrics()
+        self.profiles = None
+        self.sample_rate = 0
+    
+    def init_app(self, app):
+        if not app.config.get('PROFILING_ENABLED'):
+            return
+        
+        self.sample_rate = app.config.get('PROFILE_SAMPLE_RATE', 0)
+        if self.sample_rate:
+            self.profiles = SlowestProfiles(app.config.get('PROFILE_DIR', 'profiles'),
+                                            app.config.get('PROFILE_KEEP', 10))
+        
+        # Every engine, so statements sent to a read replica are counted too
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+        
+        # Time JSON encoding wherever it happens: jsonify and the response cache both call dumps
+        dumps = app.json.dumps
+        def timed_dumps(obj, **kwargs):
+            started = time.perf_counter()
+            try:
+                return dumps(obj, **kwargs)
+            finally:
+                timing = current_timing()
+                if timing is not None:
+                    timing['serialize_seconds'] += time.perf_counter() - started
+        app.json.dumps = timed_dumps
+        
+        app.before_request(self.start)
+        app.after_request(self.finish)
+        app.teardown_request(self.stop_profiler)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+    
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which a failed statement discards with its start time
+        context._query_started = time.perf_counter()
+    
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = context._query_started
+        timing = current_timing()
+        if timing is not None:
+            timing['sql_statements'] += 1
+            timing['sql_seconds'] += time.perf_counter() - started
+    
+    def start(self):
+        g.timing = {
+            'started': time.perf_counter(),
+            'sql_statements': 0,
+            'sql_seconds': 0.0,
+            'serialize_seconds': 0.0
+        }
+        if self.profiles and random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                g.profiler = profiler
+            except ValueError:
+                # Another request on this interpreter is already being profiled
+                pass
+    
+    def stop_profiler(self, exc=None):
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+        return profiler
+    
+    def finish(self, response):
+        timing = g.pop('timing', None)
+        if timing is None:
+            return response
+        profiler = self.stop_profiler()
+        
+        timing['duration'] = time.perf_counter() - timing['started']
+        timing['response_bytes'] = None if response.is_streamed else response.content_length
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        
+        response.headers['Server-Timing'] = ', '.join([
+            f"app;dur={timing['duration'] * 1000:.2f}",
+            f"db;dur={timing['sql_seconds'] * 1000:.2f};desc=\"{timing['sql_statements']} queries\"",
+            f"serialize;dur={timing['serialize_seconds'] * 1000:.2f}"
+        ])
+        # Let the cross-origin frontend read the timings in its devtools
+        response.headers['Timing-Allow-Origin'] = '*'
+        
+        self.metrics.record(request.method, route, response.status_code, timing)
+        if profiler is not None:
+            self.profiles.offer(profiler, timing['duration'], request.method, route)
+        return response
+    
+    def metrics_view(self):
+        return self.metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+profiler = RequestProfiler()
@@ -0,0 +1,72 @@
+from functools import wraps
+from flask import g, request
+from models import db, REPLICA_BIND
+
+# Sent by the client while it should read its own writes
+READ_PRIMARY_HEADER = 'X-Read-Primary'
+# Set on write responses: seconds the client should send READ_PRIMARY_HEADER for
+READ_PRIMARY_FOR_HEADER = 'X-Read-Primary-For'
+READ_METHODS = ('GET', 'HEAD')
+
+class ReplicaRouter:
+    """Sends the reads of GET requests to the read replica, if one is configured.
+    
+    Every other request, and any request carrying X-Read-Primary, stays on
+    the primary. Successful writes answer with X-Read-Primary-For so the
+    client knows how long to send it, which gives each client
+    read-your-writes however far the replica lags. With or without a
+    replica, those requests also skip the response cache.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.sticky_seconds = 0
+    
+    def init_app(self, app):
+        self.enabled = REPLICA_BIND in (app.config.get('SQLALCHEMY_BINDS') or {})
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5)
+        app.after_request(self.mark_write)
+        if not self.enabled:
+            return
+        
+        app.before_request(self.route_request)
+        app.teardown_request(self.clear)
+    
+    def route_request(self):
+        g.read_replica = request.method in READ_METHODS and not request.headers.get(READ_PRIMARY_HEADER)
+    
+    def mark_write(self, response):
+        if request.method not in READ_METHODS and request.method != 'OPTIONS' and response.status_code < 400:
+            response.headers[READ_PRIMARY_FOR_HEADER] = f'{self.sticky_seconds:g}'
+        return response
+    
+    def clear(self, exc=None):
+        g.pop('read_replica', None)
+    
+    def reads_own_writes(self):
+        """True for a request that asked to see its own recent writes, fresh from the primary"""
+        return request.method in READ_METHODS and bool(request.headers.get(READ_PRIMARY_HEADER))
+
+replicas = ReplicaRouter()
+
+def read_primary(view):
+    """Keep a GET view on the primary, for reads that must not lag behind writes"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_replica = False
+        return view(*args, **kwargs)
+    return wrapper
+
+def copy_primary_to_replica():
+    """Overwrite a SQLite replica with the primary's current contents.
+    
+    Stands in for replication when tests or benchmarks use a second SQLite
+    file as the replica; call it inside an app context after writing.
+    """
+    primary = db.engines[None].raw_connection()
+    replica = db.engines[REPLICA_BIND].raw_connection()
+    try:
+        primary.driver_connection.backup(replica.driver_connection)
+    finally:
+        replica.close()
+        primary.close()
@@ -0,0 +1,136 @@
+import re
+from sqlalchemy import Float, Integer, String, column, event, func, literal, literal_column, select, text, union_all
+from models import db, Order, Supplier
+
+# No stemming: order text mixes Hebrew and English names
+SEARCH_CONFIG = 'simple'
+MAX_SEARCH_TERMS = 8
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Searchable text of an order. Queries must use exactly these expressions
+# for PostgreSQL to match them to the indexes below.
+ORDER_DOCUMENT = "(coalesce(order_title, '') || ' ' || coalesce(ordered_by, '') || ' ' || coalesce(notes, ''))"
+ORDER_VECTOR = f"to_tsvector('{SEARCH_CONFIG}', {ORDER_DOCUMENT})"
+
+POSTGRES_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Word and prefix matches
+    f"CREATE INDEX IF NOT EXISTS ix_orders_search_vector ON orders USING gin ({ORDER_VECTOR})",
+    # Substring (ILIKE) matches
+    f"CREATE INDEX IF NOT EXISTS ix_orders_search_trgm ON orders USING gin ({ORDER_DOCUMENT} gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_suppliers_name_trgm ON suppliers USING gin (supplier_name gin_trgm_ops)"
+)
+
+# FTS5 indexes over the orders and suppliers rows, kept in step by triggers
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5("
+    "order_title, ordered_by, notes, content='orders', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_insert AFTER INSERT ON orders BEGIN "
+    "INSERT INTO orders_fts(rowid, order_title, ordered_by, notes) "
+    "VALUES (new.rowid, new.order_title, new.ordered_by, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_delete AFTER DELETE ON orders BEGIN "
+    "INSERT INTO orders_fts(orders_fts, rowid, order_title, ordered_by, notes) "
+    "VALUES ('delete', old.rowid, old.order_title, old.ordered_by, old.notes); END",
+    # Status changes leave the indexed text alone, so they skip this trigger
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_update AFTER UPDATE OF order_title, ordered_by, notes ON orders BEGIN "
+    "INSERT INTO orders_fts(orders_fts, rowid, order_title, ordered_by, notes) "
+    "VALUES ('delete', old.rowid, old.order_title, old.ordered_by, old.notes); "
+    "INSERT INTO orders_fts(rowid, order_title, ordered_by, notes) "
+    "VALUES (new.rowid, new.order_title, new.ordered_by, new.notes); END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS suppliers_fts USING fts5("
+    "supplier_name, content='suppliers', content_rowid='supplier_id')",
+    "CREATE TRIGGER IF NOT EXISTS suppliers_fts_insert AFTER INSERT ON suppliers BEGIN "
+    "INSERT INTO suppliers_fts(rowid, supplier_name) VALUES (new.supplier_id, new.supplier_name); END",
+    "CREATE TRIGGER IF NOT EXISTS suppliers_fts_delete AFTER DELETE ON suppliers BEGIN "
+    "INSERT INTO suppliers_fts(suppliers_fts, rowid, supplier_name) "
+    "VALUES ('delete', old.supplier_id, old.supplier_name); END",
+    "CREATE TRIGGER IF NOT EXISTS suppliers_fts_update AFTER UPDATE OF supplier_name ON suppliers BEGIN "
+    "INSERT INTO suppliers_fts(suppliers_fts, rowid, supplier_name) "
+    "VALUES ('delete', old.supplier_id, old.supplier_name); "
+    "INSERT INTO suppliers_fts(rowid, supplier_name) VALUES (new.supplier_id, new.supplier_name); END"
+)
+
+# Objects the search DDL creates outside the models, which migration checks should ignore
+SEARCH_INDEXES = ('ix_orders_search_vector', 'ix_orders_search_trgm', 'ix_suppliers_name_trgm')
+SEARCH_TABLES = ('orders_fts', 'suppliers_fts')
+
+def is_search_object(name, type_):
+    if type_ == 'index':
+        return name in SEARCH_INDEXES
+    if type_ == 'table':
+        # FTS5 also creates shadow tables such as orders_fts_data
+        return any(name == table or name.startswith(f'{table}_') for table in SEARCH_TABLES)
+    return False
+
+def install_search(connection):
+    ddl = POSTGRES_DDL if connection.dialect.name == 'postgresql' else SQLITE_DDL
+    for statement in ddl:
+        connection.exec_driver_sql(statement)
+
+@event.listens_for(db.metadata, 'after_create')
+def create_search_indexes(target, connection, **kw):
+    """Databases built with db.create_all() get the search indexes too"""
+    install_search(connection)
+
+def search_terms(query):
+    """Words of a search query, without any query-syntax characters"""
+    return re.findall(r'\w+', query)[:MAX_SEARCH_TERMS]
+
+def like_pattern(query):
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def fts5_query(terms):
+    # Every term must match, each as a prefix
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def order_matches(query):
+    """Subquery of (order_id, rank) for orders matching by title, ordered_by, notes or supplier name.
+    
+    Every word of the query matches as a prefix; on PostgreSQL the whole query
+    also matches as a substring. Each way of matching is a separate branch that
+    its own index can answer, and an order found by several keeps its best rank;
+    higher ranks are better.
+    """
+    terms = search_terms(query)
+    if db.session.get_bind().dialect.name == 'postgresql':
+        vector = literal_column(ORDER_VECTOR)
+        tsquery = func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), ' & '.join(f'{term}:*' for term in terms))
+        rank = func.ts_rank_cd(vector, tsquery)
+        pattern = like_pattern(query.strip())
+        # OR-ing these in one WHERE would scan every order, so each is its own branch
+        branches = union_all(
+            select(Order.order_id, rank.label('rank')).where(vector.op('@@')(tsquery)),
+            select(Order.order_id, rank.label('rank')).where(literal_column(ORDER_DOCUMENT).ilike(pattern, escape='\\')),
+            # Orders matched only by supplier name rank last, as on SQLite
+            select(Order.order_id, literal(0.0, Float).label('rank'))
+            .join(Supplier, Supplier.id == Order.supplier_id)
+            .where(Supplier.name.ilike(pattern, escape='\\'))
+        ).subquery('branches')
+        return (select(branches.c.order_id, func.max(branches.c.rank).label('rank'))
+                .group_by(branches.c.order_id).subquery('matches'))
+    
+    # bm25() is lower for better matches; orders matched only by supplier name rank last
+    return text(
+        "SELECT order_id, max(rank) AS rank FROM ("
+        "SELECT orders.order_id AS order_id, -bm25(orders_fts) AS rank FROM orders_fts "
+        "JOIN orders ON orders.rowid = orders_fts.rowid WHERE orders_fts MATCH :match "
+        "UNION ALL "
+        "SELECT order_id, 0 FROM orders WHERE supplier_id IN "
+        "(SELECT rowid FROM suppliers_fts WHERE suppliers_fts MATCH :match)"
+        ") GROUP BY order_id"
+    ).bindparams(match=fts5_query(terms)).columns(column('order_id', String), column('rank', Float)).subquery('matches')
+
+def supplier_matches(query):
+    """Subquery of (supplier_id, rank) for supplier names matching by word prefix or (on PostgreSQL) substring"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return select(Supplier.id.label('supplier_id'), func.similarity(Supplier.name, query.strip()).label('rank')).where(
+            Supplier.name.ilike(like_pattern(query.strip()), escape='\\')
+        ).subquery('matches')
+    
+    return text(
+        "SELECT rowid AS supplier_id, -bm25(suppliers_fts) AS rank FROM suppliers_fts WHERE suppliers_fts MATCH :match"
+    ).bindparams(match=fts5_query(search_terms(query))).columns(
+        column('supplier_id', Integer), column('rank', Float)
+    ).subquery('matches')
@@ -0,0 +1,68 @@
+import json
+from decimal import Decimal
+from itertools import islice
+from flask import current_app
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rows encoded per chunk when streaming a JSON array
+STREAM_CHUNK_ROWS = 1000
+
+def orjson_default(value):
+    if isinstance(value, Decimal):
+        # Emit the exact decimal text as a JSON number, e.g. 12.50
+        return orjson.Fragment(format(value, 'f'))
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def stdlib_default(value):
+    if isinstance(value, Decimal):
+        # Rare now that money is int minor units (see money.py); up to 15
+        # significant digits, the shortest float repr prints the same number
+        return float(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider backed by orjson, falling back to the standard library.
+    
+    Decimals are written as exact JSON numbers and datetimes as ISO 8601, so
+    handlers can pass column values straight through instead of converting
+    each one to float or a string first.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is not None:
+            return orjson.dumps(obj, default=orjson_default).decode()
+        return json.dumps(obj, default=stdlib_default, separators=(',', ':'), ensure_ascii=False)
+    
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s)
+
+def rows_to_dicts(rows):
+    """Column-tuple rows (from a query of labelled columns) as JSON-ready dicts"""
+    return [row._asdict() for row in rows]
+
+def stream_json_array(rows, chunk_size=STREAM_CHUNK_ROWS):
+    """Yield a JSON array of rows a chunk at a time.
+    
+    Pass a yield_per query so rows are fetched as they are encoded and memory
+    stays flat however long the list is.
+    """
+    rows = iter(rows)
+    separator = ''
+    yield '['
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        # Strip the brackets to splice this chunk into the open array
+        yield separator + current_app.json.dumps(rows_to_dicts(chunk))[1:-1]
+        separator = ','
+    yield ']'
@@ -0,0 +1,11 @@
+"""
+Test setup: import the flat backend modules, on the 'testing' config
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py builds a module-level app when imported; make it a throwaway SQLite
+# one rather than production's DATABASE_URL
+os.environ['FLASK_CONFIG'] = 'testing'
@@ -0,0 +1,105 @@
+"""
+Concurrent approvals and rejections: each order is claimed once and debited once
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app import create_app
+from config import TestingConfig, engine_options
+from ledger import reconcile
+from models import db, Supplier, Transaction
+
+ORDER_COUNT = 20
+# Competing requests per order
+ATTEMPTS = 4
+ORDER_AMOUNT = 12.5
+INITIAL_AMOUNT = 100000
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App on a SQLite file, which every request thread opens its own connection to"""
+    url = f"sqlite:///{tmp_path / 'approvals.db'}"
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', url)
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', {
+        **engine_options(url),
+        # Wait for the write lock as PostgreSQL would for a row lock
+        'connect_args': {'timeout': 30}
+    })
+    return create_app('testing')
+
+def seed(client):
+    supplier_id = client.post('/api/suppliers', json={'name': 'Acme', 'initialAmount': INITIAL_AMOUNT}).json['supplier']['id']
+    for index in range(ORDER_COUNT):
+        response = client.post('/api/orders', json={
+            'orderId': f'ORD-{index}',
+            'supplierId': supplier_id,
+            'orderTitle': f'Order {index}',
+            'orderAmount': ORDER_AMOUNT,
+            'orderDate': '2025-01-01',
+            'orderedBy': 'Dana'
+        })
+        assert response.status_code == 201, response.json
+    return supplier_id
+
+def test_parallel_approvals_debit_each_order_once(app):
+    client = app.test_client()
+    supplier_id = seed(client)
+    
+    # Every order gets ATTEMPTS racing requests, the last of which rejects it
+    attempts = [
+        (f'ORD-{index}', 'reject' if attempt == ATTEMPTS - 1 else 'approve', f'Handler {attempt}')
+        for attempt in range(ATTEMPTS)
+        for index in range(ORDER_COUNT)
+    ]
+    
+    def send(attempt):
+        order_id, action, handler = attempt
+        response = app.test_client().put(f'/api/orders/{order_id}/{action}', json={'handler_name': handler})
+        return order_id, action, response.status_code
+    
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(send, attempts))
+    
+    assert {status for _, _, status in results} <= {200, 400}
+    winners = {}
+    for order_id, action, status in results:
+        if status == 200:
+            assert order_id not in winners, f"{order_id} was claimed twice"
+            winners[order_id] = action
+    assert len(winners) == ORDER_COUNT
+    approved = [order_id for order_id, action in winners.items() if action == 'approve']
+    
+    orders = {order['order_id']: order for order in client.get('/api/orders?limit=all').json}
+    for order_id, action in winners.items():
+        assert orders[order_id]['status'] == ('Approved' if action == 'approve' else 'Rejected')
+    
+    with app.app_context():
+        supplier = db.session.get(Supplier, supplier_id)
+        assert supplier.current_amount == (INITIAL_AMOUNT - ORDER_AMOUNT * len(approved)) * 100
+        debits = Transaction.query.filter_by(supplier_id=supplier_id, transaction_type='order_approved').all()
+        assert len(debits) == len(approved)
+        assert sum(debit.amount for debit in debits) == -ORDER_AMOUNT * 100 * len(approved)
+        assert reconcile() == {'checked': 1, 'mismatches': []}
+
+def test_parallel_bulk_approvals_debit_each_order_once(app):
+    client = app.test_client()
+    supplier_id = seed(client)
+    order_ids = [f'ORD-{index}' for index in range(ORDER_COUNT)]
+    
+    # Overlapping batches race for the same orders
+    def send(offset):
+        batch = order_ids[offset:] + order_ids[:offset]
+        response = app.test_client().put('/api/orders/bulk', json={
+            'handler_name': f'Handler {offset}', 'action': 'approve', 'order_ids': batch
+        })
+        assert response.status_code == 200, response.json
+        return sum(result['success'] for result in response.json['results'])
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        updated = list(pool.map(send, range(0, ORDER_COUNT, 2)))
+    
+    assert sum(updated) == ORDER_COUNT
+    with app.app_context():
+        supplier = db.session.get(Supplier, supplier_id)
+        assert supplier.current_amount == (INITIAL_AMOUNT - ORDER_AMOUNT * ORDER_COUNT) * 100
+        assert Transaction.query.filter_by(transaction_type='order_approved').count() == ORDER_COUNT
+        assert reconcile() == {'checked': 1, 'mismatches': []}
@@ -0,0 +1,86 @@
+"""
+Order listing and approval run a fixed number of SQL statements, however many orders exist
+"""
+import pytest
+from sqlalchemy import event
+from app import create_app
+from models import db
+
+ORDER_COUNT = 30
+SUPPLIER_COUNT = 5
+
+class StatementCounter:
+    """Counts the statements an app's engine runs inside a with block"""
+    
+    def __init__(self, app):
+        with app.app_context():
+            self.engine = db.engine
+        self.count = 0
+    
+    def __call__(self, *args):
+        self.count += 1
+    
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self)
+        return self
+    
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self)
+
+def seed(client, order_count):
+    """Pending orders ORD-0 ... spread over up to SUPPLIER_COUNT suppliers"""
+    supplier_ids = [
+        client.post('/api/suppliers', json={'name': f'Supplier {index}', 'initialAmount': 100000}).json['supplier']['id']
+        for index in range(min(order_count, SUPPLIER_COUNT))
+    ]
+    for index in range(order_count):
+        response = client.post('/api/orders', json={
+            'orderId': f'ORD-{index}',
+            'supplierId': supplier_ids[index % len(supplier_ids)],
+            'orderTitle': f'Order {index}',
+            'orderAmount': 10,
+            'orderDate': '2025-01-01',
+            'orderedBy': 'Dana'
+        })
+        assert response.status_code == 201, response.json
+
+def statements_per_request(order_count, send):
+    """Statements send(client) runs against a fresh database holding order_count orders"""
+    app = create_app('testing')
+    client = app.test_client()
+    seed(client, order_count)
+    
+    with StatementCounter(app) as counter:
+        response = send(client)
+        # Streamed bodies run their queries as they are read
+        response.get_data()
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return counter.count
+
+@pytest.mark.parametrize('url', [
+    '/api/orders',
+    '/api/orders?status=Pending',
+    '/api/orders?limit=all',
+    '/api/suppliers',
+    '/api/balances'
+])
+def test_listing_statements_do_not_grow_with_orders(url):
+    def send(client):
+        return client.get(url)
+    
+    assert statements_per_request(1, send) == statements_per_request(ORDER_COUNT, send)
+
+@pytest.mark.parametrize('action', ['approve', 'reject'])
+def test_status_change_statements_do_not_grow_with_orders(action):
+    def send(client):
+        return client.put(f'/api/orders/ORD-0/{action}', json={'handler_name': 'Admin'})
+    
+    assert statements_per_request(1, send) == statements_per_request(ORDER_COUNT, send)
+
+def test_bulk_approval_statements_do_not_grow_with_orders():
+    def send(client):
+        order_ids = [order['order_id'] for order in client.get('/api/orders').json]
+        return client.put('/api/orders/bulk', json={'handler_name': 'Admin', 'action': 'approve', 'order_ids': order_ids})
+    
+    # One statement per supplier debited, so compare batches over the same suppliers
+    assert statements_per_request(SUPPLIER_COUNT, send) == statements_per_request(ORDER_COUNT, send)
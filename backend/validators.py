@@ -0,0 +1,123 @@
+from datetime import datetime
+from money import to_minor
+
+class ValidationError(ValueError):
+    """Raised when submitted supplier or order data fails validation"""
+
+def validate_new_supplier(data):
+    """Validate a new supplier payload and return the column values to insert.
+    
+    Shared by POST /api/suppliers and the bulk importer so both apply the same rules.
+    """
+    required_fields = ['name', 'initialAmount']
+    for field in required_fields:
+        if not data.get(field):
+            raise ValidationError(f"Missing required field: {field}")
+    
+    name = str(data['name']).strip()
+    current_amount = data.get('currentAmount')
+    if current_amount in ('', None):
+        current_amount = data['initialAmount']
+    try:
+        initial_amount = to_minor(data['initialAmount'])
+        current_amount = to_minor(current_amount)
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid number format for amounts")
+    
+    supplier_financial_id = data.get('supplierFinancialId')
+    if supplier_financial_id in ('', None):
+        supplier_financial_id = None
+    else:
+        try:
+            supplier_financial_id = int(supplier_financial_id)
+        except (TypeError, ValueError):
+            raise ValidationError("Invalid supplier financial ID")
+    
+    # Validate values
+    if initial_amount < 0 or current_amount < 0:
+        raise ValidationError("Amounts must be non-negative")
+    
+    if len(name) < 1:
+        raise ValidationError("Supplier name cannot be empty")
+    
+    return {
+        'name': name,
+        'initial_amount': initial_amount,
+        'current_amount': current_amount,
+        'supplier_financial_id': supplier_financial_id
+    }
+
+def validate_initialization(data, require_initial_amount=True):
+    """Validate a supplier initialize/rollover payload.
+    
+    initial_amount is None when omitted (bulk rollovers keep each supplier's
+    own), and current_amount is None when it should equal the new initial amount.
+    """
+    initial_amount = data.get('initialAmount')
+    current_amount = data.get('currentAmount')
+    if initial_amount in ('', None):
+        if require_initial_amount:
+            raise ValidationError("Missing required field: initialAmount")
+        initial_amount = None
+    if current_amount in ('', None):
+        current_amount = None
+    
+    try:
+        initial_amount = to_minor(initial_amount) if initial_amount is not None else None
+        current_amount = to_minor(current_amount) if current_amount is not None else None
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid number format for amounts")
+    
+    if (initial_amount is not None and initial_amount < 0) or (current_amount is not None and current_amount < 0):
+        raise ValidationError("Amounts must be non-negative")
+    
+    return {
+        'initial_amount': initial_amount,
+        'current_amount': current_amount,
+        'archive_history': bool(data.get('exportHistory'))
+    }
+
+def validate_new_order(data):
+    """Validate a new order payload and return the column values to insert.
+    
+    Shared by POST /api/orders and the bulk importer so both apply the same rules.
+    """
+    required_fields = ['orderId', 'supplierId', 'orderTitle', 'orderAmount', 'orderDate', 'orderedBy']
+    for field in required_fields:
+        if not data.get(field):
+            raise ValidationError(f"Missing required field: {field}")
+    
+    order_id = str(data['orderId']).strip()
+    order_title = str(data['orderTitle'] or '').strip()
+    ordered_by = str(data['orderedBy'] or '').strip()
+    notes = str(data.get('notes') or '').strip() or None
+    try:
+        supplier_id = int(data['supplierId'])
+        order_amount = to_minor(data['orderAmount'])
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid number format for supplier ID or amount")
+    
+    try:
+        order_date = datetime.fromisoformat(str(data['orderDate']))
+    except ValueError:
+        raise ValidationError("Invalid order date, expected ISO format (YYYY-MM-DD)")
+    
+    # Validate values
+    if order_amount <= 0:
+        raise ValidationError("Order amount must be greater than 0")
+    
+    if len(order_title) < 1:
+        raise ValidationError("Order title cannot be empty")
+    
+    if len(ordered_by) < 1:
+        raise ValidationError("Ordered by cannot be empty")
+    
+    return {
+        'order_id': order_id,
+        'supplier_id': supplier_id,
+        'order_title': order_title,
+        'order_amount': order_amount,
+        'order_date': order_date,
+        'ordered_by': ordered_by,
+        'notes': notes
+    }
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+HTTP benchmark for every API route
+Seeds a throwaway database at the chosen scale, drives each route through the
+Flask test client (in process) or a real gunicorn server with profiling
+enabled, and reports p50/p95/p99 latency, throughput, queries per request and
+peak RSS. Results are saved as JSON and can be compared against a baseline.
+
+Usage: python benchmarks/api_bench.py --orders 10000 --output benchmarks/results/baseline.json
+       python benchmarks/api_bench.py --orders 10000 --compare benchmarks/results/baseline.json
+       python benchmarks/api_bench.py --orders 100000 --target gunicorn --concurrency 16
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import re
+import resource
+import shlex
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, 'backend')
+sys.path.insert(0, BACKEND)
+
+# name: label in the report; build(context, index) -> (path, json body, upload)
+# setup(context, count) runs untimed before the scenario to create its targets
+Scenario = namedtuple('Scenario', ['name', 'method', 'build', 'setup', 'max_requests'],
+                      defaults=[None, None])
+
+# Statement count from the Server-Timing header added by profiling.py
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+BULK_BATCH = 100
+IMPORT_BATCH = 100
+
+def pick_supplier(context, index):
+    supplier_ids = context['supplier_ids']
+    return supplier_ids[index % len(supplier_ids)]
+
+def prepare_pending(key, per_request=1):
+    def setup(context, count):
+        from seed import add_pending_orders
+        context[key] = add_pending_orders(context['supplier_ids'], count * per_request,
+                                          f"{key}-{context['run_id']}")
+    return setup
+
+def prepare_delete(context, count):
+    from seed import add_suppliers
+    context['delete_ids'] = add_suppliers(count, f"Bench delete {context['run_id']}")
+
+def prepare_deleting(context, count):
+    from datetime import datetime
+    from seed import add_suppliers, add_pending_orders
+    from models import db, Supplier
+    supplier_id, = add_suppliers(1, f"Bench deleting {context['run_id']}")
+    add_pending_orders([supplier_id], IMPORT_BATCH * 10, f"deleting-{context['run_id']}")
+    db.session.get(Supplier, supplier_id).deletion_requested_at = datetime.utcnow()
+    db.session.commit()
+    context['deleting_id'] = supplier_id
+
+def prepare_deep_cursor(context, count):
+    from app import encode_cursor
+    from models import Order
+    total = Order.query.count()
+    order = Order.query.order_by(Order.created_at.desc(), Order.order_id.desc()).offset(total // 2).first()
+    context['deep_cursor'] = encode_cursor(order.created_at, order.order_id)
+
+def prepare_job(context, count):
+    from jobs import enqueue
+    from models import db
+    context['job_id'] = enqueue('ledger_reconcile', {}).id
+    db.session.commit()
+
+def import_csv(context, index):
+    lines = ['orderId,supplierId,orderTitle,orderAmount,orderDate,orderedBy']
+    for row in range(IMPORT_BATCH):
+        lines.append(f"imp-{context['run_id']}-{index}-{row},{pick_supplier(context, row)},"
+                     f"Imported order,12.50,2025-01-01,bench")
+    return ('orders.csv', '\n'.join(lines).encode(), 'text/csv')
+
+def import_suppliers_csv(context, index):
+    lines = ['name,initialAmount']
+    for row in range(IMPORT_BATCH):
+        lines.append(f"Imported {context['run_id']} {index}-{row},1000")
+    return ('suppliers.csv', '\n'.join(lines).encode(), 'text/csv')
+
+def new_order(context, index):
+    return {
+        'orderId': f"new-{context['run_id']}-{index}",
+        'supplierId': pick_supplier(context, index),
+        'orderTitle': 'Benchmark order',
+        'orderAmount': 25.5,
+        'orderDate': '2025-01-01',
+        'orderedBy': 'bench'
+    }
+
+SCENARIOS = [
+    Scenario('home', 'GET', lambda c, i: ('/', None, None)),
+    Scenario('suppliers_list', 'GET', lambda c, i: ('/api/suppliers', None, None)),
+    Scenario('orders_first_page', 'GET', lambda c, i: ('/api/orders', None, None)),
+    Scenario('orders_deep_page', 'GET',
+             lambda c, i: (f"/api/orders?cursor={c['deep_cursor']}", None, None), prepare_deep_cursor),
+    Scenario('orders_all_streamed', 'GET', lambda c, i: ('/api/orders?limit=all', None, None), max_requests=10),
+    Scenario('orders_by_supplier', 'GET',
+             lambda c, i: (f'/api/orders?supplier_id={pick_supplier(c, i)}', None, None)),
+    Scenario('orders_pending', 'GET', lambda c, i: ('/api/orders?status=Pending', None, None)),
+    Scenario('orders_date_range', 'GET',
+             lambda c, i: ('/api/orders?date_from=2024-01-01&date_to=2024-03-31', None, None)),
+    Scenario('balances_list', 'GET', lambda c, i: ('/api/balances', None, None)),
+    Scenario('balance_one', 'GET', lambda c, i: (f'/api/balances/{pick_supplier(c, i)}', None, None)),
+    Scenario('ledger_balance', 'GET',
+             lambda c, i: (f'/api/balances/{pick_supplier(c, i)}/ledger', None, None)),
+    Scenario('ledger_balance_as_of', 'GET',
+             lambda c, i: (f'/api/balances/{pick_supplier(c, i)}/ledger?as_of=2024-06-30', None, None)),
+    Scenario('analytics_spend_monthly', 'GET', lambda c, i: ('/api/analytics/spend?period=month', None, None)),
+    Scenario('analytics_spend_supplier_weekly', 'GET',
+             lambda c, i: (f'/api/analytics/spend?period=week&supplier_id={pick_supplier(c, i)}', None, None)),
+    Scenario('analytics_burndown', 'GET', lambda c, i: ('/api/analytics/burndown?period=week', None, None)),
+    Scenario('ledger_reconcile', 'GET', lambda c, i: ('/api/ledger/reconcile', None, None), max_requests=10),
+    Scenario('export_orders_csv', 'GET', lambda c, i: ('/api/export/orders', None, None), max_requests=5),
+    Scenario('export_transactions_csv', 'GET',
+             lambda c, i: (f'/api/export/transactions?supplier_id={pick_supplier(c, i)}', None, None), max_requests=20),
+    Scenario('changes', 'GET', lambda c, i: ('/api/changes?limit=500', None, None)),
+    # 'benchmark' matches every order's title and 'user7' one order in 50
+    Scenario('search_orders_broad', 'GET', lambda c, i: ('/api/search/orders?q=benchmark', None, None)),
+    Scenario('search_orders_narrow', 'GET', lambda c, i: ('/api/search/orders?q=user7', None, None)),
+    Scenario('search_orders_by_supplier', 'GET',
+             lambda c, i: (f'/api/search/orders?q=benchmark&supplier_id={pick_supplier(c, i)}', None, None)),
+    Scenario('search_suppliers_broad', 'GET', lambda c, i: ('/api/search/suppliers?q=bench', None, None)),
+    Scenario('search_suppliers_narrow', 'GET',
+             lambda c, i: (f'/api/search/suppliers?q=supplier%20{i % 10:04d}', None, None)),
+    Scenario('jobs_list', 'GET', lambda c, i: ('/api/jobs', None, None)),
+    Scenario('job_status', 'GET', lambda c, i: (f"/api/jobs/{c['job_id']}", None, None), prepare_job),
+    # A supplier whose deletion was requested but not yet purged
+    Scenario('supplier_deletion_status', 'GET',
+             lambda c, i: (f"/api/suppliers/{c['deleting_id']}/deletion", None, None), prepare_deleting),
+    Scenario('admin_login', 'POST', lambda c, i: ('/api/admin/login', {'password': c['admin_password']}, None)),
+    Scenario('supplier_create', 'POST',
+             lambda c, i: ('/api/suppliers', {'name': f"Bench new {c['run_id']} {i}", 'initialAmount': 1000}, None)),
+    Scenario('supplier_update', 'PUT',
+             lambda c, i: (f'/api/suppliers/{pick_supplier(c, i)}', {
+                 'name': f'Bench updated {pick_supplier(c, i)}',
+                 'initialAmount': 50000000,
+                 'currentAmount': 50000000
+             }, None)),
+    Scenario('order_create', 'POST', lambda c, i: ('/api/orders', new_order(c, i), None)),
+    Scenario('order_approve', 'PUT',
+             lambda c, i: (f"/api/orders/{c['approve'][i]}/approve", {'handler_name': 'bench'}, None),
+             prepare_pending('approve')),
+    Scenario('order_reject', 'PUT',
+             lambda c, i: (f"/api/orders/{c['reject'][i]}/reject", {'handler_name': 'bench'}, None),
+             prepare_pending('reject')),
+    Scenario('orders_bulk_approve', 'PUT',
+             lambda c, i: ('/api/orders/bulk', {
+                 'action': 'approve',
+                 'handler_name': 'bench',
+                 'order_ids': c['bulk'][i * BULK_BATCH:(i + 1) * BULK_BATCH]
+             }, None),
+             prepare_pending('bulk', BULK_BATCH), max_requests=50),
+    Scenario('import_orders', 'POST', lambda c, i: ('/api/import/orders', None, import_csv(c, i)),
+             max_requests=50),
+    Scenario('import_suppliers', 'POST', lambda c, i: ('/api/import/suppliers', None, import_suppliers_csv(c, i)),
+             max_requests=50),
+    Scenario('ledger_snapshots', 'POST', lambda c, i: ('/api/ledger/snapshots', None, None), max_requests=10),
+    # Queues only; no worker runs the jobs during the benchmark
+    Scenario('job_enqueue', 'POST', lambda c, i: ('/api/jobs', {'kind': 'spend_rollups'}, None), max_requests=50),
+    # Compacting a ledger leaves little for the next run, so the warmup and measured
+    # requests each take a different supplier (at least 10 are seeded). The warmup
+    # rollover compacts every ledger, so the measured ones time the steady state.
+    Scenario('supplier_initialize', 'POST',
+             lambda c, i: (f'/api/suppliers/{pick_supplier(c, i)}/initialize', {
+                 'initialAmount': 50000000,
+                 'exportHistory': True
+             }, None), max_requests=5),
+    Scenario('suppliers_rollover', 'POST',
+             lambda c, i: ('/api/suppliers/initialize', {'all': True, 'exportHistory': True}, None), max_requests=3),
+    Scenario('supplier_delete', 'DELETE',
+             lambda c, i: (f"/api/suppliers/{c['delete_ids'][i]}", None, None), prepare_delete)
+]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def own_peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def process_peak_rss_mb(pid):
+    """Peak RSS of another process from /proc (Linux only), None elsewhere"""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+
+def child_pids(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as children:
+            return [int(child) for child in children.read().split()]
+    except OSError:
+        return []
+
+def summarize(latencies, errors, elapsed, queries=None):
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies_ms, 0.50), 3),
+        'p95_ms': round(percentile(latencies_ms, 0.95), 3),
+        'p99_ms': round(percentile(latencies_ms, 0.99), 3),
+        'max_ms': round(max(latencies_ms), 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None
+    }
+
+class ClientTarget:
+    """Drives the app in process with the Flask test client, counting SQL statements"""
+    
+    def __init__(self, app):
+        from sqlalchemy import event
+        from models import db
+        
+        self.app = app
+        self.client = app.test_client()
+        self.statements = 0
+        
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self.count_statement)
+    
+    def count_statement(self, *args):
+        self.statements += 1
+    
+    def send(self, method, path, body, upload):
+        kwargs = {'json': body} if body is not None else {}
+        if upload:
+            filename, content, mimetype = upload
+            kwargs = {'data': {'file': (io.BytesIO(content), filename, mimetype)},
+                      'content_type': 'multipart/form-data'}
+        response = self.client.open(path, method=method, **kwargs)
+        # Consume streamed bodies so their queries and encoding are timed
+        response.get_data()
+        response.close()
+        return response.status_code
+    
+    def run(self, scenario, requests, warmup):
+        for index in range(warmup):
+            self.send(scenario.method, *scenario.build(self.context, index))
+        
+        latencies, queries, errors = [], [], 0
+        started = time.perf_counter()
+        for index in range(warmup, warmup + requests):
+            path, body, upload = scenario.build(self.context, index)
+            self.statements = 0
+            request_started = time.perf_counter()
+            status = self.send(scenario.method, path, body, upload)
+            latencies.append(time.perf_counter() - request_started)
+            queries.append(self.statements)
+            errors += status >= 400
+        result = summarize(latencies, errors, time.perf_counter() - started, queries)
+        result['peak_rss_mb'] = own_peak_rss_mb()
+        return result
+    
+    def close(self):
+        pass
+
+def procfile_command(process, port):
+    """Arguments of a Procfile process, with $PORT filled in and gunicorn run by this interpreter"""
+    with open(os.path.join(ROOT, 'Procfile')) as procfile:
+        for line in procfile:
+            name, _, command = line.partition(':')
+            if name.strip() == process:
+                args = shlex.split(command.replace('$PORT', str(port)))
+                if args[0] == 'gunicorn':
+                    args = [sys.executable, '-m', 'gunicorn'] + args[1:]
+                return args
+    raise RuntimeError(f"No {process} process in the Procfile")
+
+class GunicornTarget:
+    """Starts gunicorn with the production settings and drives it over HTTP"""
+    
+    def __init__(self, database_url, workers, worker_class, concurrency):
+        self.concurrency = concurrency
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            self.port = probe.getsockname()[1]
+        
+        env = dict(os.environ, FLASK_CONFIG='testing', TEST_DATABASE_URL=database_url,
+                   WEB_CONCURRENCY=str(workers), GUNICORN_WORKER_CLASS=worker_class,
+                   PROFILING_ENABLED='true', PROFILE_SAMPLE_RATE='0')
+        # Started like the Procfile's web process, so a config file it fails to load is noticed here too
+        self.process = subprocess.Popen(procfile_command('web', self.port) + ['--log-level', 'warning'],
+                                        cwd=ROOT, env=env)
+        self.wait_until_ready()
+    
+    def wait_until_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=1)
+                connection.request('GET', '/')
+                if connection.getresponse().status == 200:
+                    connection.close()
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("gunicorn did not start in time")
+    
+    @staticmethod
+    def encode(body, upload):
+        if upload:
+            filename, content, mimetype = upload
+            boundary = uuid.uuid4().hex
+            payload = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                       f'Content-Type: {mimetype}\r\n\r\n').encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+            return payload, {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+        if body is not None:
+            return json.dumps(body).encode(), {'Content-Type': 'application/json'}
+        return None, {}
+    
+    def run(self, scenario, requests, warmup):
+        total = warmup + requests
+        next_index = iter(range(total))
+        lock = threading.Lock()
+        latencies, queries, errors = [], [], [0]
+        
+        def worker():
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=120)
+            while True:
+                with lock:
+                    index = next(next_index, None)
+                if index is None:
+                    break
+                path, body, upload = scenario.build(self.context, index)
+                payload, headers = self.encode(body, upload)
+                request_started = time.perf_counter()
+                try:
+                    connection.request(scenario.method, path, body=payload, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    status = response.status
+                    statements = SERVER_TIMING_QUERIES.search(response.getheader('Server-Timing') or '')
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=120)
+                    status = 599
+                    statements = None
+                elapsed = time.perf_counter() - request_started
+                if index >= warmup:
+                    with lock:
+                        latencies.append(elapsed)
+                        errors[0] += status >= 400
+                        if statements:
+                            queries.append(int(statements.group(1)))
+            connection.close()
+        
+        threads = [threading.Thread(target=worker) for _ in range(min(self.concurrency, total))]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Warmup requests share the wall clock with measured ones under concurrency
+        elapsed = (time.perf_counter() - started) * requests / total
+        
+        result = summarize(latencies, errors[0], elapsed, queries)
+        worker_peaks = [process_peak_rss_mb(pid) for pid in child_pids(self.process.pid)]
+        worker_peaks = [peak for peak in worker_peaks if peak is not None]
+        result['peak_rss_mb'] = max(worker_peaks) if worker_peaks else None
+        return result
+    
+    def close(self):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def run(args):
+    if args.database_url:
+        return benchmark(args, args.database_url)
+    # A file rather than :memory: so a gunicorn server can share the data
+    workdir = tempfile.mkdtemp(prefix='barter-bench-')
+    try:
+        return benchmark(args, f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def benchmark(args, database_url):
+    # config.py and app.py read these at import time
+    os.environ['FLASK_CONFIG'] = 'testing'
+    os.environ['TEST_DATABASE_URL'] = database_url
+    os.environ['CACHE_BACKEND'] = args.cache
+    from app import create_app
+    from models import db, Supplier
+    from seed import seed
+    
+    app = create_app('testing')
+    with app.app_context():
+        if Supplier.query.count():
+            print("❌ The benchmark database must be empty; it is filled with generated data")
+            return 2
+        print(f"Seeding {args.orders} orders into {db.engine.dialect.name}...")
+        started = time.perf_counter()
+        supplier_ids, _ = seed(args.orders, args.suppliers)
+        seed_seconds = round(time.perf_counter() - started, 1)
+        print(f"Seeded {len(supplier_ids)} suppliers and {args.orders} orders in {seed_seconds}s")
+        dialect = db.engine.dialect.name
+    
+    if args.target == 'gunicorn':
+        target = GunicornTarget(database_url, args.workers, args.worker_class, args.concurrency)
+    else:
+        target = ClientTarget(app)
+    target.context = {
+        'supplier_ids': supplier_ids,
+        'run_id': uuid.uuid4().hex[:8],
+        'admin_password': app.config['ADMIN_PASSWORD']
+    }
+    
+    selected = [scenario for scenario in SCENARIOS
+                if not args.only or scenario.name in args.only]
+    results = {}
+    try:
+        for scenario in selected:
+            requests = min(args.requests, scenario.max_requests or args.requests)
+            warmup = min(args.warmup, requests)
+            if scenario.setup:
+                with app.app_context():
+                    scenario.setup(target.context, warmup + requests)
+            with app.app_context():
+                results[scenario.name] = target.run(scenario, requests, warmup)
+            print_result(scenario.name, results[scenario.name])
+    finally:
+        target.close()
+    
+    report = {
+        'meta': {
+            'target': args.target,
+            'database': dialect,
+            'orders': args.orders,
+            'suppliers': len(supplier_ids),
+            'requests': args.requests,
+            'concurrency': args.concurrency if args.target == 'gunicorn' else 1,
+            'cache': args.cache,
+            'seed_seconds': seed_seconds,
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'created_at': datetime.utcnow().isoformat()
+        },
+        'scenarios': results
+    }
+    
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f"Saved results to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as baseline:
+            return compare(json.load(baseline), report, args.max_regression)
+    return 0
+
+def print_result(name, result):
+    queries = result['queries_per_request']
+    print(f"{name:24} p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+          f"p99={result['p99_ms']:8.2f}ms {result['throughput_rps'] or 0:8.1f} req/s "
+          f"queries={'-' if queries is None else queries} errors={result['errors']} "
+          f"rss={result['peak_rss_mb'] or '-'}MB")
+
+def compare(baseline, current, max_regression):
+    """Print p95 and query-count changes and return 1 if anything regressed"""
+    for key in ('target', 'database', 'orders', 'concurrency', 'cache'):
+        if baseline['meta'].get(key) != current['meta'].get(key):
+            print(f"⚠️ Baseline {key} was {baseline['meta'].get(key)}, now {current['meta'].get(key)}")
+    
+    regressions = []
+    print(f"\n{'scenario':24} {'p95 before':>11} {'p95 after':>11} {'change':>8} {'queries':>15}")
+    for name, result in current['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if not before:
+            print(f"{name:24} (not in baseline)")
+            continue
+        change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0
+        queries = f"{before['queries_per_request']} -> {result['queries_per_request']}"
+        print(f"{name:24} {before['p95_ms']:9.2f}ms {result['p95_ms']:9.2f}ms {change:+8.1%} {queries:>15}")
+        # Sub-millisecond swings are timer noise, not regressions
+        if change > max_regression and result['p95_ms'] - before['p95_ms'] > 1:
+            regressions.append(f"{name}: p95 {change:+.1%}")
+        if (result['queries_per_request'] or 0) > (before['queries_per_request'] or 0):
+            regressions.append(f"{name}: {queries} queries per request")
+    
+    if regressions:
+        print("\n❌ Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\n✅ No regressions against the baseline")
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTTP benchmark for the Barter API')
+    parser.add_argument('--orders', type=int, default=10000, help='Orders to seed (1k to 1M)')
+    parser.add_argument('--suppliers', type=int, help='Suppliers to seed (default scales with orders)')
+    parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario')
+    parser.add_argument('--target', choices=['client', 'gunicorn'], default='client')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads for the gunicorn target')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--worker-class', default='gthread', help='gunicorn worker class')
+    parser.add_argument('--cache', choices=['none', 'local'], default='none', help='CACHE_BACKEND to run with')
+    parser.add_argument('--database-url',
+                        help='Empty database to seed (default: a temporary SQLite file)')
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO', help='Run only these scenarios')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Allowed p95 slowdown before --compare fails (0.2 = 20%%)')
+    args = parser.parse_args()
+    if args.cache == 'local' and args.target == 'gunicorn' and args.workers > 1:
+        parser.error("--cache local is per process; use --workers 1 with it")
+    raise SystemExit(run(args))
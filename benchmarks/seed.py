@@ -0,0 +1,155 @@
+"""
+Deterministic benchmark data: suppliers, orders and their ledger rows at a chosen scale
+"""
+
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from models import db, Supplier, Order, Transaction
+from analytics import rebuild_spend_rollups
+
+CHUNK_SIZE = 10000
+# Money is in integer minor units (agorot): 50,000,000.00
+INITIAL_AMOUNT = 5000000000
+STATUS_WEIGHTS = (('Approved', 0.6), ('Rejected', 0.1), ('Pending', 0.3))
+
+def default_supplier_count(order_count):
+    return max(10, min(1000, order_count // 1000))
+
+def pick_status(rng):
+    roll = rng.random()
+    for status, weight in STATUS_WEIGHTS:
+        if roll < weight:
+            return status
+        roll -= weight
+    return STATUS_WEIGHTS[-1][0]
+
+def seed(order_count, supplier_count=None, random_seed=42):
+    """Insert benchmark data with bulk executemany in chunks.
+    
+    Must run inside an app context against an empty schema. Returns the seeded
+    supplier IDs and the IDs of the orders left Pending.
+    """
+    rng = random.Random(random_seed)
+    supplier_count = supplier_count or default_supplier_count(order_count)
+    start = datetime(2023, 1, 1)
+    span_seconds = 2 * 365 * 24 * 3600
+    
+    supplier_rows = [
+        {
+            'name': f'Bench Supplier {index:04d}',
+            'initial_amount': INITIAL_AMOUNT,
+            'current_amount': INITIAL_AMOUNT,
+            'supplier_financial_id': 100000 + index,
+            'created_at': start,
+            'updated_at': start,
+            'season_started_at': start
+        }
+        for index in range(supplier_count)
+    ]
+    supplier_ids = [row.id for row in db.session.execute(
+        insert(Supplier).returning(Supplier.id, sort_by_parameter_order=True), supplier_rows
+    )]
+    db.session.execute(insert(Transaction), [
+        {
+            'supplier_id': supplier_id,
+            'transaction_type': 'initial',
+            'amount': INITIAL_AMOUNT,
+            'description': 'Initial supplier setup',
+            'created_at': start
+        }
+        for supplier_id in supplier_ids
+    ])
+    
+    spent = dict.fromkeys(supplier_ids, 0)
+    pending_ids = []
+    for chunk_start in range(0, order_count, CHUNK_SIZE):
+        orders = []
+        transactions = []
+        for index in range(chunk_start, min(order_count, chunk_start + CHUNK_SIZE)):
+            order_id = f'BENCH-{index:07d}'
+            supplier_id = rng.choice(supplier_ids)
+            amount = rng.randint(100, 10000)
+            created_at = start + timedelta(seconds=rng.randrange(span_seconds))
+            status = pick_status(rng)
+            orders.append({
+                'order_id': order_id,
+                'supplier_id': supplier_id,
+                'order_title': f'Benchmark order {index}',
+                'order_amount': amount,
+                'order_date': created_at,
+                'ordered_by': f'user{index % 50}',
+                'notes': None if index % 3 else 'Seeded for benchmarks',
+                'order_status': status,
+                'handler': None if status == 'Pending' else 'bench',
+                'created_at': created_at,
+                'updated_at': created_at
+            })
+            if status == 'Approved':
+                spent[supplier_id] += amount
+                transactions.append({
+                    'supplier_id': supplier_id,
+                    'transaction_type': 'order_approved',
+                    'amount': -amount,
+                    'description': f'Order {order_id} approved by bench',
+                    'created_at': created_at
+                })
+            elif status == 'Pending':
+                pending_ids.append(order_id)
+        
+        db.session.execute(insert(Order), orders)
+        if transactions:
+            db.session.execute(insert(Transaction), transactions)
+        db.session.commit()
+    
+    for supplier_id, total in spent.items():
+        db.session.query(Supplier).filter_by(id=supplier_id).update(
+            {Supplier.current_amount: INITIAL_AMOUNT - total}, synchronize_session=False
+        )
+    db.session.commit()
+    # Backfill the spend analytics as a deploy would
+    rebuild_spend_rollups()
+    
+    return supplier_ids, pending_ids
+
+def add_pending_orders(supplier_ids, count, prefix, random_seed=7):
+    """Insert fresh Pending orders for write scenarios and return their IDs"""
+    rng = random.Random(random_seed)
+    now = datetime.utcnow()
+    order_ids = [f'{prefix}-{index:07d}' for index in range(count)]
+    for chunk_start in range(0, count, CHUNK_SIZE):
+        db.session.execute(insert(Order), [
+            {
+                'order_id': order_id,
+                'supplier_id': rng.choice(supplier_ids),
+                'order_title': 'Benchmark pending order',
+                'order_amount': rng.randint(100, 10000),
+                'order_date': now,
+                'ordered_by': 'bench',
+                'order_status': 'Pending',
+                'created_at': now,
+                'updated_at': now
+            }
+            for order_id in order_ids[chunk_start:chunk_start + CHUNK_SIZE]
+        ])
+        db.session.commit()
+    return order_ids
+
+def add_suppliers(count, prefix):
+    """Insert order-less suppliers for the deletion scenarios and return their IDs"""
+    now = datetime.utcnow()
+    rows = [
+        {
+            'name': f'{prefix} {index:05d}',
+            'initial_amount': 100000,
+            'current_amount': 100000,
+            'created_at': now,
+            'updated_at': now
+        }
+        for index in range(count)
+    ]
+    supplier_ids = [row.id for row in db.session.execute(
+        insert(Supplier).returning(Supplier.id, sort_by_parameter_order=True), rows
+    )]
+    db.session.commit()
+    return supplier_ids
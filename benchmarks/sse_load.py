@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load test for the /api/events Server-Sent Events stream
+Opens a few hundred idle subscribers against a running server, creates and
+approves orders through the API, and reports how many subscribers received
+each event and the delivery latency.
+
+Usage: python benchmarks/sse_load.py --url http://localhost:5000 --subscribers 300 --orders 20
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+def request_json(url, method, path, payload):
+    parsed = urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    connection.request(method, path, body=json.dumps(payload), headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    body = json.loads(response.read() or b'null')
+    connection.close()
+    return response.status, body
+
+class Subscriber(threading.Thread):
+    """One EventSource-like client recording when each order event arrived"""
+    
+    def __init__(self, url, ready):
+        super().__init__(daemon=True)
+        self.url = urlparse(url)
+        self.ready = ready
+        self.received = {}
+        self.error = None
+    
+    def run(self):
+        try:
+            connection = http.client.HTTPConnection(self.url.hostname, self.url.port or 80, timeout=120)
+            connection.request('GET', '/api/events', headers={'Accept': 'text/event-stream'})
+            response = connection.getresponse()
+            self.ready.release()
+            for line in response:
+                if line.startswith(b'data: '):
+                    payload = json.loads(line[6:])
+                    key = (payload['type'], payload.get('order_id'))
+                    self.received.setdefault(key, time.perf_counter())
+        except Exception as e:
+            self.error = e
+            self.ready.release()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run(url, subscriber_count, order_count, supplier_id):
+    ready = threading.Semaphore(0)
+    subscribers = [Subscriber(url, ready) for _ in range(subscriber_count)]
+    started = time.perf_counter()
+    for subscriber in subscribers:
+        subscriber.start()
+    for _ in subscribers:
+        ready.acquire()
+    connected = [subscriber for subscriber in subscribers if subscriber.error is None]
+    print(f"Connected {len(connected)}/{subscriber_count} subscribers in {time.perf_counter() - started:.2f}s")
+    
+    if supplier_id is None:
+        status, body = request_json(url, 'POST', '/api/suppliers', {
+            'name': f'SSE load test {uuid.uuid4().hex[:8]}',
+            'initialAmount': 1_000_000
+        })
+        supplier_id = body['supplier']['id']
+    
+    sent = {}
+    run_id = uuid.uuid4().hex[:8]
+    for index in range(order_count):
+        order_id = f'sse-{run_id}-{index}'
+        sent[('order_created', order_id)] = time.perf_counter()
+        request_json(url, 'POST', '/api/orders', {
+            'orderId': order_id,
+            'supplierId': supplier_id,
+            'orderTitle': 'SSE load test',
+            'orderAmount': 1,
+            'orderDate': '2025-01-01',
+            'orderedBy': 'load test'
+        })
+        sent[('order_approved', order_id)] = time.perf_counter()
+        request_json(url, 'PUT', f'/api/orders/{order_id}/approve', {'handler_name': 'load test'})
+    
+    # Give the last events time to fan out
+    time.sleep(2)
+    
+    latencies = []
+    delivered = 0
+    for subscriber in connected:
+        for key, sent_at in sent.items():
+            received_at = subscriber.received.get(key)
+            if received_at is not None:
+                delivered += 1
+                latencies.append((received_at - sent_at) * 1000)
+    
+    expected = len(sent) * len(connected)
+    print(f"Delivered {delivered}/{expected} events ({delivered / expected:.1%})" if expected else "No events expected")
+    if latencies:
+        print(f"Latency ms: p50={percentile(latencies, 0.50):.1f} "
+              f"p95={percentile(latencies, 0.95):.1f} "
+              f"p99={percentile(latencies, 0.99):.1f} "
+              f"max={max(latencies):.1f} mean={statistics.mean(latencies):.1f}")
+    return 0 if delivered == expected else 1
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Server-Sent Events load test')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--subscribers', type=int, default=300)
+    parser.add_argument('--orders', type=int, default=20)
+    parser.add_argument('--supplier-id', type=int,
+                        help='Existing supplier to order from (a new one is created otherwise)')
+    args = parser.parse_args()
+    raise SystemExit(run(args.url, args.subscribers, args.orders, args.supplier_id))
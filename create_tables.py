@@ -1,41 +1,45 @@
 #!/usr/bin/env python3
 """
-Script to manually create PostgreSQL tables
-Run this if tables aren't being created automatically
+Script to create or upgrade the database schema
+Applies the versioned Alembic migrations in backend/migrations. Run it once
+per deploy (before the web processes start); the app itself does no DDL.
 """
 
 import os
-from models import db
-from app import create_app
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+
+# Make the backend modules importable from the repository root
+sys.path.insert(0, BACKEND_DIR)
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import create_engine, inspect
+from config import database_url
 
 def create_tables():
-    """Create all database tables"""
+    """Upgrade the database to the latest migration"""
     
-    # Force production config to use PostgreSQL
-    app = create_app('production')
+    url = database_url()
+    print(f"Database URL: {url}")
     
-    with app.app_context():
-        print(f"Database URL: {app.config['SQLALCHEMY_DATABASE_URI']}")
+    try:
+        command.upgrade(AlembicConfig(os.path.join(BACKEND_DIR, 'alembic.ini')), 'head')
+        print("✅ Database schema is up to date!")
+        
+        # List tables to verify
+        tables = inspect(create_engine(url)).get_table_names()
+        print(f"📋 Tables in database: {tables}")
+        
+        if not tables:
+            print("⚠️ No tables found! Check your DATABASE_URL environment variable.")
         
-        try:
-            # Create all tables
-            db.create_all()
-            print("✅ All tables created successfully!")
-            
-            # List tables to verify
-            from sqlalchemy import text
-            result = db.session.execute(text("SELECT tablename FROM pg_tables WHERE schemaname = 'public';"))
-            tables = [row[0] for row in result]
-            
-            print(f"📋 Tables in database: {tables}")
-            
-            if not tables:
-                print("⚠️ No tables found! Check your DATABASE_URL environment variable.")
-            
-        except Exception as e:
-            print(f"❌ Error creating tables: {str(e)}")
-            print("Make sure your DATABASE_URL is correct and PostgreSQL is accessible.")
+    except Exception as e:
+        print(f"❌ Error migrating database: {str(e)}")
+        print("Make sure your DATABASE_URL is correct and the database is accessible.")
+        sys.exit(1)
 
 if __name__ == '__main__':
-    print("🔧 Creating PostgreSQL tables...")
-    create_tables()
\ No newline at end of file
+    print("🔧 Migrating database schema...")
+    create_tables()
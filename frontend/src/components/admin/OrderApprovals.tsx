@@ -1,6 +1,6 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { formatCurrency, formatDate } from '../../utils/formatters';
-import API_ENDPOINTS, { getApiUrl } from '../../config/api';
+import API_ENDPOINTS, { getApiUrl, fetchAllPages, apiFetch, subscribeToOrderEvents, OrderEvent } from '../../config/api';
 
 interface Order {
   order_id: string;
@@ -35,7 +35,7 @@ const OrderApprovals: React.FC = () => {
 
   const fetchSuppliers = useCallback(async () => {
     try {
-      const response = await fetch(API_ENDPOINTS.SUPPLIERS);
+      const response = await apiFetch(API_ENDPOINTS.SUPPLIERS);
       if (response.ok) {
         const data = await response.json();
         setSuppliers(data);
@@ -48,31 +48,27 @@ const OrderApprovals: React.FC = () => {
   const fetchOrders = useCallback(async () => {
     try {
       setIsLoading(true);
-      const response = await fetch(API_ENDPOINTS.ORDERS);
-      if (response.ok) {
-        const data = await response.json();
-        
-        // Merge orders with supplier data
-        const ordersWithSuppliers: OrderWithSupplier[] = data.map((order: any) => {
-          const supplier = suppliers.find(s => s.id === order.supplier_id);
-          return {
-            order_id: order.order_id,
-            supplier_id: order.supplier_id,
-            title: order.title,
-            amount: order.amount,
-            order_date: order.order_date,
-            ordered_by: order.ordered_by,
-            notes: order.notes,
-            status: order.status,
-            handler: order.handler,
-            supplier_name: supplier ? supplier.name : `Unknown Supplier (ID: ${order.supplier_id})`
-          };
-        });
-
-        setOrders(ordersWithSuppliers);
-      } else {
-        setMessage({ type: 'error', text: 'Failed to fetch orders' });
-      }
+      // Only pending orders need approval, so let the server filter them
+      const data = await fetchAllPages<any>(`${API_ENDPOINTS.ORDERS}?status=Pending`);
+
+      // Merge orders with supplier data
+      const ordersWithSuppliers: OrderWithSupplier[] = data.map((order: any) => {
+        const supplier = suppliers.find(s => s.id === order.supplier_id);
+        return {
+          order_id: order.order_id,
+          supplier_id: order.supplier_id,
+          title: order.title,
+          amount: order.amount,
+          order_date: order.order_date,
+          ordered_by: order.ordered_by,
+          notes: order.notes,
+          status: order.status,
+          handler: order.handler,
+          supplier_name: supplier ? supplier.name : `Unknown Supplier (ID: ${order.supplier_id})`
+        };
+      });
+
+      setOrders(ordersWithSuppliers);
     } catch (error) {
       setMessage({ type: 'error', text: 'Network error. Please check if the backend server is running.' });
     } finally {
@@ -90,6 +86,26 @@ const OrderApprovals: React.FC = () => {
     }
   }, [fetchOrders, suppliers]);
 
+  const handleOrderEvent = useCallback((event: OrderEvent) => {
+    if (event.type === 'order_approved' || event.type === 'order_rejected') {
+      // Handled by another admin (or this one): it is no longer pending
+      setOrders(prev => prev.filter(order => order.order_id !== event.order_id));
+    } else if (event.type === 'order_created' && !suppliers.some(s => s.id === event.supplier_id)) {
+      // New suppliers' names are needed first; loading them refetches the orders
+      fetchSuppliers();
+    } else {
+      fetchOrders();
+    }
+  }, [fetchOrders, fetchSuppliers, suppliers]);
+
+  // The stream stays open across supplier reloads and always calls the latest handler
+  const orderEventHandler = useRef(handleOrderEvent);
+  orderEventHandler.current = handleOrderEvent;
+
+  useEffect(() => {
+    return subscribeToOrderEvents(event => orderEventHandler.current(event), fetchSuppliers);
+  }, [fetchSuppliers]);
+
   const handleApprove = async (orderId: string) => {
     const adminName = adminNames[orderId]?.trim();
     if (!adminName) {
@@ -101,7 +117,7 @@ const OrderApprovals: React.FC = () => {
     setOrderErrors(prev => ({ ...prev, [orderId]: '' }));
 
     try {
-      const response = await fetch(getApiUrl(`/api/orders/${orderId}/approve`), {
+      const response = await apiFetch(getApiUrl(`/api/orders/${orderId}/approve`), {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
@@ -140,7 +156,7 @@ const OrderApprovals: React.FC = () => {
     setOrderErrors(prev => ({ ...prev, [orderId]: '' }));
 
     try {
-      const response = await fetch(getApiUrl(`/api/orders/${orderId}/reject`), {
+      const response = await apiFetch(getApiUrl(`/api/orders/${orderId}/reject`), {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
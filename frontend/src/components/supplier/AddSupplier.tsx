@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import API_ENDPOINTS from '../../config/api';
+import API_ENDPOINTS, { apiFetch } from '../../config/api';
 
 const AddSupplier: React.FC = () => {
   const [supplierData, setSupplierData] = useState({
@@ -55,7 +55,7 @@ const AddSupplier: React.FC = () => {
       };
 
       console.log('Submitting supplier:', supplierToSubmit);
-      const response = await fetch(API_ENDPOINTS.SUPPLIERS, {
+      const response = await apiFetch(API_ENDPOINTS.SUPPLIERS, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
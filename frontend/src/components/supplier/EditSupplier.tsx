@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import API_ENDPOINTS, { getApiUrl } from '../../config/api';
+import API_ENDPOINTS, { getApiUrl, apiFetch } from '../../config/api';
 
 interface Supplier {
   id: number;
@@ -27,7 +27,7 @@ const EditSupplier: React.FC = () => {
 
   const fetchSuppliers = async () => {
     try {
-      const response = await fetch(API_ENDPOINTS.SUPPLIERS);
+      const response = await apiFetch(API_ENDPOINTS.SUPPLIERS);
       if (response.ok) {
         const data = await response.json();
         // Sort suppliers A-Z by name
@@ -100,7 +100,7 @@ const EditSupplier: React.FC = () => {
         return;
       }
 
-      const response = await fetch(getApiUrl(`/api/suppliers/${selectedSupplierId}`), {
+      const response = await apiFetch(getApiUrl(`/api/suppliers/${selectedSupplierId}`), {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
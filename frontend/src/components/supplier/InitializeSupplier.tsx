@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import API_ENDPOINTS, { getApiUrl } from '../../config/api';
+import API_ENDPOINTS, { getApiUrl, apiFetch } from '../../config/api';
 
 interface Supplier {
   id: number;
@@ -36,7 +36,7 @@ const InitializeSupplier: React.FC = () => {
 
   const fetchSuppliers = async () => {
     try {
-      const response = await fetch(API_ENDPOINTS.SUPPLIERS);
+      const response = await apiFetch(API_ENDPOINTS.SUPPLIERS);
       if (response.ok) {
         const data = await response.json();
         // Sort suppliers A-Z by name
@@ -97,7 +97,7 @@ const InitializeSupplier: React.FC = () => {
         return;
       }
 
-      const response = await fetch(getApiUrl(`/api/suppliers/${selectedSupplier}/initialize`), {
+      const response = await apiFetch(getApiUrl(`/api/suppliers/${selectedSupplier}/initialize`), {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -129,7 +129,7 @@ const InitializeSupplier: React.FC = () => {
   return (
     <div>
       <p style={{ color: '#000000', marginBottom: '20px' }}>
-        Initialize a supplier with new balance amounts and optionally export transaction history to orders.
+        Initialize a supplier with new balance amounts and optionally archive its transaction history.
       </p>
 
       {message.text && (
@@ -243,10 +243,10 @@ const InitializeSupplier: React.FC = () => {
                     disabled={isSubmitting}
                     style={{ marginRight: '8px' }}
                   />
-                  Export previous history to orders table
+                  Archive previous transaction history
                 </label>
                 <small style={{ color: '#000000', opacity: 0.8, fontSize: '12px', marginTop: '4px', display: 'block' }}>
-                  Check this to save current transaction history as an order before resetting
+                  Check this to copy the current transaction history to the transaction archive before resetting
                 </small>
               </div>
             </div>
@@ -263,7 +263,7 @@ const InitializeSupplier: React.FC = () => {
               </div>
               <p style={{ color: '#000000', fontSize: '12px', margin: 0 }}>
                 This action will update the supplier's initial and current amounts, and clear all existing transaction history. 
-                {exportHistory && " The current history will be exported to the orders table before clearing."}
+                {exportHistory && " The current history will be copied to the transaction archive before clearing."}
               </p>
             </div>
 
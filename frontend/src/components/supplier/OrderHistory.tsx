@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { formatCurrency, formatDate } from '../../utils/formatters';
-import API_ENDPOINTS from '../../config/api';
+import API_ENDPOINTS, { fetchPage, subscribeToOrderEvents } from '../../config/api';
 
 interface Order {
   order_id: string;
@@ -28,48 +28,52 @@ interface OrderHistoryProps {
 
 const OrderHistory: React.FC<OrderHistoryProps> = ({ selectedSupplier }) => {
   const [orders, setOrders] = useState<Order[]>([]);
-  const [filteredOrders, setFilteredOrders] = useState<Order[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [statusFilter, setStatusFilter] = useState<'All' | 'Pending' | 'Approved' | 'Rejected'>('All');
   const [isLoading, setIsLoading] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [message, setMessage] = useState({ type: '', text: '' });
 
+  // Filtering and newest-first ordering are done by the server
+  const ordersUrl = `${API_ENDPOINTS.ORDERS}?supplier_id=${selectedSupplier.id}` +
+    (statusFilter === 'All' ? '' : `&status=${statusFilter}`);
+
+  // Only the first page is fetched (and refreshed on order events); older orders load on demand
   const fetchOrders = useCallback(async () => {
     try {
       setIsLoading(true);
-      const response = await fetch(API_ENDPOINTS.ORDERS);
-      if (response.ok) {
-        const data = await response.json();
-        // Filter orders for the selected supplier
-        const supplierOrders = data.filter((order: Order) => order.supplier_id === selectedSupplier.id);
-        // Sort by created_at descending (most recent first)
-        supplierOrders.sort((a: Order, b: Order) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
-        setOrders(supplierOrders);
-      } else {
-        setMessage({ type: 'error', text: 'Failed to fetch orders' });
-      }
+      const page = await fetchPage<Order>(ordersUrl);
+      setOrders(page.items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       setMessage({ type: 'error', text: 'Network error. Please check if the backend server is running.' });
     } finally {
       setIsLoading(false);
     }
-  }, [selectedSupplier.id]);
+  }, [ordersUrl]);
+
+  const loadMoreOrders = async () => {
+    if (!nextCursor) {
+      return;
+    }
+    try {
+      setIsLoadingMore(true);
+      const page = await fetchPage<Order>(ordersUrl, nextCursor);
+      setOrders(previous => [...previous, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      setMessage({ type: 'error', text: 'Network error. Please check if the backend server is running.' });
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
 
   useEffect(() => {
     fetchOrders();
     
-    // Set up polling to refresh data every 10 minutes to catch changes
-    const interval = setInterval(fetchOrders, 10 * 60 * 1000); // 10 minutes
-    
-    return () => clearInterval(interval);
-  }, [fetchOrders]);
-
-  useEffect(() => {
-    if (statusFilter === 'All') {
-      setFilteredOrders(orders);
-    } else {
-      setFilteredOrders(orders.filter(order => order.status === statusFilter));
-    }
-  }, [orders, statusFilter]);
+    // Refresh when one of this supplier's orders is created, approved or rejected
+    return subscribeToOrderEvents(fetchOrders, fetchOrders, selectedSupplier.id);
+  }, [fetchOrders, selectedSupplier.id]);
 
   const getStatusColor = (status: string) => {
     switch (status) {
@@ -166,7 +170,7 @@ const OrderHistory: React.FC<OrderHistoryProps> = ({ selectedSupplier }) => {
         <div style={{ textAlign: 'center', padding: '40px', color: '#666666' }}>
           Loading order history...
         </div>
-      ) : filteredOrders.length === 0 ? (
+      ) : orders.length === 0 ? (
         <div style={{ textAlign: 'center', padding: '40px', color: '#666666' }}>
           {statusFilter === 'All' 
             ? `No orders found for ${selectedSupplier.name}.` 
@@ -196,7 +200,7 @@ const OrderHistory: React.FC<OrderHistoryProps> = ({ selectedSupplier }) => {
               </tr>
             </thead>
             <tbody>
-              {filteredOrders.map((order, index) => (
+              {orders.map((order, index) => (
                 <tr 
                   key={order.order_id}
                   style={{
@@ -252,11 +256,31 @@ const OrderHistory: React.FC<OrderHistoryProps> = ({ selectedSupplier }) => {
               ))}
             </tbody>
           </table>
+          {nextCursor && (
+            <div style={{ textAlign: 'center', marginTop: '16px' }}>
+              <button
+                onClick={loadMoreOrders}
+                disabled={isLoadingMore}
+                style={{
+                  background: isLoadingMore ? '#9ca3af' : '#059669',
+                  color: 'white',
+                  border: 'none',
+                  padding: '8px 16px',
+                  borderRadius: '6px',
+                  cursor: isLoadingMore ? 'not-allowed' : 'pointer',
+                  fontSize: '14px',
+                  fontWeight: '500'
+                }}
+              >
+                {isLoadingMore ? 'Loading...' : 'Load More Orders'}
+              </button>
+            </div>
+          )}
         </div>
       )}
 
       {/* Summary */}
-      {filteredOrders.length > 0 && (
+      {orders.length > 0 && (
         <div style={{ 
           marginTop: '20px', 
           padding: '16px', 
@@ -266,13 +290,13 @@ const OrderHistory: React.FC<OrderHistoryProps> = ({ selectedSupplier }) => {
         }}>
           <div style={{ display: 'flex', gap: '24px', fontSize: '14px' }}>
             <div>
-              <span style={{ color: '#6b7280' }}>Total Orders: </span>
-              <span style={{ color: '#1e293b', fontWeight: '600' }}>{filteredOrders.length}</span>
+              <span style={{ color: '#6b7280' }}>{nextCursor ? 'Orders Shown: ' : 'Total Orders: '}</span>
+              <span style={{ color: '#1e293b', fontWeight: '600' }}>{orders.length}{nextCursor ? '+' : ''}</span>
             </div>
             <div>
-              <span style={{ color: '#6b7280' }}>Total Amount: </span>
+              <span style={{ color: '#6b7280' }}>{nextCursor ? 'Amount Shown: ' : 'Total Amount: '}</span>
               <span style={{ color: '#dc2626', fontWeight: '600' }}>
-                {formatCurrency(filteredOrders.reduce((sum, order) => sum + order.amount, 0))}
+                {formatCurrency(orders.reduce((sum, order) => sum + order.amount, 0))}
               </span>
             </div>
           </div>
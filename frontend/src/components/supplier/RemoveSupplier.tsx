@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import API_ENDPOINTS, { getApiUrl } from '../../config/api';
+import API_ENDPOINTS, { getApiUrl, apiFetch } from '../../config/api';
 
 interface Supplier {
   id: number;
@@ -23,7 +23,7 @@ const RemoveSupplier: React.FC = () => {
 
   const fetchSuppliers = async () => {
     try {
-      const response = await fetch(API_ENDPOINTS.SUPPLIERS);
+      const response = await apiFetch(API_ENDPOINTS.SUPPLIERS);
       if (response.ok) {
         const data = await response.json();
         // Sort suppliers A-Z by name
@@ -61,7 +61,7 @@ const RemoveSupplier: React.FC = () => {
     setMessage({ type: '', text: '' });
 
     try {
-      const response = await fetch(getApiUrl(`/api/suppliers/${selectedSupplier}`), {
+      const response = await apiFetch(getApiUrl(`/api/suppliers/${selectedSupplier}`), {
         method: 'DELETE',
         headers: {
           'Content-Type': 'application/json',
@@ -69,7 +69,11 @@ const RemoveSupplier: React.FC = () => {
       });
 
       if (response.ok) {
-        setMessage({ type: 'success', text: `Supplier "${supplier.name}" and all history deleted successfully!` });
+        // 202 means a large history is still being removed in the background
+        const text = response.status === 202
+          ? (await response.json()).message
+          : `Supplier "${supplier.name}" and all history deleted successfully!`;
+        setMessage({ type: 'success', text });
         setSelectedSupplier('');
         setConfirmationText('');
         setShowConfirmation(false);
@@ -1,6 +1,6 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { formatCurrency, formatDateForInput } from '../../utils/formatters';
-import API_ENDPOINTS from '../../config/api';
+import API_ENDPOINTS, { apiFetch } from '../../config/api';
 
 interface Supplier {
   id: number;
@@ -27,10 +27,13 @@ const SubmitNewOrder: React.FC<SubmitNewOrderProps> = ({
   });
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [message, setMessage] = useState({ type: '', text: '' });
+  // Reused when the same form is resubmitted, so a retry can't create a second order
+  const pendingOrderId = useRef<string | null>(null);
 
 
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement | HTMLSelectElement | HTMLTextAreaElement>) => {
     const { name, value } = e.target;
+    pendingOrderId.current = null;
     setOrderData(prev => ({
       ...prev,
       [name]: value
@@ -74,9 +77,11 @@ const SubmitNewOrder: React.FC<SubmitNewOrderProps> = ({
         return;
       }
 
-      // Generate unique order ID
-      const timestamp = Date.now();
-      const orderId = `ORD-${selectedSupplier.id}-${timestamp}`;
+      // Generate unique order ID, kept until the order is accepted or the form changes
+      if (!pendingOrderId.current) {
+        pendingOrderId.current = `ORD-${selectedSupplier.id}-${Date.now()}`;
+      }
+      const orderId = pendingOrderId.current;
 
       const orderPayload = {
         orderId: orderId,
@@ -90,10 +95,11 @@ const SubmitNewOrder: React.FC<SubmitNewOrderProps> = ({
         handler: null
       };
 
-      const response = await fetch(API_ENDPOINTS.ORDERS, {
+      const response = await apiFetch(API_ENDPOINTS.ORDERS, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Idempotency-Key': orderId,
         },
         body: JSON.stringify(orderPayload),
       });
@@ -109,6 +115,7 @@ const SubmitNewOrder: React.FC<SubmitNewOrderProps> = ({
       }
       
       // Reset form
+      pendingOrderId.current = null;
       setOrderData({
         orderTitle: '',
         amount: '',
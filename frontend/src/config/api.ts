@@ -6,6 +6,7 @@ export const API_ENDPOINTS = {
   SUPPLIERS: `${API_BASE_URL}/api/suppliers`,
   ORDERS: `${API_BASE_URL}/api/orders`,
   ADMIN_LOGIN: `${API_BASE_URL}/api/admin/login`,
+  EVENTS: `${API_BASE_URL}/api/events`,
 };
 
 // Helper function to get full API URL
@@ -13,4 +14,97 @@ export const getApiUrl = (endpoint: string): string => {
   return `${API_BASE_URL}${endpoint}`;
 };
 
+// Reads may be served by a database replica. For the number of seconds a write
+// response gives in X-Read-Primary-For, send X-Read-Primary so this browser
+// reads its own writes from the primary.
+let readPrimaryUntil = 0;
+
+export const apiFetch = async (url: string, init: RequestInit = {}): Promise<Response> => {
+  const headers = new Headers(init.headers);
+  if (Date.now() < readPrimaryUntil) {
+    headers.set('X-Read-Primary', 'true');
+  }
+  const response = await fetch(url, { ...init, headers });
+
+  const readPrimaryFor = Number(response.headers.get('X-Read-Primary-For'));
+  if (readPrimaryFor > 0) {
+    readPrimaryUntil = Math.max(readPrimaryUntil, Date.now() + readPrimaryFor * 1000);
+  }
+  return response;
+};
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// Fetch one page of a cursor-paginated list endpoint; nextCursor is null on the last page
+export const fetchPage = async <T,>(url: string, cursor: string | null = null): Promise<Page<T>> => {
+  const pageUrl = new URL(url);
+  if (cursor) {
+    pageUrl.searchParams.set('cursor', cursor);
+  }
+  const response = await apiFetch(pageUrl.toString());
+  if (!response.ok) {
+    throw new Error(`Request failed with status ${response.status}`);
+  }
+  return { items: await response.json(), nextCursor: response.headers.get('X-Next-Cursor') };
+};
+
+// Fetch every page of a cursor-paginated list endpoint (follows X-Next-Cursor).
+// Only for lists that stay small, such as pending orders; long histories should
+// show fetchPage's first page and load the rest on demand.
+export const fetchAllPages = async <T,>(url: string): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const page: Page<T> = await fetchPage<T>(url, cursor);
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+
+  return items;
+};
+
+export interface OrderEvent {
+  type: 'order_created' | 'order_approved' | 'order_rejected' | 'orders_approved' | 'orders_rejected';
+  order_id?: string;
+  supplier_id?: number;
+  order_ids?: string[];
+  supplier_ids?: number[];
+  truncated?: boolean;
+}
+
+const ORDER_EVENT_TYPES: OrderEvent['type'][] = [
+  'order_created', 'order_approved', 'order_rejected', 'orders_approved', 'orders_rejected'
+];
+
+// Call onEvent for each order event from /api/events, optionally only those of one
+// supplier. Events sent while the stream was down are lost, so onReconnect should
+// refetch. Returns a function that closes the stream.
+export const subscribeToOrderEvents = (
+  onEvent: (event: OrderEvent) => void,
+  onReconnect: () => void,
+  supplierId: number | null = null
+): (() => void) => {
+  const url = new URL(API_ENDPOINTS.EVENTS);
+  if (supplierId !== null) {
+    url.searchParams.set('supplier_id', String(supplierId));
+  }
+  const source = new EventSource(url.toString());
+  let connected = false;
+
+  source.onopen = () => {
+    if (connected) {
+      onReconnect();
+    }
+    connected = true;
+  };
+  const listener = (message: MessageEvent) => onEvent(JSON.parse(message.data));
+  ORDER_EVENT_TYPES.forEach(type => source.addEventListener(type, listener));
+
+  return () => source.close();
+};
+
 export default API_ENDPOINTS;
\ No newline at end of file
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Bulk import suppliers or orders from a CSV or NDJSON file
+Usage: python import_data.py suppliers suppliers.csv
+       python import_data.py orders orders.ndjson --chunk-size 5000
+"""
+
+import argparse
+import os
+import sys
+
+# Make the backend modules importable from the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app import create_app
+from importer import IMPORTERS, IMPORT_FORMATS, DEFAULT_CHUNK_SIZE
+
+def import_file(kind, path, fmt, chunk_size):
+    """Stream a file through the same importer used by POST /api/import/<kind>"""
+    
+    app = create_app('production')
+    
+    with app.app_context():
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            report = IMPORTERS[kind](stream, fmt, chunk_size)
+        
+        print(f"✅ Imported {report['imported']} {kind}")
+        if report['failed']:
+            print(f"⚠️ {report['failed']} rows failed:")
+            for error in report['errors']:
+                print(f"  line {error['line']}: {error['message']}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk import suppliers or orders')
+    parser.add_argument('kind', choices=sorted(IMPORTERS))
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=IMPORT_FORMATS,
+                        help='File format (defaults to the file extension)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.path)[1].lower()
+        fmt = 'csv' if extension == '.csv' else 'ndjson'
+    
+    print(f"📥 Importing {args.kind} from {args.path} ({fmt})...")
+    import_file(args.kind, args.path, fmt, args.chunk_size)
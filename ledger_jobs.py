@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Periodic ledger maintenance
+Usage: python ledger_jobs.py snapshot   - write per-supplier balance snapshots
+       python ledger_jobs.py reconcile  - verify current_amount against the ledger
+       python ledger_jobs.py purge      - finish supplier deletions interrupted by a restart
+       python ledger_jobs.py rollups    - rebuild the spend analytics rollups from approved orders
+"""
+
+import argparse
+import os
+import sys
+
+# Make the backend modules importable from the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app import create_app
+from ledger import take_snapshots, reconcile
+from deletion import purge_requested_deletions
+from analytics import rebuild_spend_rollups
+
+def run(command):
+    app = create_app('production')
+    
+    with app.app_context():
+        if command == 'snapshot':
+            written = take_snapshots()
+            print(f"✅ {written} balance snapshots written")
+            return 0
+        
+        if command == 'purge':
+            purged = purge_requested_deletions()
+            print(f"✅ {purged} pending supplier deletions completed")
+            return 0
+        
+        if command == 'rollups':
+            written = rebuild_spend_rollups()
+            print(f"✅ {written} spend rollup rows written")
+            return 0
+        
+        report = reconcile()
+        if not report['mismatches']:
+            print(f"✅ {report['checked']} suppliers match the ledger")
+            return 0
+        
+        print(f"⚠️ {len(report['mismatches'])} of {report['checked']} suppliers differ from the ledger:")
+        for mismatch in report['mismatches']:
+            print(f"  {mismatch['supplier_name']} (ID {mismatch['supplier_id']}): "
+                  f"current {mismatch['current_amount']}, ledger {mismatch['ledger_balance']}")
+        return 1
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ledger snapshot, reconciliation, purge and rollup jobs')
+    parser.add_argument('command', choices=['snapshot', 'reconcile', 'purge', 'rollups'])
+    args = parser.parse_args()
+    sys.exit(run(args.command))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Background job worker
+Usage: python worker.py                  - run jobs with WORKER_PROCESSES processes (default 2)
+       python worker.py --processes 4    - run four worker processes
+       python worker.py --drain          - run queued jobs in this process and exit when none are left
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+
+# Make the backend modules importable from the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+def work_loop(poll_seconds, exit_when_idle=False):
+    """Run jobs in this process until SIGTERM/SIGINT, finishing the current job first"""
+    # Importing app registers every job handler; each process opens its own connections
+    from app import create_app
+    from jobs import work
+    
+    stopping = []
+    def request_stop(signum, frame):
+        stopping.append(signum)
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    app = create_app()
+    with app.app_context():
+        return work(lambda: bool(stopping), poll_seconds, exit_when_idle)
+
+def run(processes, poll_seconds):
+    # Spawned processes share no database connections or locks with the parent
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=work_loop, args=(poll_seconds,), name=f'job-worker-{number}')
+               for number in range(processes)]
+    for worker in workers:
+        worker.start()
+    print(f"✅ {processes} job worker processes started")
+    
+    def stop(signum, frame):
+        for worker in workers:
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGTERM)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    for worker in workers:
+        worker.join()
+    return max((worker.exitcode or 0) for worker in workers)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run background jobs from the jobs table')
+    parser.add_argument('--processes', type=int, default=int(os.getenv('WORKER_PROCESSES', 2)))
+    parser.add_argument('--poll', type=float, default=float(os.getenv('WORKER_POLL_SECONDS', 1.0)),
+                        help='Seconds to wait before checking an empty queue again')
+    parser.add_argument('--drain', action='store_true', help='Run queued jobs here, then exit')
+    args = parser.parse_args()
+    
+    if args.drain:
+        count = work_loop(args.poll, exit_when_idle=True)
+        print(f"✅ {count} jobs run")
+        sys.exit(0)
+    sys.exit(run(args.processes, args.poll))